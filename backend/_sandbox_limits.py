@@ -0,0 +1,30 @@
+"""Apply local sandbox resource limits, then replace this process with a command.
+
+Usage: ``python _sandbox_limits.py <cpu s> <memory bytes> <processes> <cores> cmd...``
+
+Limits are applied in this short-lived wrapper rather than in a ``preexec_fn``,
+which is unsafe when the parent starts processes from several threads.
+"""
+
+import os
+import resource
+import sys
+
+_FILE_SIZE_BYTES = 16 * 1024 * 1024
+
+
+def main() -> None:
+    cpu_seconds, memory_bytes, processes, cores = (int(arg) for arg in sys.argv[1:5])
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_NPROC, (processes, processes))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (_FILE_SIZE_BYTES, _FILE_SIZE_BYTES))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, cpus[: max(1, cores)])
+    os.execvp(sys.argv[5], sys.argv[5:])
+
+
+if __name__ == "__main__":
+    main()
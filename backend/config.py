@@ -4,7 +4,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -22,21 +22,48 @@ class Settings(BaseSettings):
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8501"]
     max_request_characters: int = Field(default=20_000, ge=1)
     max_attempts: int = Field(default=3, ge=1, le=3)
-    max_active_runs: int = Field(default=1, ge=1, le=1)
+    max_active_runs: int = Field(default=1, ge=1, le=16)
+    max_queued_runs: int = Field(default=20, ge=0, le=500)
+    max_queued_runs_per_client: int = Field(default=3, ge=1, le=50)
+    run_store: Literal["sqlite", "memory"] = "sqlite"
+    run_store_path: Path = PROJECT_ROOT / ".runs" / "runs.sqlite3"
+    run_cache_entries: int = Field(default=100, ge=1, le=10_000)
+    run_cache_ttl_seconds: float = Field(default=900.0, gt=0, le=86_400)
     max_daily_model_runs: int = Field(default=20, ge=1, le=100)
     rate_limit_requests: int = Field(default=10, ge=1, le=100)
     rate_limit_window_seconds: float = Field(default=60.0, gt=0, le=3600)
+    rate_limit_backend: Literal["memory", "sqlite"] = "memory"
+    rate_limit_path: Path = PROJECT_ROOT / ".runs" / "rate_limits.sqlite3"
     run_timeout_seconds: float = Field(default=300.0, gt=0, le=900)
-    sandbox_backend: Literal["docker", "modal"] = "docker"
+    sandbox_backend: Literal["docker", "modal", "local"] = "docker"
     docker_sandbox_image: str = "digital-forge-sandbox:py311"
+    docker_pool_size: int = Field(default=0, ge=0, le=8)
+    docker_pool_max_uses: int = Field(default=25, ge=1, le=500)
+    docker_pool_health_check: bool = True
     modal_sandbox_app: str = "digital-forge-sandbox"
+    modal_pool_size: int = Field(default=0, ge=0, le=8)
+    modal_pool_idle_ttl_seconds: float = Field(default=300.0, gt=0, le=1800)
+    modal_pool_max_uses: int = Field(default=25, ge=1, le=500)
     sandbox_timeout_seconds: float = Field(default=10.0, gt=0, le=60)
     sandbox_memory_mib: int = Field(default=256, ge=32, le=1024)
     sandbox_cpu_cores: float = Field(default=1.0, ge=0.1, le=2.0)
     sandbox_process_limit: int = Field(default=64, ge=4, le=128)
+    sandbox_cache_entries: int = Field(default=256, ge=0, le=10_000)
+    sandbox_cache_path: Path | None = None
+    sandbox_cache_bypass: bool = False
     rag_index_path: Path = PROJECT_ROOT / "rag" / "index" / "v1"
     rag_result_limit: int = Field(default=3, ge=1, le=5)
+    rag_backend: Literal["chroma", "matrix"] = "chroma"
+    rag_ranking: Literal["lexical", "rrf", "weighted"] = "lexical"
+    rag_query_cache_entries: int = Field(default=256, ge=0, le=10_000)
     benchmark_results_path: Path = PROJECT_ROOT / "benchmark-results"
+    prewarm_run_modules: bool = True
+
+    @model_validator(mode="after")
+    def validate_rag_ranking_backend(self) -> "Settings":
+        if self.rag_ranking != "lexical" and self.rag_backend != "matrix":
+            raise ValueError("Hybrid BM25 ranking requires the matrix RAG backend.")
+        return self
 
     def require_openai_api_key(self) -> str:
         if not self.openai_api_key:
@@ -1,55 +1,127 @@
 """Single FastAPI and CLI entry point for The Digital Forge backend."""
 
 import argparse
-from collections.abc import Sequence
-from threading import RLock
-from time import monotonic
-from uuid import UUID, uuid4
+import sys
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from importlib import import_module
+from threading import RLock, Thread
+from uuid import UUID
 
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from benchmark.models import BenchmarkReport
 
 from .benchmarks import load_benchmark_reports
 from .config import Settings, get_settings
-from .models import RunRequest, RunResponse, RunSnapshot
+from .models import (
+    ComponentReadiness,
+    ComponentStatus,
+    ReadinessReport,
+    RunRequest,
+    RunResponse,
+    RunSnapshot,
+    RunSnapshotDelta,
+    SchedulerMetrics,
+)
+from .rate_limit import RateLimiter, build_rate_limit_backend
+from .run_events import format_sse
 from .run_manager import (
     ActiveRunLimitExceeded,
     CancellationCheck,
     DailyRunLimitExceeded,
     RunManager,
+    RunManagerClosed,
     Runner,
     RunnerFactory,
+    RunQueueFull,
     UpdateCallback,
 )
 
+# Imported on the first run, or warmed after startup, so read-only endpoints
+# never wait on crewai, chromadb or openai.
+_RUN_MODULES = ("backend.pipeline",)
+_WARMUP_COMPONENTS = ("modules", "agents", "retriever", "sandbox")
+SSE_HEARTBEAT_SECONDS = 15.0
+
 
-class RateLimiter:
-    """Small process-local limiter for the public demo API."""
+class Readiness:
+    """Progress of the startup warm-up reported by ``/ready``."""
 
-    def __init__(self, request_limit: int, window_seconds: float):
-        self.request_limit = request_limit
-        self.window_seconds = window_seconds
-        self._requests: dict[str, list[float]] = {}
+    def __init__(self, components: Sequence[str] = ()):
+        self._components = {name: ComponentReadiness() for name in components}
         self._lock = RLock()
 
-    def allow(self, key: str) -> bool:
-        now = monotonic()
-        window_start = now - self.window_seconds
+    def check(self, name: str, step: Callable[[], object]) -> bool:
+        try:
+            step()
+        except Exception as exc:
+            state = ComponentReadiness(
+                status=ComponentStatus.failed, error=f"{type(exc).__name__}: {exc}"
+            )
+        else:
+            state = ComponentReadiness(status=ComponentStatus.ready)
+        with self._lock:
+            self._components[name] = state
+        return state.status is ComponentStatus.ready
+
+    def report(self) -> ReadinessReport:
         with self._lock:
-            timestamps = [
-                timestamp
-                for timestamp in self._requests.get(key, [])
-                if timestamp >= window_start
-            ]
-            if len(timestamps) >= self.request_limit:
-                self._requests[key] = timestamps
-                return False
-            timestamps.append(now)
-            self._requests[key] = timestamps
-        return True
+            components = dict(self._components)
+        return ReadinessReport(
+            ready=all(
+                component.status is ComponentStatus.ready
+                for component in components.values()
+            ),
+            components=components,
+        )
+
+
+def _import_run_modules() -> None:
+    for module in _RUN_MODULES:
+        import_module(module)
+
+
+def _prewarm(settings: Settings, readiness: Readiness) -> None:
+    if not readiness.check("modules", _import_run_modules):
+        return
+    from .pipeline import prewarm_steps
+
+    for name, step in prewarm_steps(settings):
+        readiness.check(name, step)
+
+
+async def _event_stream(
+    run_manager: RunManager, run_id: UUID, after: int
+) -> AsyncIterator[str]:
+    while True:
+        events = await run_manager.next_events(run_id, after, SSE_HEARTBEAT_SECONDS)
+        if not events:
+            if events is None or run_manager.is_finished(run_id):
+                return
+            yield ": keep-alive\n\n"
+            continue
+        for event in events:
+            yield format_sse(event)
+        after = events[-1].id
+        if events[-1].type == "end":
+            return
+
+
+def _client_key(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
 
 
 def _default_runner(
@@ -75,13 +147,40 @@ def create_app(
     runner_factory: RunnerFactory | None = None,
 ) -> FastAPI:
     app_settings = settings or get_settings()
+    if app_settings.sandbox_backend == "local":
+        raise ValueError(
+            "SANDBOX_BACKEND=local is for trusted benchmark hosts; "
+            "the API requires docker or modal."
+        )
     create_runner = runner_factory or _default_runner
-    app = FastAPI(title="The Digital Forge", version="0.1.0")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        if app_settings.prewarm_run_modules:
+            app.state.module_warmup = Thread(
+                target=_prewarm,
+                args=(app_settings, readiness),
+                name="module-warmup",
+                daemon=True,
+            )
+            app.state.module_warmup.start()
+        yield
+        app.state.run_manager.close()
+        app.state.rate_limiter.close()
+
+    app = FastAPI(title="The Digital Forge", version="0.1.0", lifespan=lifespan)
     run_manager = RunManager(app_settings, create_runner)
     app.state.run_manager = run_manager
+    readiness = Readiness(
+        _WARMUP_COMPONENTS if app_settings.prewarm_run_modules else ()
+    )
+    app.state.readiness = readiness
     app.state.rate_limiter = RateLimiter(
         app_settings.rate_limit_requests,
         app_settings.rate_limit_window_seconds,
+        build_rate_limit_backend(
+            app_settings.rate_limit_backend, app_settings.rate_limit_path
+        ),
     )
     app.add_middleware(
         CORSMiddleware,
@@ -92,64 +191,131 @@ def create_app(
     )
 
     @app.get("/health")
-    def health() -> dict[str, str]:
+    async def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get(
+        "/ready",
+        response_model=ReadinessReport,
+        responses={503: {"model": ReadinessReport}},
+    )
+    async def ready(response: Response) -> ReadinessReport:
+        report = readiness.report()
+        if not report.ready:
+            response.status_code = 503
+        return report
+
     def enforce_rate_limit(request: Request) -> None:
-        client = request.client.host if request.client else "unknown"
-        if not app.state.rate_limiter.allow(client):
+        if not app.state.rate_limiter.allow(_client_key(request)):
             raise HTTPException(status_code=429, detail="Rate limit exceeded.")
 
     @app.post("/run", response_model=RunResponse)
-    def run_pipeline(
+    async def run_pipeline(
         payload: RunRequest, _rate_limit: None = Depends(enforce_rate_limit)
     ) -> RunResponse:
         if len(payload.request) > app_settings.max_request_characters:
             raise HTTPException(status_code=413, detail="Request is too large.")
         try:
-            run_manager.reserve_external_run()
+            await run_in_threadpool(run_manager.reserve_external_run)
         except ActiveRunLimitExceeded:
             raise HTTPException(
-                status_code=409, detail="Another run is already active."
+                status_code=409, detail="Every run worker is busy."
             ) from None
         except DailyRunLimitExceeded:
             raise HTTPException(
                 status_code=429, detail="Daily model run limit exceeded."
             ) from None
+        except RunManagerClosed:
+            raise HTTPException(
+                status_code=503, detail="The API is shutting down."
+            ) from None
         try:
-            return create_runner(
+            return await run_manager.run_detached(
                 payload.request,
-                app_settings,
-                uuid4(),
-                lambda _state: None,
-                lambda: False,
-            ).run()
+                (
+                    app_settings.model_copy(update={"sandbox_cache_bypass": True})
+                    if payload.bypass_sandbox_cache
+                    else app_settings
+                ),
+            )
         finally:
-            run_manager.release_external_run()
+            await run_in_threadpool(run_manager.release_external_run)
 
     @app.post("/runs", response_model=RunSnapshot, status_code=202)
     def start_run(
-        payload: RunRequest, _rate_limit: None = Depends(enforce_rate_limit)
+        payload: RunRequest,
+        request: Request,
+        _rate_limit: None = Depends(enforce_rate_limit),
     ) -> RunSnapshot:
         if len(payload.request) > app_settings.max_request_characters:
             raise HTTPException(status_code=413, detail="Request is too large.")
         try:
-            return run_manager.start(payload.request)
-        except ActiveRunLimitExceeded:
-            raise HTTPException(
-                status_code=409, detail="Another run is already active."
-            ) from None
+            return run_manager.start(
+                payload.request,
+                client=_client_key(request),
+                bypass_sandbox_cache=payload.bypass_sandbox_cache,
+            )
+        except RunQueueFull as exc:
+            raise HTTPException(status_code=429, detail=str(exc)) from None
         except DailyRunLimitExceeded:
             raise HTTPException(
                 status_code=429, detail="Daily model run limit exceeded."
             ) from None
+        except RunManagerClosed:
+            raise HTTPException(
+                status_code=503, detail="The API is shutting down."
+            ) from None
 
-    @app.get("/runs/{run_id}", response_model=RunSnapshot)
-    def get_run(run_id: UUID) -> RunSnapshot:
-        snapshot = run_manager.get(run_id)
-        if snapshot is None:
+    @app.get("/runs/metrics", response_model=SchedulerMetrics)
+    def run_metrics() -> SchedulerMetrics:
+        metrics = run_manager.metrics()
+        # Until a run or the warm-up loads the pipeline no query has been
+        # served, and importing it here would load chromadb on a read path.
+        pipeline = sys.modules.get("backend.pipeline")
+        if pipeline is None:
+            return metrics
+        try:
+            cache = pipeline.query_cache_stats(app_settings)
+        except Exception:
+            return metrics
+        return metrics.model_copy(update={"rag_query_cache": cache})
+
+    @app.get(
+        "/runs/{run_id}",
+        response_model=RunSnapshot | RunSnapshotDelta,
+        responses={304: {"description": "Nothing changed after `since`."}},
+    )
+    def get_run(
+        run_id: UUID, since: int | None = Query(default=None, ge=0)
+    ) -> RunSnapshot | RunSnapshotDelta | Response:
+        if since is None:
+            snapshot = run_manager.get(run_id)
+            if snapshot is None:
+                raise HTTPException(status_code=404, detail="Run not found.")
+            return snapshot
+        changes = run_manager.changes_since(run_id, since)
+        if changes is None:
             raise HTTPException(status_code=404, detail="Run not found.")
-        return snapshot
+        if isinstance(changes, RunSnapshot):
+            return Response(status_code=304, headers={"ETag": f'"{changes.version}"'})
+        return changes
+
+    @app.get(
+        "/runs/{run_id}/events",
+        response_class=StreamingResponse,
+        responses={200: {"content": {"text/event-stream": {}}}},
+    )
+    def stream_run_events(
+        run_id: UUID, last_event_id: str | None = Header(default=None)
+    ) -> StreamingResponse:
+        after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+        if run_manager.wait_for_events(run_id, after) is None:
+            raise HTTPException(status_code=404, detail="Run not found.")
+        return StreamingResponse(
+            _event_stream(run_manager, run_id, after),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     @app.post("/runs/{run_id}/cancel", response_model=RunSnapshot)
     def cancel_run(run_id: UUID) -> RunSnapshot:
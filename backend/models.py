@@ -2,11 +2,12 @@
 
 from datetime import datetime, timezone
 from enum import Enum
+from typing import Any
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from rag.models import RetrievalEvent
+from rag.models import QueryCacheStats, RetrievalEvent
 
 from .workspace import RunWorkspace
 
@@ -38,6 +39,12 @@ class RunAgent(str, Enum):
     argus = "argus"
 
 
+class ComponentStatus(str, Enum):
+    pending = "pending"
+    ready = "ready"
+    failed = "failed"
+
+
 class AttemptStatus(str, Enum):
     passed = "passed"
     failed = "failed"
@@ -52,6 +59,7 @@ class RunRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
     request: str = Field(min_length=1)
+    bypass_sandbox_cache: bool = False
 
 
 class RunResponse(BaseModel):
@@ -90,6 +98,12 @@ class RunArtifact(BaseModel):
     content: str
 
 
+class SandboxCacheStats(BaseModel):
+    hits: int = Field(default=0, ge=0)
+    misses: int = Field(default=0, ge=0)
+    seconds_saved: float = Field(default=0.0, ge=0)
+
+
 class DevelopmentPlan(BaseModel):
     file_name: str = Field(pattern=r"^[a-z][a-z0-9_]*\.py$")
     test_file_name: str = Field(pattern=r"^test_[a-z][a-z0-9_]*\.py$")
@@ -114,6 +128,7 @@ class RunState(BaseModel):
     status: RunStatus = RunStatus.pending
     stage: RunStage = RunStage.queued
     active_agent: RunAgent | None = None
+    active_agents: tuple[RunAgent, ...] = ()
     attempts: int = 0
     attempt_history: list[RunAttempt] = Field(default_factory=list)
     events: list[RunEvent] = Field(default_factory=list)
@@ -121,18 +136,26 @@ class RunState(BaseModel):
     plan: DevelopmentPlan | None = None
     test_results: str | None = None
     retrieval_events: list[RetrievalEvent] = Field(default_factory=list)
+    sandbox_cache: SandboxCacheStats = Field(default_factory=SandboxCacheStats)
     report: str | None = None
 
 
 class RunSnapshot(BaseModel):
+    """An immutable published view of one run, shared by every reader."""
+
+    model_config = ConfigDict(frozen=True)
+
     run_id: UUID
+    version: int = Field(default=0, ge=0)
     request: str
     status: RunStatus
     stage: RunStage
     active_agent: RunAgent | None = None
+    active_agents: tuple[RunAgent, ...] = ()
     attempts_used: int = Field(ge=0)
     max_attempts: int = Field(ge=1)
     cancel_requested: bool = False
+    queue_position: int | None = Field(default=None, ge=1)
     created_at: datetime
     updated_at: datetime
     technical_brief: str | None = None
@@ -143,4 +166,51 @@ class RunSnapshot(BaseModel):
     events: tuple[RunEvent, ...] = ()
     artifacts: tuple[RunArtifact, ...] = ()
     retrieval_events: tuple[RetrievalEvent, ...] = ()
+    sandbox_cache: SandboxCacheStats = Field(default_factory=SandboxCacheStats)
+    error: str | None = None
+
+
+class RunSnapshotDelta(BaseModel):
+    """Fields replaced and items appended to a run after version ``since``."""
+
+    model_config = ConfigDict(frozen=True)
+
+    run_id: UUID
+    version: int = Field(ge=1)
+    since: int = Field(ge=0)
+    changes: dict[str, Any] = Field(default_factory=dict)
+    appended: dict[str, list[Any]] = Field(default_factory=dict)
+
+
+class RunStreamEvent(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    id: int = Field(ge=1)
+    type: str
+    data: dict[str, Any]
+
+
+class SchedulerMetrics(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    capacity: int = Field(ge=1)
+    active_runs: int = Field(ge=0)
+    queued_runs: int = Field(ge=0)
+    queued_clients: int = Field(ge=0)
+    started_runs: int = Field(ge=0)
+    average_wait_seconds: float = Field(ge=0)
+    max_wait_seconds: float = Field(ge=0)
+    oldest_queued_seconds: float = Field(ge=0)
+    rag_query_cache: QueryCacheStats | None = None
+
+
+class ComponentReadiness(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    status: ComponentStatus = ComponentStatus.pending
     error: str | None = None
+
+
+class ReadinessReport(BaseModel):
+    ready: bool
+    components: dict[str, ComponentReadiness] = Field(default_factory=dict)
@@ -1,14 +1,18 @@
 """The isolated Digital Forge orchestration pipeline."""
 
+import asyncio
 import json
 import re
 from collections.abc import Callable
+from functools import partial
+from typing import Any
 from uuid import UUID
 
-from crewai import Agent, Crew
+from crewai import Agent, Crew, Task
 from pydantic import BaseModel
 
-from rag.index import get_retriever
+from rag.index import CachedRetriever, DocumentationRetriever, get_retriever
+from rag.models import QueryCacheStats
 
 from .agents import build_agents
 from .artifact_validation import (
@@ -29,7 +33,14 @@ from .models import (
     RunStatus,
 )
 from .retrieval import build_retrieval_tools
-from .sandbox import build_sandbox_runner
+from .sandbox import (
+    DockerSandboxRunner,
+    ModalSandboxRunner,
+    SandboxLimits,
+    SandboxRunner,
+    build_sandbox_runner,
+)
+from .sandbox_cache import get_sandbox_result_cache
 from .self_healing import (
     FailureKind,
     failure_kind_from_output,
@@ -58,6 +69,64 @@ def _parse_json(raw_output: object) -> dict[str, object]:
     return parsed
 
 
+def retriever_for(settings: Settings) -> DocumentationRetriever:
+    """Return the process-wide retriever shared by runs with these settings."""
+    return get_retriever(
+        settings.rag_index_path,
+        backend=settings.rag_backend,
+        ranking=settings.rag_ranking,
+        cache_entries=settings.rag_query_cache_entries,
+    )
+
+
+def query_cache_stats(settings: Settings) -> QueryCacheStats | None:
+    """Report the shared retrieval cache, or ``None`` when caching is disabled."""
+    retriever = retriever_for(settings)
+    return retriever.stats() if isinstance(retriever, CachedRetriever) else None
+
+
+def sandbox_limits(settings: Settings) -> SandboxLimits:
+    return SandboxLimits(
+        wall_time_seconds=settings.sandbox_timeout_seconds,
+        memory_mib=settings.sandbox_memory_mib,
+        cpu_cores=settings.sandbox_cpu_cores,
+        process_limit=settings.sandbox_process_limit,
+    )
+
+
+def sandbox_runner_for(settings: Settings) -> SandboxRunner:
+    return build_sandbox_runner(
+        settings.sandbox_backend,
+        settings.docker_sandbox_image,
+        settings.modal_sandbox_app,
+        limits=sandbox_limits(settings),
+        docker_pool_size=settings.docker_pool_size,
+        docker_pool_max_uses=settings.docker_pool_max_uses,
+        docker_pool_health_check=settings.docker_pool_health_check,
+        modal_pool_size=settings.modal_pool_size,
+        modal_pool_idle_ttl_seconds=settings.modal_pool_idle_ttl_seconds,
+        modal_pool_max_uses=settings.modal_pool_max_uses,
+    )
+
+
+def warm_sandbox(settings: Settings) -> None:
+    """Resolve the sandbox backend and its image before the first run."""
+    runner = sandbox_runner_for(settings)
+    if isinstance(runner, DockerSandboxRunner):
+        runner.warm()
+    elif isinstance(runner, ModalSandboxRunner):
+        runner.warm(sandbox_limits(settings))
+
+
+def prewarm_steps(settings: Settings) -> tuple[tuple[str, Callable[[], object]], ...]:
+    """Startup work that would otherwise land inside the first run's latency."""
+    return (
+        ("agents", partial(build_agents, settings.openai_model_name)),
+        ("retriever", partial(retriever_for, settings)),
+        ("sandbox", partial(warm_sandbox, settings)),
+    )
+
+
 class RunCancelled(Exception):
     """Raised at a workflow boundary after cancellation is requested."""
 
@@ -81,11 +150,7 @@ class DevelopmentCrew:
         self.on_update = on_update
         self.is_cancel_requested = is_cancel_requested or (lambda: False)
         self.agents: dict[str, Agent] = build_agents(self.settings.openai_model_name)
-        sandbox_runner = build_sandbox_runner(
-            self.settings.sandbox_backend,
-            self.settings.docker_sandbox_image,
-            self.settings.modal_sandbox_app,
-        )
+        sandbox_runner = sandbox_runner_for(self.settings)
         tools = build_file_system_tools(
             self.state.workspace,
             sandbox_runner,
@@ -93,9 +158,20 @@ class DevelopmentCrew:
             memory_mib=self.settings.sandbox_memory_mib,
             cpu_cores=self.settings.sandbox_cpu_cores,
             process_limit=self.settings.sandbox_process_limit,
+            result_cache=(
+                get_sandbox_result_cache(
+                    self.settings.sandbox_cache_entries,
+                    self.settings.sandbox_cache_path,
+                )
+                if self.settings.sandbox_cache_entries > 0
+                or self.settings.sandbox_cache_path is not None
+                else None
+            ),
+            cache_stats=self.state.sandbox_cache,
+            bypass_result_cache=self.settings.sandbox_cache_bypass,
         )
         retrieval_tools = build_retrieval_tools(
-            get_retriever(self.settings.rag_index_path),
+            retriever_for(self.settings),
             self.state.retrieval_events,
             result_limit=self.settings.rag_result_limit,
         )
@@ -103,6 +179,15 @@ class DevelopmentCrew:
         self.tasks = build_tasks(self.agents, tools, retrieval_tools)
 
     def run(self) -> RunResponse:
+        """Run the pipeline to completion on a private event loop."""
+        return asyncio.run(self.arun())
+
+    async def arun(self) -> RunResponse:
+        """Run the pipeline; every agent and sandbox stage is awaited.
+
+        Cancelling the awaiting task stops the current stage immediately and
+        records the run as cancelled before the cancellation propagates.
+        """
         self.settings.require_openai_api_key()
         self.state.status = RunStatus.running
         try:
@@ -113,11 +198,11 @@ class DevelopmentCrew:
             )
             self._checkpoint()
             technical_brief = str(
-                Crew(
-                    agents=[self.agents["liaison"]],
-                    tasks=[self.tasks.brief],
-                    verbose=False,
-                ).kickoff(inputs={"user_request": self.state.request})
+                await self._kickoff(
+                    "liaison",
+                    self.tasks.brief,
+                    inputs={"user_request": self.state.request},
+                )
             )
             self.state.technical_brief = technical_brief
             self._transition(
@@ -128,20 +213,18 @@ class DevelopmentCrew:
             self._checkpoint()
             plan = DevelopmentPlan.model_validate(
                 _parse_json(
-                    Crew(
-                        agents=[self.agents["lead"]],
-                        tasks=[self.tasks.plan],
-                        verbose=False,
-                    ).kickoff(
+                    await self._kickoff(
+                        "lead",
+                        self.tasks.plan,
                         inputs={
                             "user_request": self.state.request,
                             "technical_brief": technical_brief,
-                        }
+                        },
                     )
                 )
             )
             self.state.plan = plan
-            test_results = self._develop_and_test(plan)
+            test_results = await self._develop_and_test(plan)
             self.state.test_results = test_results
             self._transition(
                 RunStage.reporting,
@@ -149,7 +232,9 @@ class DevelopmentCrew:
                 RunAgent.janus,
             )
             self._checkpoint()
-            report = self._generate_final_report(technical_brief, test_results, plan)
+            report = await self._generate_final_report(
+                technical_brief, test_results, plan
+            )
             self.state.report = report
             self.state.status = (
                 RunStatus.completed
@@ -176,15 +261,10 @@ class DevelopmentCrew:
                 retrieval_events=tuple(self.state.retrieval_events),
             )
         except RunCancelled:
-            self.state.status = RunStatus.cancelled
-            self.state.report = "Run cancelled at the next safe workflow boundary."
-            self._transition(RunStage.cancelled, "The run was cancelled.")
-            return RunResponse(
-                run_id=self.state.run_id,
-                status=self.state.status,
-                report=self.state.report,
-                retrieval_events=tuple(self.state.retrieval_events),
-            )
+            return self._cancelled("Run cancelled at the next safe workflow boundary.")
+        except asyncio.CancelledError:
+            self._cancelled("Run cancelled while a stage was in progress.")
+            raise
         except Exception:
             self.state.status = RunStatus.failed
             self._transition(
@@ -193,7 +273,7 @@ class DevelopmentCrew:
             )
             raise
 
-    def _develop_and_test(self, plan: DevelopmentPlan) -> str:
+    async def _develop_and_test(self, plan: DevelopmentPlan) -> str:
         developer_task = plan.developer_task
         tester_task = plan.tester_task
         test_results = ""
@@ -201,18 +281,12 @@ class DevelopmentCrew:
         infrastructure_retries = 0
         self._transition(
             RunStage.developing,
-            "Hephaestus is writing application code.",
+            "Hephaestus is writing application code while Argus writes the test suite.",
             RunAgent.hephaestus,
-        )
-        self._checkpoint()
-        self._run_developer(plan, developer_task)
-        self._transition(
-            RunStage.developing,
-            "Argus is writing the test suite.",
             RunAgent.argus,
         )
         self._checkpoint()
-        self._run_test_author(plan, tester_task)
+        await self._run_authors(plan, developer_task, tester_task)
 
         while candidate_attempts < self.settings.max_attempts:
             self._transition(
@@ -221,7 +295,7 @@ class DevelopmentCrew:
                 RunAgent.argus,
             )
             self._checkpoint()
-            test_results = self._run_tests(plan)
+            test_results = await self._run_tests(plan)
             failure_kind = failure_kind_from_output(test_results)
             if failure_kind is FailureKind.infrastructure:
                 infrastructure_retries += 1
@@ -284,12 +358,17 @@ class DevelopmentCrew:
                     f"failure evidence:\n{test_results}"
                 )
             else:
-                repair = self._analyze_failure(plan, test_results)
+                repair = await self._analyze_failure(plan, test_results)
                 file_to_fix = str(repair["file_to_fix"])
                 next_task = str(repair["next_task"])
-            repair_target = (
-                "tests" if file_to_fix == plan.test_file_name else "application"
-            )
+                if file_to_fix not in {plan.file_name, plan.test_file_name, "both"}:
+                    raise ValueError(
+                        "Repair target must be the application or test file."
+                    )
+            repair_target = {
+                plan.file_name: "application",
+                plan.test_file_name: "tests",
+            }.get(file_to_fix, file_to_fix)
             self._record_attempt(
                 plan,
                 test_results,
@@ -297,14 +376,21 @@ class DevelopmentCrew:
                 candidate_attempt=candidate_attempts,
                 repair_target=repair_target,
             )
-            repair_subject = "test suite" if repair_target == "tests" else "application"
+            repair_subject = {
+                "tests": "test suite",
+                "both": "application and test suite",
+            }.get(repair_target, "application")
+            repair_agents = {
+                "tests": (RunAgent.argus,),
+                "both": (RunAgent.hephaestus, RunAgent.argus),
+            }.get(repair_target, (RunAgent.hephaestus,))
             self._transition(
                 RunStage.repairing,
                 f"The {repair_subject} is being repaired before the next attempt.",
-                (RunAgent.argus if repair_target == "tests" else RunAgent.hephaestus),
+                *repair_agents,
             )
             self._checkpoint()
-            if file_to_fix == plan.test_file_name:
+            if file_to_fix != plan.file_name:
                 self.state.workspace.write(
                     plan.test_file_name,
                     "# Previous generated tests were discarded after a test-owned failure.\n",
@@ -314,12 +400,14 @@ class DevelopmentCrew:
                     "testing plan. Do not preserve assertions or expected values from the "
                     f"discarded suite. Root-cause guidance:\n{next_task}"
                 )
-                self._run_test_author(plan, tester_task)
-            elif file_to_fix == plan.file_name:
+            if file_to_fix != plan.test_file_name:
                 developer_task = next_task
-                self._run_developer(plan, developer_task)
+            if file_to_fix == plan.test_file_name:
+                await self._run_test_author(plan, tester_task)
+            elif file_to_fix == plan.file_name:
+                await self._run_developer(plan, developer_task)
             else:
-                raise ValueError("Repair target must be the application or test file.")
+                await self._run_authors(plan, developer_task, tester_task)
         return test_results
 
     def _record_attempt(
@@ -350,11 +438,11 @@ class DevelopmentCrew:
         )
         self._notify()
 
-    def _transition(
-        self, stage: RunStage, message: str, agent: RunAgent | None = None
-    ) -> None:
+    def _transition(self, stage: RunStage, message: str, *agents: RunAgent) -> None:
+        """Enter ``stage`` with ``agents`` working, the first one leading it."""
         self.state.stage = stage
-        self.state.active_agent = agent
+        self.state.active_agent = agents[0] if agents else None
+        self.state.active_agents = agents
         self.state.events.append(RunEvent(stage=stage, message=message))
         self._notify()
 
@@ -366,29 +454,64 @@ class DevelopmentCrew:
         if self.is_cancel_requested():
             raise RunCancelled
 
-    def _run_developer(self, plan: DevelopmentPlan, developer_task: str) -> None:
+    def _cancelled(self, report: str) -> RunResponse:
+        self.state.status = RunStatus.cancelled
+        self.state.report = report
+        self._transition(RunStage.cancelled, "The run was cancelled.")
+        return RunResponse(
+            run_id=self.state.run_id,
+            status=self.state.status,
+            report=report,
+            retrieval_events=tuple(self.state.retrieval_events),
+        )
+
+    async def _run_authors(
+        self, plan: DevelopmentPlan, developer_task: str, tester_task: str
+    ) -> None:
+        """Write the application and its tests at once; each needs only the plan."""
+        authors = [
+            asyncio.ensure_future(self._run_developer(plan, developer_task)),
+            asyncio.ensure_future(self._run_test_author(plan, tester_task)),
+        ]
+        try:
+            await asyncio.gather(*authors)
+        finally:
+            for author in authors:
+                author.cancel()
+            await asyncio.gather(*authors, return_exceptions=True)
+        self._checkpoint()
+
+    async def _kickoff(self, agent: str, task: Task, inputs: dict[str, Any]) -> Any:
+        """Run one agent's task without stalling the loop other runs share.
+
+        CrewAI calls agent tools synchronously even from ``akickoff``, so a task
+        that carries tools, such as sandboxed test runs or documentation search,
+        runs on a worker thread instead.
+        """
+        crew = Crew(agents=[self.agents[agent]], tasks=[task], verbose=False)
+        if task.tools:
+            return await asyncio.to_thread(crew.kickoff, inputs=inputs)
+        return await crew.akickoff(inputs=inputs)
+
+    async def _run_developer(self, plan: DevelopmentPlan, developer_task: str) -> None:
         current_code = self.state.workspace.read(plan.file_name)
-        Crew(
-            agents=[self.agents["developer"]],
-            tasks=[self.tasks.develop],
-            verbose=False,
-        ).kickoff(
+        await self._kickoff(
+            "developer",
+            self.tasks.develop,
             inputs={
                 "original_developer_task": plan.developer_task,
                 "user_request": self.state.request,
                 "developer_task": developer_task,
                 "file_name": plan.file_name,
                 "current_code": current_code or "<no existing application code>",
-            }
+            },
         )
 
-    def _run_test_author(self, plan: DevelopmentPlan, tester_task: str) -> None:
+    async def _run_test_author(self, plan: DevelopmentPlan, tester_task: str) -> None:
         current_tests = self.state.workspace.read(plan.test_file_name)
-        Crew(
-            agents=[self.agents["tester"]],
-            tasks=[self.tasks.test_suite],
-            verbose=False,
-        ).kickoff(
+        await self._kickoff(
+            "tester",
+            self.tasks.test_suite,
             inputs={
                 "original_tester_task": plan.tester_task,
                 "user_request": self.state.request,
@@ -396,10 +519,10 @@ class DevelopmentCrew:
                 "file_name": plan.file_name,
                 "test_file_name": plan.test_file_name,
                 "current_tests": current_tests or "<no existing test code>",
-            }
+            },
         )
 
-    def _run_tests(self, plan: DevelopmentPlan) -> str:
+    async def _run_tests(self, plan: DevelopmentPlan) -> str:
         application_code = self.state.workspace.read(plan.file_name)
         if application_code is not None:
             application_error = validate_application_artifact(
@@ -427,19 +550,17 @@ class DevelopmentCrew:
                     "TESTS FAILED:\nFAILURE CLASS: test\n"
                     f"TEST ARTIFACT FAILURE: {test_error}"
                 )
-        return str(self.run_tests_tool.run(test_file_path=plan.test_file_name))
+        return str(await self.run_tests_tool.arun(test_file_path=plan.test_file_name))
 
-    def _analyze_failure(
+    async def _analyze_failure(
         self, plan: DevelopmentPlan, test_results: str
     ) -> dict[str, object]:
         current_code = self.state.workspace.read(plan.file_name)
         current_tests = self.state.workspace.read(plan.test_file_name)
         return _parse_json(
-            Crew(
-                agents=[self.agents["lead"]],
-                tasks=[self.tasks.analyze_failure],
-                verbose=False,
-            ).kickoff(
+            await self._kickoff(
+                "lead",
+                self.tasks.analyze_failure,
                 inputs={
                     "developer_task": plan.developer_task,
                     "user_request": self.state.request,
@@ -448,11 +569,11 @@ class DevelopmentCrew:
                     "test_file_name": plan.test_file_name,
                     "current_code": current_code or "<application code unavailable>",
                     "current_tests": current_tests or "<test code unavailable>",
-                }
+                },
             )
         )
 
-    def _generate_final_report(
+    async def _generate_final_report(
         self, brief: str, tests_output: str, plan: DevelopmentPlan
     ) -> str:
         final_code = self.state.workspace.read(plan.file_name)
@@ -470,11 +591,9 @@ class DevelopmentCrew:
             if INFRASTRUCTURE_EXHAUSTED_MARKER in tests_output
             else "Process completed with failing tests."
         )
-        raw_report = Crew(
-            agents=[self.agents["liaison"]],
-            tasks=[self.tasks.final_report],
-            verbose=False,
-        ).kickoff(
+        raw_report = await self._kickoff(
+            "liaison",
+            self.tasks.final_report,
             inputs={
                 "technical_brief": brief,
                 "final_code": final_code,
@@ -484,7 +603,7 @@ class DevelopmentCrew:
                 "test_file_name": plan.test_file_name,
                 "final_outcome_summary": outcome,
                 "retrieval_evidence": self._format_retrieval_evidence(),
-            }
+            },
         )
         report = str(raw_report)
         match = re.search(r"```markdown(.*)```", report, re.DOTALL)
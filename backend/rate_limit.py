@@ -0,0 +1,175 @@
+"""Per-client request limits shared by every API worker that uses one backend."""
+
+import math
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Protocol
+
+
+class RateLimitBackend(Protocol):
+    def acquire(self, key: str, limit: int, window_seconds: float) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass(frozen=True)
+class _Counter:
+    window: int
+    current: int
+    previous: int
+
+
+def _admit(
+    counter: _Counter | None, now: float, limit: int, window_seconds: float
+) -> tuple[_Counter, bool]:
+    """Apply one request to a sliding-window counter.
+
+    The previous fixed window's count is weighted by how much of it still
+    overlaps the sliding window, which approximates a log of every request with
+    two integers per client.
+    """
+    position = now / window_seconds
+    window = math.floor(position)
+    if counter is None or counter.window < window - 1:
+        counter = _Counter(window, 0, 0)
+    elif counter.window == window - 1:
+        counter = _Counter(window, 0, counter.current)
+    overlap = 1.0 - (position - window)
+    if counter.previous * overlap + counter.current >= limit:
+        return counter, False
+    return _Counter(window, counter.current + 1, counter.previous), True
+
+
+class _Shard:
+    def __init__(self) -> None:
+        self.counters: dict[str, _Counter] = {}
+        self.swept_window = 0
+        self.lock = Lock()
+
+
+class LocalRateLimitBackend:
+    """Keep counters in process memory, split across independently locked shards.
+
+    A counter more than one window old no longer affects any decision, so each
+    shard drops those at most once per window instead of keeping every client
+    it has ever seen.
+    """
+
+    def __init__(
+        self, shards: int = 16, clock: Callable[[], float] = time.time
+    ) -> None:
+        self._shards = tuple(_Shard() for _ in range(shards))
+        self._clock = clock
+
+    def acquire(self, key: str, limit: int, window_seconds: float) -> bool:
+        now = self._clock()
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            counter, allowed = _admit(
+                shard.counters.get(key), now, limit, window_seconds
+            )
+            shard.counters[key] = counter
+            if counter.window > shard.swept_window:
+                shard.counters = {
+                    name: entry
+                    for name, entry in shard.counters.items()
+                    if entry.window >= counter.window - 1
+                }
+                shard.swept_window = counter.window
+        return allowed
+
+    def __len__(self) -> int:
+        return sum(len(shard.counters) for shard in self._shards)
+
+    def close(self) -> None:
+        return None
+
+
+class SqliteRateLimitBackend:
+    """Share counters between worker processes through one SQLite file.
+
+    Each decision runs in its own write transaction, so workers on the same host
+    serialize on the database rather than on a process lock.
+    """
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.time) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        self._clock = clock
+        self._swept_window = 0
+        self._lock = Lock()
+        with self._lock:
+            self._connection.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    window INTEGER NOT NULL,
+                    current INTEGER NOT NULL,
+                    previous INTEGER NOT NULL
+                );
+                """
+            )
+
+    def acquire(self, key: str, limit: int, window_seconds: float) -> bool:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            row = self._connection.execute(
+                "SELECT window, current, previous FROM rate_limits WHERE key = ?",
+                (key,),
+            ).fetchone()
+            counter, allowed = _admit(
+                _Counter(*row) if row else None,
+                self._clock(),
+                limit,
+                window_seconds,
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?)",
+                (key, counter.window, counter.current, counter.previous),
+            )
+            if counter.window > self._swept_window:
+                self._connection.execute(
+                    "DELETE FROM rate_limits WHERE window < ?", (counter.window - 1,)
+                )
+                self._swept_window = counter.window
+        return allowed
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RateLimiter:
+    """Per-client sliding-window limit for the public demo API."""
+
+    def __init__(
+        self,
+        request_limit: int,
+        window_seconds: float,
+        backend: RateLimitBackend | None = None,
+    ):
+        self.request_limit = request_limit
+        self.window_seconds = window_seconds
+        self.backend = backend if backend is not None else LocalRateLimitBackend()
+
+    def allow(self, key: str) -> bool:
+        return self.backend.acquire(key, self.request_limit, self.window_seconds)
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def build_rate_limit_backend(backend: str, path: Path) -> RateLimitBackend:
+    if backend == "memory":
+        return LocalRateLimitBackend()
+    if backend == "sqlite":
+        return SqliteRateLimitBackend(path)
+    raise ValueError(f"Unsupported rate limit backend: {backend}")
@@ -4,12 +4,12 @@ from collections.abc import Sequence
 
 from crewai.tools import BaseTool, tool
 
-from rag.index import ChromaRetriever
+from rag.index import DocumentationRetriever
 from rag.models import RetrievalEvent
 
 
 def build_retrieval_tools(
-    retriever: ChromaRetriever,
+    retriever: DocumentationRetriever,
     event_log: list[RetrievalEvent],
     *,
     result_limit: int = 3,
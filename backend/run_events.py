@@ -0,0 +1,166 @@
+"""Incremental run events derived from consecutive run snapshots."""
+
+import json
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+from .models import RunSnapshot, RunSnapshotDelta, RunStatus, RunStreamEvent
+
+_T = TypeVar("_T")
+
+TERMINAL_STATUSES = frozenset(
+    {RunStatus.completed, RunStatus.failed, RunStatus.cancelled}
+)
+_PROGRESS_FIELDS = (
+    "status",
+    "stage",
+    "active_agent",
+    "active_agents",
+    "attempts_used",
+    "queue_position",
+    "cancel_requested",
+)
+APPEND_ONLY_FIELDS = ("events", "attempts", "retrieval_events")
+_UNVERSIONED_FIELDS = frozenset({"run_id", "version"})
+_RESULT_FIELDS = (
+    "technical_brief",
+    "plan",
+    "test_results",
+    "report",
+    "error",
+    "sandbox_cache",
+)
+
+
+def snapshot_changes(
+    previous: RunSnapshot | None, current: RunSnapshot
+) -> list[tuple[str, dict[str, Any]]]:
+    """Describe what changed between two snapshots of one run.
+
+    Events, attempts, and retrieval events grow by appending, so only items past
+    the shared prefix are emitted. Artifacts are emitted when their content
+    changes.
+    """
+    changes: list[tuple[str, dict[str, Any]]] = []
+    progress = _changed_fields(previous, current, _PROGRESS_FIELDS)
+    if progress:
+        changes.append(("progress", progress))
+    for item in appended_items(previous.events if previous else (), current.events):
+        changes.append(("event", item.model_dump(mode="json")))
+    for attempt in appended_items(
+        previous.attempts if previous else (), current.attempts
+    ):
+        changes.append(("attempt", attempt.model_dump(mode="json")))
+    previous_artifacts = (
+        {artifact.path: artifact for artifact in previous.artifacts} if previous else {}
+    )
+    for artifact in current.artifacts:
+        if previous_artifacts.get(artifact.path) != artifact:
+            changes.append(("artifact", artifact.model_dump(mode="json")))
+    for retrieval in appended_items(
+        previous.retrieval_events if previous else (), current.retrieval_events
+    ):
+        changes.append(("retrieval", retrieval.model_dump(mode="json")))
+    result = _changed_fields(previous, current, _RESULT_FIELDS)
+    if result:
+        changes.append(("result", result))
+    if current.status in TERMINAL_STATUSES and (
+        previous is None or previous.status not in TERMINAL_STATUSES
+    ):
+        changes.append(("end", {"status": current.status.value}))
+    return changes
+
+
+class SnapshotHistory:
+    """Remember the version at which each field of one run last changed.
+
+    Append-only fields keep one version per item, so a delta since any version
+    costs a binary search plus the size of the change, not the run's history.
+
+    ``record`` runs under the run manager's lock, but ``delta`` may run without
+    it. Appends only extend version lists past what an older snapshot can see,
+    and a list reset publishes fresh tables in one assignment, so a reader that
+    loaded the snapshot first always gets a consistent, possibly larger, delta.
+    """
+
+    def __init__(self) -> None:
+        self._tables: tuple[dict[str, int], dict[str, list[int]]] = ({}, {})
+
+    def record(self, previous: RunSnapshot | None, current: RunSnapshot) -> None:
+        version = current.version
+        field_versions, item_versions = self._tables
+        changed: dict[str, int] = {}
+        reset: dict[str, list[int]] = {}
+        for name in RunSnapshot.model_fields:
+            if name in _UNVERSIONED_FIELDS:
+                continue
+            value = getattr(current, name)
+            if name in APPEND_ONLY_FIELDS:
+                before = getattr(previous, name) if previous else ()
+                appended = appended_items(before, value)
+                if previous is not None and len(value) - len(appended) == len(before):
+                    item_versions[name].extend([version] * len(appended))
+                else:
+                    changed[name] = version
+                    reset[name] = [version] * len(value)
+            elif previous is None or getattr(previous, name) != value:
+                changed[name] = version
+        if reset:
+            self._tables = (
+                {**field_versions, **changed},
+                {**item_versions, **reset},
+            )
+        else:
+            field_versions.update(changed)
+
+    def delta(self, snapshot: RunSnapshot, since: int) -> RunSnapshotDelta | None:
+        """Return what changed after ``since``, or ``None`` when nothing did."""
+        if since >= snapshot.version:
+            return None
+        field_versions, item_versions = self._tables
+        changed = {name for name, version in field_versions.items() if version > since}
+        appended: dict[str, list[Any]] = {}
+        for name in APPEND_ONLY_FIELDS:
+            if name in changed:
+                continue
+            start = bisect_right(item_versions[name], since)
+            items = getattr(snapshot, name)[start:]
+            if items:
+                appended[name] = [item.model_dump(mode="json") for item in items]
+        return RunSnapshotDelta(
+            run_id=snapshot.run_id,
+            version=snapshot.version,
+            since=since,
+            changes=snapshot.model_dump(mode="json", include=changed),
+            appended=appended,
+        )
+
+
+def format_sse(event: RunStreamEvent) -> str:
+    data = json.dumps(event.data, separators=(",", ":"))
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+def _changed_fields(
+    previous: RunSnapshot | None, current: RunSnapshot, fields: tuple[str, ...]
+) -> dict[str, Any]:
+    dumped = current.model_dump(mode="json", include=set(fields))
+    if previous is None:
+        return {name: value for name, value in dumped.items() if value is not None}
+    return {
+        name: dumped[name]
+        for name in fields
+        if getattr(previous, name) != getattr(current, name)
+    }
+
+
+def appended_items(previous: Sequence[_T], current: Sequence[_T]) -> Sequence[_T]:
+    if previous is current:
+        return current[len(current) :]
+    shared = 0
+    for before, after in zip(previous, current):
+        if before is not after and before != after:
+            break
+        shared += 1
+    return current[shared:]
@@ -1,9 +1,17 @@
-"""Thread-safe in-memory run coordination for the polling API."""
+"""Thread-safe run coordination for the polling API."""
 
+import asyncio
+from collections import OrderedDict, deque
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
 from datetime import date
-from threading import Event, RLock, Thread, Timer
-from typing import Protocol
+from functools import partial
+from operator import itemgetter
+from threading import Condition, Event, RLock, Thread
+from time import monotonic
+from typing import Protocol, TypeVar
 from uuid import UUID, uuid4
 
 from .config import Settings
@@ -12,13 +20,20 @@ from .models import (
     RunEvent,
     RunResponse,
     RunSnapshot,
+    RunSnapshotDelta,
     RunStage,
     RunState,
     RunStatus,
+    RunStreamEvent,
+    SchedulerMetrics,
     utc_now,
 )
+from .run_events import TERMINAL_STATUSES, SnapshotHistory, snapshot_changes
+from .run_store import RunStore, build_run_store
 from .self_healing import sanitize_output
 
+_T = TypeVar("_T")
+
 
 class Runner(Protocol):
     def run(self) -> RunResponse: ...
@@ -32,27 +47,124 @@ RunnerFactory = Callable[
 
 
 class ActiveRunLimitExceeded(Exception):
-    """Raised when the public demo already has a run in progress."""
+    """Raised when a synchronous run finds every worker busy or runs queued."""
+
+
+class RunQueueFull(Exception):
+    """Raised when the run queue, or one client's share of it, is full."""
 
 
 class DailyRunLimitExceeded(Exception):
     """Raised when process-local model-backed run budget is exhausted."""
 
 
+class RunManagerClosed(Exception):
+    """Raised when work is submitted after the manager has been closed."""
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+async def _stop_loop() -> None:
+    """Let cancelled runs record their final state, then stop the run loop."""
+    tasks = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    asyncio.get_running_loop().stop()
+
+
+def _artifact(
+    current: tuple[RunArtifact, ...], path: str, kind: str, content: str
+) -> RunArtifact:
+    """Reuse the published artifact while its file content is unchanged."""
+    for artifact in current:
+        if artifact.path == path and artifact.content == content:
+            return artifact
+    return RunArtifact(path=path, kind=kind, content=content)
+
+
+def _grown(current: tuple[_T, ...], items: list[_T]) -> tuple[_T, ...]:
+    """Reuse the stored tuple while the run's append-only list has not grown."""
+    if len(current) == len(items) and (not items or current[-1] == items[-1]):
+        return current
+    return tuple(items)
+
+
+@dataclass(frozen=True)
+class _QueuedRun:
+    run_id: UUID
+    request: str
+    settings: Settings
+    cancellation: Event
+    client: str
+    budget_date: date
+    enqueued_at: float = field(default_factory=monotonic)
+
+
 class RunManager:
-    """Own process-local run snapshots and execute pipelines in worker threads."""
+    """Own process-local run snapshots and schedule pipelines on a worker pool.
+
+    Runs wait in one FIFO queue per client and are dispatched round-robin across
+    clients, so a burst from one client cannot starve the others.
+    """
 
-    def __init__(self, settings: Settings, runner_factory: RunnerFactory):
+    def __init__(
+        self,
+        settings: Settings,
+        runner_factory: RunnerFactory,
+        store: RunStore | None = None,
+    ):
         self.settings = settings
         self.runner_factory = runner_factory
+        self.store = store or build_run_store(
+            settings.run_store, settings.run_store_path
+        )
+        # Active runs stay in memory; finished runs are kept in LRU order with
+        # their last access time and paged back in from the store when evicted.
+        # Snapshots are immutable and replaced wholesale under the lock, so
+        # readers load them from ``_runs`` without locking or copying.
         self._runs: dict[UUID, RunSnapshot] = {}
+        self._retained: OrderedDict[UUID, float] = OrderedDict()
+        self._read_at: dict[UUID, float] = {}
         self._cancellations: dict[UUID, Event] = {}
+        self._queues: OrderedDict[str, deque[_QueuedRun]] = OrderedDict()
+        # Runs execute as tasks on one event loop thread. Runners with an async
+        # ``arun`` need no thread of their own; synchronous runners and runner
+        # construction use the bounded executor.
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.max_active_runs, thread_name_prefix="digital-forge"
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Snapshots are persisted in order by one writer thread, so neither the
+        # run loop nor the lock holder waits on disk.
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="digital-forge-store"
+        )
+        self._tasks: dict[UUID, asyncio.Task[None]] = {}
+        self._waiters: dict[UUID, list[asyncio.Future[None]]] = {}
+        self._closed = False
+        self._scheduled_active_runs = 0
         self._external_active_runs = 0
+        self._started_runs = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
         self._daily_run_count = 0
         self._daily_run_date = date.today()
+        self._events: dict[UUID, list[RunStreamEvent]] = {}
+        self._histories: dict[UUID, SnapshotHistory] = {}
         self._lock = RLock()
+        self._changed = Condition(self._lock)
 
-    def start(self, request: str) -> RunSnapshot:
+    def start(
+        self,
+        request: str,
+        *,
+        client: str = "anonymous",
+        bypass_sandbox_cache: bool = False,
+    ) -> RunSnapshot:
         run_id = uuid4()
         created_at = utc_now()
         snapshot = RunSnapshot(
@@ -66,140 +178,366 @@ class RunManager:
             updated_at=created_at,
             events=(RunEvent(stage=RunStage.queued, message="The run is queued."),),
         )
+        settings = (
+            self.settings.model_copy(update={"sandbox_cache_bypass": True})
+            if bypass_sandbox_cache
+            else self.settings
+        )
         cancellation = Event()
         with self._lock:
-            self._reserve_run_locked()
-            self._runs[run_id] = snapshot
+            if self._closed:
+                raise RunManagerClosed
+            self._enqueue_locked(client)
+            self._store_locked(run_id, snapshot)
             self._cancellations[run_id] = cancellation
-        Thread(
-            target=self._execute,
-            args=(run_id, request, cancellation),
-            name=f"digital-forge-{run_id.hex[:8]}",
-            daemon=True,
-        ).start()
-        return snapshot.model_copy(deep=True)
+            self._queues.setdefault(client, deque()).append(
+                _QueuedRun(
+                    run_id,
+                    request,
+                    settings,
+                    cancellation,
+                    client,
+                    self._daily_run_date,
+                )
+            )
+            self._dispatch_locked()
+            return self._runs[run_id]
 
     def reserve_external_run(self) -> None:
         with self._lock:
-            self._reserve_run_locked()
+            if self._closed:
+                raise RunManagerClosed
+            self._reset_daily_count_if_needed()
+            if self._queues or self._active_runs_locked() >= (
+                self.settings.max_active_runs
+            ):
+                raise ActiveRunLimitExceeded
+            self._reserve_daily_run_locked()
             self._external_active_runs += 1
 
     def release_external_run(self) -> None:
         with self._lock:
             self._external_active_runs = max(0, self._external_active_runs - 1)
+            self._dispatch_locked()
 
     def get(self, run_id: UUID) -> RunSnapshot | None:
+        """Return the published snapshot; only evicted runs take the lock."""
+        snapshot = self._runs.get(run_id)
+        if snapshot is None:
+            with self._lock:
+                return self._snapshot_locked(run_id)
+        self._read_at[run_id] = monotonic()
+        return snapshot
+
+    def changes_since(
+        self, run_id: UUID, since: int
+    ) -> RunSnapshotDelta | RunSnapshot | None:
+        """Return the delta after ``since``, or the unchanged snapshot."""
+        snapshot = self.get(run_id)
+        if snapshot is None:
+            return None
+        # History is recorded before a snapshot is published, so reading the
+        # snapshot first guarantees the history covers its version.
+        history = self._histories.get(run_id)
+        if history is None:
+            with self._lock:
+                snapshot = self._snapshot_locked(run_id)
+                if snapshot is None:
+                    return None
+                history = self._histories[run_id]
+        delta = history.delta(snapshot, since)
+        return delta if delta is not None else snapshot
+
+    def metrics(self) -> SchedulerMetrics:
         with self._lock:
-            snapshot = self._runs.get(run_id)
-            return snapshot.model_copy(deep=True) if snapshot is not None else None
+            now = monotonic()
+            queued = [run for queue in self._queues.values() for run in queue]
+            return SchedulerMetrics(
+                capacity=self.settings.max_active_runs,
+                active_runs=self._active_runs_locked(),
+                queued_runs=len(queued),
+                queued_clients=len(self._queues),
+                started_runs=self._started_runs,
+                average_wait_seconds=(
+                    self._total_wait_seconds / self._started_runs
+                    if self._started_runs
+                    else 0.0
+                ),
+                max_wait_seconds=self._max_wait_seconds,
+                oldest_queued_seconds=max(
+                    (now - run.enqueued_at for run in queued), default=0.0
+                ),
+            )
 
     def cancel(self, run_id: UUID) -> RunSnapshot | None:
         with self._lock:
-            snapshot = self._runs.get(run_id)
+            snapshot = self._snapshot_locked(run_id)
             cancellation = self._cancellations.get(run_id)
-            if snapshot is None or cancellation is None:
+            if snapshot is None:
                 return None
-            if snapshot.status not in {
-                RunStatus.completed,
-                RunStatus.failed,
-                RunStatus.cancelled,
-            }:
+            if cancellation is not None and snapshot.status not in TERMINAL_STATUSES:
                 cancellation.set()
-                snapshot = snapshot.model_copy(
-                    update={"cancel_requested": True, "updated_at": utc_now()}
-                )
-                self._runs[run_id] = snapshot
-            return snapshot.model_copy(deep=True)
+                queued = self._dequeue_locked(run_id)
+                if queued is not None:
+                    self._refund_daily_run_locked(queued.budget_date)
+                    self._store_locked(
+                        run_id,
+                        snapshot.model_copy(
+                            update={
+                                "status": RunStatus.cancelled,
+                                "stage": RunStage.cancelled,
+                                "queue_position": None,
+                                "cancel_requested": True,
+                                "report": "Run cancelled before it started.",
+                                "updated_at": utc_now(),
+                                "events": (
+                                    *snapshot.events,
+                                    RunEvent(
+                                        stage=RunStage.cancelled,
+                                        message="The run was cancelled while queued.",
+                                    ),
+                                ),
+                            }
+                        ),
+                    )
+                    self._release_locked(run_id)
+                    self._reposition_locked()
+                else:
+                    self._store_locked(
+                        run_id,
+                        snapshot.model_copy(
+                            update={"cancel_requested": True, "updated_at": utc_now()}
+                        ),
+                    )
+                    self._cancel_task_locked(run_id)
+                snapshot = self._runs[run_id]
+            return snapshot
+
+    def close(self) -> None:
+        """Cancel queued and active runs and stop accepting work."""
+        with self._lock:
+            for queued in [run for queue in self._queues.values() for run in queue]:
+                self.cancel(queued.run_id)
+            self._closed = True
+            for run_id, cancellation in self._cancellations.items():
+                cancellation.set()
+                self._cancel_task_locked(run_id)
+            if self._loop is not None:
+                asyncio.run_coroutine_threadsafe(_stop_loop(), self._loop)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._writer.shutdown(wait=True)
+        self.store.close()
 
-    def _execute(self, run_id: UUID, request: str, cancellation: Event) -> None:
-        timer = Timer(self.settings.run_timeout_seconds, cancellation.set)
-        timer.daemon = True
-        timer.start()
+    async def run_detached(self, request: str, settings: Settings) -> RunResponse:
+        """Run a request outside the queue and the snapshot store.
+
+        The runner executes on the manager's event loop, so it never blocks the
+        caller's loop. Cancelling the awaiting task cancels the run.
+        """
+        with self._lock:
+            if self._closed:
+                raise RunManagerClosed
+            loop = self._event_loop_locked()
+        cancellation = Event()
+        future = asyncio.run_coroutine_threadsafe(
+            self._drive(uuid4(), request, settings, cancellation, lambda _state: None),
+            loop,
+        )
         try:
-            runner = self.runner_factory(
-                request,
-                self.settings,
+            return await asyncio.wrap_future(future)
+        finally:
+            cancellation.set()
+
+    async def _run_scheduled(self, queued: _QueuedRun) -> None:
+        try:
+            await self._execute(
+                queued.run_id, queued.request, queued.settings, queued.cancellation
+            )
+        finally:
+            with self._lock:
+                self._scheduled_active_runs -= 1
+                self._dispatch_locked()
+
+    async def _execute(
+        self,
+        run_id: UUID,
+        request: str,
+        settings: Settings,
+        cancellation: Event,
+    ) -> None:
+        timer = asyncio.get_running_loop().call_later(
+            settings.run_timeout_seconds, self._time_out, run_id, cancellation
+        )
+        try:
+            result = await self._drive(
                 run_id,
+                request,
+                settings,
+                cancellation,
                 lambda state: self._update(run_id, state),
-                cancellation.is_set,
             )
-            result = runner.run()
             with self._lock:
                 current = self._runs[run_id]
-                self._runs[run_id] = current.model_copy(
-                    update={
-                        "status": result.status,
-                        "stage": (
-                            RunStage.cancelled
-                            if result.status is RunStatus.cancelled
-                            else RunStage.complete
-                        ),
-                        "report": result.report,
-                        "retrieval_events": result.retrieval_events,
-                        "updated_at": utc_now(),
-                    }
+                self._store_locked(
+                    run_id,
+                    current.model_copy(
+                        update={
+                            "status": result.status,
+                            "stage": (
+                                RunStage.cancelled
+                                if result.status is RunStatus.cancelled
+                                else RunStage.complete
+                            ),
+                            "report": result.report,
+                            "retrieval_events": result.retrieval_events,
+                            "updated_at": utc_now(),
+                        }
+                    ),
+                )
+        except asyncio.CancelledError:
+            with self._lock:
+                current = self._runs[run_id]
+                self._store_locked(
+                    run_id,
+                    current.model_copy(
+                        update={
+                            "status": RunStatus.cancelled,
+                            "stage": RunStage.cancelled,
+                            "report": current.report or "Run cancelled.",
+                            "updated_at": utc_now(),
+                        }
+                    ),
                 )
         except Exception as exc:
             error = sanitize_output(f"{type(exc).__name__}: {exc}")
             with self._lock:
                 current = self._runs[run_id]
-                self._runs[run_id] = current.model_copy(
-                    update={
-                        "status": RunStatus.failed,
-                        "stage": RunStage.complete,
-                        "error": error,
-                        "updated_at": utc_now(),
-                        "events": (
-                            *current.events,
-                            RunEvent(
-                                stage=RunStage.complete,
-                                message="The pipeline stopped because an error occurred.",
+                self._store_locked(
+                    run_id,
+                    current.model_copy(
+                        update={
+                            "status": RunStatus.failed,
+                            "stage": RunStage.complete,
+                            "error": error,
+                            "updated_at": utc_now(),
+                            "events": (
+                                *current.events,
+                                RunEvent(
+                                    stage=RunStage.complete,
+                                    message="The pipeline stopped because an error occurred.",
+                                ),
                             ),
-                        ),
-                    }
+                        }
+                    ),
                 )
         finally:
             timer.cancel()
+            with self._lock:
+                self._release_locked(run_id)
+
+    async def _drive(
+        self,
+        run_id: UUID,
+        request: str,
+        settings: Settings,
+        cancellation: Event,
+        on_update: UpdateCallback,
+    ) -> RunResponse:
+        """Build a runner off the loop, then await it or run it on the executor.
+
+        Only async runners can be interrupted mid-stage, so only their tasks are
+        registered for ``cancel``; synchronous runners stop cooperatively.
+        """
+        loop = asyncio.get_running_loop()
+        runner = await loop.run_in_executor(
+            self._executor,
+            partial(
+                self.runner_factory,
+                request,
+                settings,
+                run_id,
+                on_update,
+                cancellation.is_set,
+            ),
+        )
+        arun = getattr(runner, "arun", None)
+        if arun is None:
+            return await loop.run_in_executor(self._executor, runner.run)
+        task = asyncio.current_task()
+        with self._lock:
+            if task is not None:
+                self._tasks[run_id] = task
+            if cancellation.is_set():
+                self._cancel_task_locked(run_id)
+        try:
+            response: RunResponse = await arun()
+            return response
+        finally:
+            with self._lock:
+                self._tasks.pop(run_id, None)
+
+    def _time_out(self, run_id: UUID, cancellation: Event) -> None:
+        with self._lock:
+            cancellation.set()
+            self._cancel_task_locked(run_id)
+
+    def _cancel_task_locked(self, run_id: UUID) -> None:
+        task = self._tasks.get(run_id)
+        if task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    def _event_loop_locked(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            Thread(
+                target=self._loop.run_forever, name="digital-forge-runs", daemon=True
+            ).start()
+        return self._loop
 
     def _update(self, run_id: UUID, state: RunState) -> None:
-        artifacts: list[RunArtifact] = []
+        current = self._runs[run_id]
+        files: list[tuple[str, str]] = []
         if state.plan is not None:
-            application_code = state.workspace.read(state.plan.file_name)
-            test_code = state.workspace.read(state.plan.test_file_name)
-            if application_code is not None:
-                artifacts.append(
-                    RunArtifact(
-                        path=state.plan.file_name,
-                        kind="application",
-                        content=application_code,
-                    )
-                )
-            if test_code is not None:
-                artifacts.append(
-                    RunArtifact(
-                        path=state.plan.test_file_name,
-                        kind="tests",
-                        content=test_code,
-                    )
-                )
+            files = [
+                (state.plan.file_name, "application"),
+                (state.plan.test_file_name, "tests"),
+            ]
+        artifacts = tuple(
+            _artifact(current.artifacts, path, kind, content)
+            for path, kind in files
+            if (content := state.workspace.read(path)) is not None
+        )
         with self._lock:
             current = self._runs[run_id]
-            self._runs[run_id] = current.model_copy(
-                update={
-                    "status": state.status,
-                    "stage": state.stage,
-                    "active_agent": state.active_agent,
-                    "attempts_used": state.attempts,
-                    "technical_brief": state.technical_brief,
-                    "plan": state.plan,
-                    "test_results": state.test_results,
-                    "report": state.report,
-                    "attempts": tuple(state.attempt_history),
-                    "events": tuple(state.events),
-                    "artifacts": tuple(artifacts),
-                    "retrieval_events": tuple(state.retrieval_events),
-                    "updated_at": utc_now(),
-                }
+            update = {
+                "status": state.status,
+                "stage": state.stage,
+                "active_agent": state.active_agent,
+                "active_agents": state.active_agents,
+                "attempts_used": state.attempts,
+                "technical_brief": state.technical_brief,
+                "plan": state.plan,
+                "test_results": state.test_results,
+                "report": state.report,
+                "attempts": _grown(current.attempts, state.attempt_history),
+                "events": _grown(current.events, state.events),
+                "artifacts": (
+                    current.artifacts if artifacts == current.artifacts else artifacts
+                ),
+                "retrieval_events": _grown(
+                    current.retrieval_events, state.retrieval_events
+                ),
+                "sandbox_cache": (
+                    current.sandbox_cache
+                    if state.sandbox_cache == current.sandbox_cache
+                    else state.sandbox_cache.model_copy()
+                ),
+            }
+            if all(getattr(current, name) is value for name, value in update.items()):
+                return
+            self._store_locked(
+                run_id,
+                current.model_copy(update={**update, "updated_at": utc_now()}),
             )
 
     def _reset_daily_count_if_needed(self) -> None:
@@ -208,15 +546,235 @@ class RunManager:
             self._daily_run_date = today
             self._daily_run_count = 0
 
-    def _reserve_run_locked(self) -> None:
-        self._reset_daily_count_if_needed()
-        active_runs = self._external_active_runs + sum(
-            1
-            for existing in self._runs.values()
-            if existing.status in {RunStatus.pending, RunStatus.running}
+    def wait_for_events(
+        self, run_id: UUID, after: int = 0, timeout: float = 0.0
+    ) -> tuple[RunStreamEvent, ...] | None:
+        """Return events after ``after``, waiting up to ``timeout`` for new ones.
+
+        Returns immediately once the run has finished, and ``None`` for unknown
+        runs.
+        """
+        with self._changed:
+            if self._snapshot_locked(run_id) is None:
+                return None
+            log = self._events.get(run_id)
+            if log is None:
+                self._flush_writes()
+                return self.store.load_events(run_id, after)
+            self._changed.wait_for(
+                lambda: len(log) > after or self.is_finished(run_id), timeout
+            )
+            return tuple(log[after:])
+
+    async def next_events(
+        self, run_id: UUID, after: int = 0, timeout: float = 0.0
+    ) -> tuple[RunStreamEvent, ...] | None:
+        """Like ``wait_for_events``, but parks on a future instead of a thread.
+
+        The waiter is registered before events are read, so a change published
+        in between still wakes it. Reads run off the caller's loop because they
+        may page the run in from the store.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters.setdefault(run_id, []).append(waiter)
+        try:
+            events = await asyncio.to_thread(self.wait_for_events, run_id, after)
+            if events or events is None or self.is_finished(run_id):
+                return events
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(run_id, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(run_id, None)
+        return await asyncio.to_thread(self.wait_for_events, run_id, after)
+
+    def is_finished(self, run_id: UUID) -> bool:
+        snapshot = self.get(run_id)
+        return snapshot is not None and snapshot.status in TERMINAL_STATUSES
+
+    def _store_locked(self, run_id: UUID, snapshot: RunSnapshot) -> None:
+        previous = self._runs.get(run_id)
+        snapshot = snapshot.model_copy(
+            update={"version": previous.version + 1 if previous else 1}
         )
-        if active_runs >= self.settings.max_active_runs:
-            raise ActiveRunLimitExceeded
+        self._histories.setdefault(run_id, SnapshotHistory()).record(previous, snapshot)
+        self._runs[run_id] = snapshot
+        log = self._events.get(run_id)
+        if log is None:
+            self._flush_writes()
+            log = self._events[run_id] = list(self.store.load_events(run_id))
+        added = [
+            RunStreamEvent(id=len(log) + offset, type=event_type, data=data)
+            for offset, (event_type, data) in enumerate(
+                snapshot_changes(previous, snapshot), start=1
+            )
+        ]
+        log.extend(added)
+        with suppress(RuntimeError):  # the writer has shut down
+            self._writer.submit(self.store.save, previous, snapshot, added)
+        if snapshot.status in TERMINAL_STATUSES and run_id not in self._cancellations:
+            self._retain_locked(run_id)
+        self._changed.notify_all()
+        for waiter in self._waiters.pop(run_id, ()):
+            with suppress(RuntimeError):  # the waiting loop has already closed
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+        self._evict_locked()
+
+    def _flush_writes(self) -> None:
+        """Wait for queued snapshot writes before reading from the store."""
+        with suppress(RuntimeError):  # the writer has shut down
+            self._writer.submit(lambda: None).result()
+
+    def _release_locked(self, run_id: UUID) -> None:
+        """Hand a run whose worker is done over to LRU/TTL retention."""
+        self._cancellations.pop(run_id, None)
+        if self._runs[run_id].status in TERMINAL_STATUSES:
+            self._retain_locked(run_id)
+
+    def _snapshot_locked(self, run_id: UUID) -> RunSnapshot | None:
+        """Return a run from memory, paging it in from the store if evicted."""
+        snapshot = self._runs.get(run_id)
+        if snapshot is not None:
+            if run_id in self._retained:
+                self._retain_locked(run_id)
+            return snapshot
+        self._flush_writes()
+        snapshot = self.store.load(run_id)
+        if snapshot is None:
+            return None
+        history = self._histories[run_id] = SnapshotHistory()
+        history.record(None, snapshot)
+        self._runs[run_id] = snapshot
+        if snapshot.status not in TERMINAL_STATUSES:
+            # Only runs owned by this process can still make progress.
+            self._store_locked(
+                run_id,
+                snapshot.model_copy(
+                    update={
+                        "status": RunStatus.failed,
+                        "stage": RunStage.complete,
+                        "queue_position": None,
+                        "error": "The API restarted before the run finished.",
+                        "updated_at": utc_now(),
+                    }
+                ),
+            )
+        else:
+            self._retain_locked(run_id)
+        return self._runs[run_id]
+
+    def _retain_locked(self, run_id: UUID) -> None:
+        """Mark a finished run as most recently used, then evict stale runs."""
+        # Lock-free reads only stamp ``_read_at``; fold them in, oldest first,
+        # so the LRU order reflects every read made before this one.
+        for read_id, read_at in sorted(self._read_at.copy().items(), key=itemgetter(1)):
+            if self._retained.get(read_id, read_at) < read_at:
+                self._retained[read_id] = read_at
+                self._retained.move_to_end(read_id)
+        self._read_at.clear()
+        self._retained[run_id] = monotonic()
+        self._retained.move_to_end(run_id)
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        expires = monotonic() - self.settings.run_cache_ttl_seconds
+        while self._retained:
+            run_id, last_used = next(iter(self._retained.items()))
+            if (
+                len(self._retained) <= self.settings.run_cache_entries
+                and last_used >= expires
+            ):
+                return
+            del self._retained[run_id]
+            self._read_at.pop(run_id, None)
+            self._runs.pop(run_id, None)
+            self._events.pop(run_id, None)
+            self._histories.pop(run_id, None)
+
+    def _active_runs_locked(self) -> int:
+        return self._scheduled_active_runs + self._external_active_runs
+
+    def _enqueue_locked(self, client: str) -> None:
+        self._reset_daily_count_if_needed()
+        if self._active_runs_locked() >= self.settings.max_active_runs:
+            queued = sum(len(queue) for queue in self._queues.values())
+            if queued >= self.settings.max_queued_runs:
+                raise RunQueueFull("The run queue is full.")
+            if (
+                len(self._queues.get(client, ()))
+                >= self.settings.max_queued_runs_per_client
+            ):
+                raise RunQueueFull("Too many runs are queued for this client.")
+        self._reserve_daily_run_locked()
+
+    def _reserve_daily_run_locked(self) -> None:
         if self._daily_run_count >= self.settings.max_daily_model_runs:
             raise DailyRunLimitExceeded
         self._daily_run_count += 1
+
+    def _refund_daily_run_locked(self, budget_date: date) -> None:
+        """Return a slot reserved today by a run that never reached the model."""
+        if budget_date == self._daily_run_date:
+            self._daily_run_count = max(0, self._daily_run_count - 1)
+
+    def _dispatch_locked(self) -> None:
+        if self._closed:
+            return
+        dispatched = False
+        while self._queues and (
+            self._active_runs_locked() < self.settings.max_active_runs
+        ):
+            client, queue = next(iter(self._queues.items()))
+            queued = queue.popleft()
+            del self._queues[client]
+            if queue:
+                self._queues[client] = queue
+            wait_seconds = monotonic() - queued.enqueued_at
+            self._started_runs += 1
+            self._total_wait_seconds += wait_seconds
+            self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            self._scheduled_active_runs += 1
+            current = self._runs[queued.run_id]
+            self._store_locked(
+                queued.run_id,
+                current.model_copy(
+                    update={"queue_position": None, "updated_at": utc_now()}
+                ),
+            )
+            loop = self._event_loop_locked()
+            asyncio.run_coroutine_threadsafe(self._run_scheduled(queued), loop)
+            dispatched = True
+        if dispatched or self._queues:
+            self._reposition_locked()
+
+    def _dequeue_locked(self, run_id: UUID) -> _QueuedRun | None:
+        for client, queue in self._queues.items():
+            for queued in queue:
+                if queued.run_id == run_id:
+                    queue.remove(queued)
+                    if not queue:
+                        del self._queues[client]
+                    return queued
+        return None
+
+    def _reposition_locked(self) -> None:
+        """Number queued runs in the order round-robin dispatch will start them."""
+        queues = list(self._queues.values())
+        position = 0
+        for depth in range(max((len(queue) for queue in queues), default=0)):
+            for queue in queues:
+                if depth >= len(queue):
+                    continue
+                position += 1
+                run_id = queue[depth].run_id
+                current = self._runs[run_id]
+                if current.queue_position != position:
+                    self._store_locked(
+                        run_id, current.model_copy(update={"queue_position": position})
+                    )
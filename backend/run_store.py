@@ -0,0 +1,202 @@
+"""Durable storage for run snapshots and their event streams."""
+
+import json
+import sqlite3
+from collections.abc import Sequence
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol
+from uuid import UUID
+
+from .models import RunSnapshot, RunStreamEvent
+from .run_events import APPEND_ONLY_FIELDS, appended_items
+
+
+class RunStore(Protocol):
+    def save(
+        self,
+        previous: RunSnapshot | None,
+        snapshot: RunSnapshot,
+        events: Sequence[RunStreamEvent],
+    ) -> None: ...
+
+    def load(self, run_id: UUID) -> RunSnapshot | None: ...
+
+    def load_events(
+        self, run_id: UUID, after: int = 0
+    ) -> tuple[RunStreamEvent, ...]: ...
+
+    def close(self) -> None: ...
+
+
+class MemoryRunStore:
+    """Keep every run in process memory; history is lost on restart."""
+
+    def __init__(self) -> None:
+        self._snapshots: dict[UUID, RunSnapshot] = {}
+        self._events: dict[UUID, list[RunStreamEvent]] = {}
+        self._lock = Lock()
+
+    def save(
+        self,
+        previous: RunSnapshot | None,
+        snapshot: RunSnapshot,
+        events: Sequence[RunStreamEvent],
+    ) -> None:
+        with self._lock:
+            self._snapshots[snapshot.run_id] = snapshot
+            self._events.setdefault(snapshot.run_id, []).extend(events)
+
+    def load(self, run_id: UUID) -> RunSnapshot | None:
+        with self._lock:
+            return self._snapshots.get(run_id)
+
+    def load_events(self, run_id: UUID, after: int = 0) -> tuple[RunStreamEvent, ...]:
+        with self._lock:
+            return tuple(self._events.get(run_id, ())[after:])
+
+    def close(self) -> None:
+        return None
+
+
+class SqliteRunStore:
+    """Persist runs in SQLite, writing only what changed on each update.
+
+    Scalar fields are stored as one JSON row per run. Events, attempts, and
+    retrieval events are stored one row per item, so an update appends rows
+    instead of rewriting the run's whole history.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._lock = Lock()
+        with self._lock:
+            self._connection.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    fields TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS run_items (
+                    run_id TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (run_id, field, position)
+                );
+                CREATE TABLE IF NOT EXISTS run_events (
+                    run_id TEXT NOT NULL,
+                    id INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (run_id, id)
+                );
+                """
+            )
+
+    def save(
+        self,
+        previous: RunSnapshot | None,
+        snapshot: RunSnapshot,
+        events: Sequence[RunStreamEvent],
+    ) -> None:
+        run_id = str(snapshot.run_id)
+        fields = snapshot.model_dump_json(exclude=set(APPEND_ONLY_FIELDS))
+        items: list[tuple[str, str, int, str]] = []
+        reset: list[tuple[str, str]] = []
+        for name in APPEND_ONLY_FIELDS:
+            before = getattr(previous, name) if previous else ()
+            current = getattr(snapshot, name)
+            added = appended_items(before, current)
+            start = len(current) - len(added)
+            if previous is None or start != len(before):
+                reset.append((run_id, name))
+                added, start = current, 0
+            items.extend(
+                (run_id, name, start + offset, item.model_dump_json())
+                for offset, item in enumerate(added)
+            )
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.execute(
+                """
+                INSERT INTO runs (run_id, version, status, updated_at, fields)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (run_id) DO UPDATE SET
+                    version = excluded.version,
+                    status = excluded.status,
+                    updated_at = excluded.updated_at,
+                    fields = excluded.fields
+                """,
+                (
+                    run_id,
+                    snapshot.version,
+                    snapshot.status.value,
+                    snapshot.updated_at.isoformat(),
+                    fields,
+                ),
+            )
+            self._connection.executemany(
+                "DELETE FROM run_items WHERE run_id = ? AND field = ?", reset
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO run_items VALUES (?, ?, ?, ?)", items
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO run_events VALUES (?, ?, ?, ?)",
+                [
+                    (run_id, event.id, event.type, json.dumps(event.data))
+                    for event in events
+                ],
+            )
+
+    def load(self, run_id: UUID) -> RunSnapshot | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fields FROM runs WHERE run_id = ?", (str(run_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            items = self._connection.execute(
+                "SELECT field, payload FROM run_items WHERE run_id = ? "
+                "ORDER BY field, position",
+                (str(run_id),),
+            ).fetchall()
+        data: dict[str, Any] = json.loads(row[0])
+        for name in APPEND_ONLY_FIELDS:
+            data[name] = [
+                json.loads(payload) for field, payload in items if field == name
+            ]
+        return RunSnapshot.model_validate(data)
+
+    def load_events(self, run_id: UUID, after: int = 0) -> tuple[RunStreamEvent, ...]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, type, data FROM run_events WHERE run_id = ? AND id > ? "
+                "ORDER BY id",
+                (str(run_id), after),
+            ).fetchall()
+        return tuple(
+            RunStreamEvent(id=event_id, type=event_type, data=json.loads(data))
+            for event_id, event_type, data in rows
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def build_run_store(backend: str, path: Path) -> RunStore:
+    if backend == "sqlite":
+        return SqliteRunStore(path)
+    if backend == "memory":
+        return MemoryRunStore()
+    raise ValueError(f"Unsupported run store backend: {backend}")
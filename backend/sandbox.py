@@ -1,13 +1,25 @@
-"""Isolated command execution through Docker or Modal Sandboxes."""
+"""Isolated command execution through Docker, Modal Sandboxes, or local processes."""
 
+import asyncio
+import atexit
+import hashlib
 import importlib
 import json
 import math
+import os
+import shutil
+import signal
 import subprocess
+import sys
 import tempfile
 import time
+from collections import deque
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
+from threading import Lock
 from typing import Any, Protocol
 from uuid import uuid4
 
@@ -17,8 +29,11 @@ from .sandbox_dependencies import SANDBOX_PACKAGES
 
 DEFAULT_DOCKER_IMAGE = "digital-forge-sandbox:py311"
 DEFAULT_MODAL_APP = "digital-forge-sandbox"
+MODAL_PYTHON_VERSION = "3.11"
 MAX_SANDBOX_OUTPUT_CHARACTERS = 32_000
+DEFAULT_BATCH_PARALLELISM = 4
 SANDBOX_ROOT = PurePosixPath("/workspace")
+LOCAL_LIMITS_PATH = Path(__file__).with_name("_sandbox_limits.py")
 
 
 class SandboxLimits(BaseModel):
@@ -91,6 +106,61 @@ class SandboxRunner(Protocol):
     def run(self, request: SandboxRequest) -> SandboxResult: ...
 
 
+class AsyncSandboxRunner(SandboxRunner, Protocol):
+    async def arun(self, request: SandboxRequest) -> SandboxResult: ...
+
+
+async def run_sandbox_async(
+    runner: SandboxRunner, request: SandboxRequest
+) -> SandboxResult:
+    """Await the runner's ``arun`` if it has one, else run it on a worker thread."""
+    arun = getattr(runner, "arun", None)
+    if arun is None:
+        return await asyncio.to_thread(runner.run, request)
+    result: SandboxResult = await arun(request)
+    return result
+
+
+class BatchSandboxRunner(SandboxRunner, Protocol):
+    def run_many(
+        self,
+        requests: Sequence[SandboxRequest],
+        *,
+        max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+    ) -> tuple[SandboxResult, ...]: ...
+
+
+def run_sandbox_batch(
+    runner: SandboxRunner,
+    requests: Sequence[SandboxRequest],
+    *,
+    max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+) -> tuple[SandboxResult, ...]:
+    """Run independent requests and return their results in request order.
+
+    Runners that implement ``run_many`` share one sandbox session per group of
+    compatible requests; any other runner gets one ``run`` call per request on a
+    bounded thread pool.
+    """
+    run_many = getattr(runner, "run_many", None)
+    if run_many is not None:
+        return tuple(run_many(requests, max_parallel=max_parallel))
+    return _run_each(runner.run, requests, max_parallel)
+
+
+def _run_each(
+    run: Callable[[SandboxRequest], SandboxResult],
+    requests: Sequence[SandboxRequest],
+    max_parallel: int,
+) -> tuple[SandboxResult, ...]:
+    if not requests:
+        return ()
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_parallel, len(requests)))
+    ) as executor:
+        return tuple(executor.map(run, requests))
+
+
 CommandRunner = Callable[..., subprocess.CompletedProcess[str]]
 
 
@@ -107,9 +177,40 @@ class DockerSandboxRunner:
         self,
         image: str = DEFAULT_DOCKER_IMAGE,
         command_runner: CommandRunner = _run_command,
+        pool: "DockerContainerPool | None" = None,
     ):
         self.image = image
         self._command_runner = command_runner
+        self.pool = pool
+        self._image_id: str | None = None
+
+    @property
+    def identity(self) -> str:
+        """Name the image by content, since a tag can be rebuilt in place.
+
+        The ID is resolved once per runner, like the pooled containers, so a
+        rebuilt tag takes effect when the runner is rebuilt or warmed again.
+        Until the image can be inspected the tag alone is used.
+        """
+        if self._image_id is None:
+            self._image_id = self._resolve_image_id()
+        if self._image_id is None:
+            return f"docker:{self.image}"
+        return f"docker:{self.image}@{self._image_id}"
+
+    def _resolve_image_id(self) -> str | None:
+        try:
+            completed = self._command_runner(
+                ["docker", "image", "inspect", "--format", "{{.Id}}", self.image],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=False,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return None
+        image_id = completed.stdout.strip()
+        return image_id if completed.returncode == 0 and image_id else None
 
     @staticmethod
     def available() -> bool:
@@ -125,7 +226,179 @@ class DockerSandboxRunner:
             return False
         return result.returncode == 0
 
+    def warm(self) -> None:
+        """Fail before the first run when the sandbox image is not on this host."""
+        try:
+            completed = self._command_runner(
+                ["docker", "image", "inspect", self.image],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=False,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired) as exc:
+            raise RuntimeError("Docker is not available for the sandbox.") from exc
+        if completed.returncode != 0:
+            raise RuntimeError(f"Docker sandbox image is missing: {self.image}")
+        self._image_id = self._resolve_image_id()
+
     def run(self, request: SandboxRequest) -> SandboxResult:
+        if self.pool is not None and self.pool.accepts(request.limits):
+            container = self.pool.acquire()
+            if container is not None:
+                result = self.pool.run(container, request)
+                if result is not None:
+                    return result
+        return self._run_cold(request)
+
+    async def arun(self, request: SandboxRequest) -> SandboxResult:
+        """Run a cold container without blocking the event loop.
+
+        Pooled containers and injected command runners are synchronous, so
+        those requests run ``run`` on a worker thread instead. Cancelling the
+        awaiting task stops the Docker client and force-removes the container.
+        """
+        if self._command_runner is not _run_command or (
+            self.pool is not None and self.pool.accepts(request.limits)
+        ):
+            return await asyncio.to_thread(self.run, request)
+        started = time.monotonic()
+        container_name = f"digital-forge-{uuid4().hex}"
+        with tempfile.TemporaryDirectory(prefix="digital-forge-sandbox-") as root:
+            root_path = Path(root)
+            self._write_files(root_path, request.files)
+            command = self._docker_command(root_path, request, container_name)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                return SandboxResult(
+                    duration_seconds=time.monotonic() - started,
+                    error="Docker CLI is not installed or not on PATH.",
+                )
+            except OSError as exc:
+                return SandboxResult(
+                    duration_seconds=time.monotonic() - started,
+                    error=f"Docker sandbox could not start: {type(exc).__name__}.",
+                )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(request.stdin.encode("utf-8")),
+                    timeout=request.limits.wall_time_seconds + 15,
+                )
+            except asyncio.TimeoutError:
+                cleanup_error = await _stop_docker_client(process, container_name)
+                timeout_error = "Docker sandbox exceeded its host timeout."
+                if cleanup_error:
+                    timeout_error = f"{timeout_error} {cleanup_error}"
+                return SandboxResult(
+                    duration_seconds=time.monotonic() - started,
+                    timed_out=True,
+                    error=timeout_error,
+                )
+            except asyncio.CancelledError:
+                await _stop_docker_client(process, container_name)
+                raise
+
+        exit_code = process.returncode
+        return SandboxResult(
+            stdout=_stream_text(stdout),
+            stderr=_stream_text(stderr),
+            exit_code=exit_code,
+            duration_seconds=time.monotonic() - started,
+            timed_out=exit_code == 124,
+            error=(
+                "Docker could not create the sandbox container."
+                if exit_code == 125
+                else None
+            ),
+        )
+
+    def run_many(
+        self,
+        requests: Sequence[SandboxRequest],
+        *,
+        max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+    ) -> tuple[SandboxResult, ...]:
+        return _run_grouped(
+            requests,
+            self.run,
+            lambda group: self._run_batch(group, max_parallel),
+        )
+
+    def _run_batch(
+        self, requests: Sequence[SandboxRequest], max_parallel: int
+    ) -> tuple[SandboxResult, ...]:
+        started = time.monotonic()
+        parallel = max(1, min(max_parallel, len(requests)))
+        limits = requests[0].limits
+        container_name = f"digital-forge-{uuid4().hex}"
+        try:
+            with tempfile.TemporaryDirectory(prefix="digital-forge-sandbox-") as root:
+                root_path = Path(root)
+                self._write_files(
+                    root_path,
+                    (SandboxFile(path=_BATCH_DRIVER_NAME, content=_BATCH_DRIVER),),
+                )
+                for index, request in enumerate(requests):
+                    request_root = root_path / _BATCH_REQUESTS_DIRECTORY / str(index)
+                    request_root.mkdir(parents=True)
+                    self._write_files(request_root, request.files)
+                completed = self._command_runner(
+                    [
+                        "docker",
+                        "run",
+                        "--rm",
+                        "--interactive",
+                        f"--name={container_name}",
+                        *_docker_isolation_options(root_path, limits, parallel),
+                        self.image,
+                        *_batch_driver_command(limits, parallel),
+                    ],
+                    input=json.dumps(_batch_jobs(requests)),
+                    capture_output=True,
+                    text=True,
+                    timeout=_batch_host_timeout(requests, parallel),
+                    check=False,
+                )
+        except subprocess.TimeoutExpired as exc:
+            cleanup_error = self._force_remove(container_name)
+            timeout_error = "Docker sandbox exceeded its host timeout."
+            if cleanup_error:
+                timeout_error = f"{timeout_error} {cleanup_error}"
+            return _batch_results(
+                _stream_text(exc.stdout),
+                len(requests),
+                started,
+                error=timeout_error,
+                timed_out=True,
+            )
+        except FileNotFoundError:
+            return _batch_results(
+                "",
+                len(requests),
+                started,
+                error="Docker CLI is not installed or not on PATH.",
+            )
+        except OSError as exc:
+            return _batch_results(
+                "",
+                len(requests),
+                started,
+                error=f"Docker sandbox could not start: {type(exc).__name__}.",
+            )
+        error = None
+        if completed.returncode == 125:
+            error = "Docker could not create the sandbox container."
+        elif completed.returncode != 0:
+            error = f"Docker batch sandbox exited with {completed.returncode}."
+        return _batch_results(completed.stdout, len(requests), started, error=error)
+
+    def _run_cold(self, request: SandboxRequest) -> SandboxResult:
         started = time.monotonic()
         container_name = f"digital-forge-{uuid4().hex}"
         try:
@@ -180,49 +453,19 @@ class DockerSandboxRunner:
     def _docker_command(
         self, root: Path, request: SandboxRequest, container_name: str
     ) -> list[str]:
-        limits = request.limits
         return [
             "docker",
             "run",
             "--rm",
             "--interactive",
             f"--name={container_name}",
-            "--network=none",
-            "--read-only",
-            "--cap-drop=ALL",
-            "--security-opt=no-new-privileges",
-            "--user=65534:65534",
-            f"--memory={limits.memory_mib}m",
-            f"--memory-swap={limits.memory_mib}m",
-            f"--cpus={limits.cpu_cores}",
-            f"--pids-limit={limits.process_limit}",
-            "--tmpfs=/tmp:rw,noexec,nosuid,nodev,size=16m",
-            "--env=HOME=/tmp",
-            "--env=PYTHONDONTWRITEBYTECODE=1",
-            f"--mount=type=bind,src={root},dst={SANDBOX_ROOT},readonly",
-            f"--workdir={SANDBOX_ROOT}",
+            *_docker_isolation_options(root, request.limits),
             self.image,
-            "timeout",
-            "--signal=TERM",
-            "--kill-after=1s",
-            f"{limits.wall_time_seconds}s",
-            *request.command,
+            *_timeout_command(request),
         ]
 
     def _force_remove(self, container_name: str) -> str | None:
-        try:
-            completed = self._command_runner(
-                ["docker", "rm", "--force", container_name],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=False,
-            )
-        except (FileNotFoundError, OSError, subprocess.TimeoutExpired) as exc:
-            return f"Forced container cleanup failed: {type(exc).__name__}."
-        if completed.returncode == 0 or "No such container" in completed.stderr:
-            return None
-        return "Forced container cleanup failed."
+        return _force_remove_container(self._command_runner, container_name)
 
     @staticmethod
     def _write_files(root: Path, files: tuple[SandboxFile, ...]) -> None:
@@ -235,6 +478,529 @@ class DockerSandboxRunner:
             destination.chmod(0o444)
 
 
+def _docker_isolation_options(
+    root: Path, limits: SandboxLimits, parallel: int = 1
+) -> list[str]:
+    memory_mib, cpu_cores, process_limit = _session_resources(limits, parallel)
+    return [
+        "--network=none",
+        "--read-only",
+        "--cap-drop=ALL",
+        "--security-opt=no-new-privileges",
+        "--user=65534:65534",
+        f"--memory={memory_mib}m",
+        f"--memory-swap={memory_mib}m",
+        f"--cpus={cpu_cores}",
+        f"--pids-limit={process_limit}",
+        "--tmpfs=/tmp:rw,noexec,nosuid,nodev,size=16m",
+        "--env=HOME=/tmp",
+        "--env=PYTHONDONTWRITEBYTECODE=1",
+        f"--mount=type=bind,src={root},dst={SANDBOX_ROOT},readonly",
+        f"--workdir={SANDBOX_ROOT}",
+    ]
+
+
+def _timeout_command(request: SandboxRequest) -> list[str]:
+    return [
+        "timeout",
+        "--signal=TERM",
+        "--kill-after=1s",
+        f"{request.limits.wall_time_seconds}s",
+        *request.command,
+    ]
+
+
+def _force_remove_container(
+    command_runner: CommandRunner, container_name: str
+) -> str | None:
+    try:
+        completed = command_runner(
+            ["docker", "rm", "--force", container_name],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=False,
+        )
+    except (FileNotFoundError, OSError, subprocess.TimeoutExpired) as exc:
+        return f"Forced container cleanup failed: {type(exc).__name__}."
+    if completed.returncode == 0 or "No such container" in completed.stderr:
+        return None
+    return "Forced container cleanup failed."
+
+
+async def _stop_docker_client(
+    process: asyncio.subprocess.Process, container_name: str
+) -> str | None:
+    """Kill a Docker client and remove its container, which outlives the client."""
+    if process.returncode is None:
+        process.kill()
+    await process.wait()
+    try:
+        remover = await asyncio.create_subprocess_exec(
+            "docker",
+            "rm",
+            "--force",
+            container_name,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as exc:
+        return f"Forced container cleanup failed: {type(exc).__name__}."
+    try:
+        _, stderr = await asyncio.wait_for(remover.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        remover.kill()
+        return "Forced container cleanup failed: TimeoutError."
+    if remover.returncode == 0 or b"No such container" in stderr:
+        return None
+    return "Forced container cleanup failed."
+
+
+_BATCH_DRIVER_NAME = "batch_driver.py"
+_BATCH_REQUESTS_DIRECTORY = "requests"
+
+# Runs inside one sandbox session and executes a JSON list of jobs from stdin,
+# each in its own directory, process group, address-space limit and timeout.
+# One JSON line is printed per job as soon as it finishes.
+_BATCH_DRIVER = """\
+import json
+import os
+import resource
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+parallel = int(sys.argv[1])
+memory_bytes = int(sys.argv[2])
+jobs = json.loads(sys.stdin.read())
+
+
+def limit_memory():
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def execute(index, job):
+    started = time.monotonic()
+    timed_out = False
+    try:
+        process = subprocess.Popen(
+            job["command"],
+            cwd=job["cwd"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            start_new_session=True,
+            preexec_fn=limit_memory,
+        )
+    except OSError as exc:
+        stdout, stderr, exit_code = "", f"{type(exc).__name__}: {exc}", 127
+    else:
+        try:
+            stdout, stderr = process.communicate(job["stdin"], timeout=job["timeout"])
+            exit_code = process.returncode
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            stdout, stderr = process.communicate()
+            exit_code, timed_out = 124, True
+    return {
+        "index": index,
+        "stdout": stdout,
+        "stderr": stderr,
+        "exit_code": 128 - exit_code if exit_code < 0 else exit_code,
+        "timed_out": timed_out,
+        "duration_seconds": time.monotonic() - started,
+    }
+
+
+with ThreadPoolExecutor(max_workers=parallel) as executor:
+    futures = [executor.submit(execute, index, job) for index, job in enumerate(jobs)]
+    for future in as_completed(futures):
+        print(json.dumps(future.result()), flush=True)
+"""
+
+
+def _rebase_argument(argument: str, root: Path | PurePosixPath) -> str:
+    """Point an absolute sandbox-root argument at another workspace root."""
+    path = PurePosixPath(argument)
+    if path == SANDBOX_ROOT or SANDBOX_ROOT in path.parents:
+        return str(root.joinpath(*path.relative_to(SANDBOX_ROOT).parts))
+    return argument
+
+
+def _run_grouped(
+    requests: Sequence[SandboxRequest],
+    run_one: Callable[[SandboxRequest], SandboxResult],
+    run_batch: Callable[[Sequence[SandboxRequest]], tuple[SandboxResult, ...]],
+) -> tuple[SandboxResult, ...]:
+    groups: dict[tuple[int, float, int], list[int]] = {}
+    for index, request in enumerate(requests):
+        limits = request.limits
+        key = (limits.memory_mib, limits.cpu_cores, limits.process_limit)
+        groups.setdefault(key, []).append(index)
+    results: dict[int, SandboxResult] = {}
+    for indices in groups.values():
+        group = [requests[index] for index in indices]
+        group_results = run_batch(group) if len(group) > 1 else (run_one(group[0]),)
+        results.update(zip(indices, group_results, strict=True))
+    return tuple(results[index] for index in range(len(requests)))
+
+
+def _session_resources(limits: SandboxLimits, parallel: int) -> tuple[int, float, int]:
+    """Scale container-level limits so each concurrent job keeps its own budget."""
+    if parallel == 1:
+        return limits.memory_mib, limits.cpu_cores, limits.process_limit
+    cpu_cores = min(limits.cpu_cores * parallel, float(os.cpu_count() or 1))
+    return (
+        limits.memory_mib * parallel,
+        round(max(cpu_cores, limits.cpu_cores), 2),
+        limits.process_limit * parallel + parallel + 4,
+    )
+
+
+def _batch_driver_command(limits: SandboxLimits, parallel: int) -> list[str]:
+    return [
+        "python",
+        "-I",
+        "-B",
+        str(SANDBOX_ROOT / _BATCH_DRIVER_NAME),
+        str(parallel),
+        str(limits.memory_mib * 1024 * 1024),
+    ]
+
+
+def _batch_jobs(requests: Sequence[SandboxRequest]) -> list[dict[str, Any]]:
+    jobs = []
+    for index, request in enumerate(requests):
+        root = SANDBOX_ROOT / _BATCH_REQUESTS_DIRECTORY / str(index)
+        jobs.append(
+            {
+                "cwd": str(root),
+                "command": [_rebase_argument(part, root) for part in request.command],
+                "stdin": request.stdin,
+                "timeout": request.limits.wall_time_seconds,
+            }
+        )
+    return jobs
+
+
+def _batch_host_timeout(requests: Sequence[SandboxRequest], parallel: int) -> float:
+    total = sum(request.limits.wall_time_seconds + 1 for request in requests)
+    return (
+        math.ceil(total / parallel)
+        + max(request.limits.wall_time_seconds for request in requests)
+        + 15
+    )
+
+
+def _batch_results(
+    stdout: str,
+    count: int,
+    started: float,
+    *,
+    error: str | None = None,
+    timed_out: bool = False,
+) -> tuple[SandboxResult, ...]:
+    completed: dict[int, SandboxResult] = {}
+    for line in stdout.splitlines():
+        try:
+            payload = json.loads(line)
+            index = int(payload.pop("index"))
+            completed[index] = SandboxResult.model_validate(payload)
+        except (ValueError, TypeError, KeyError):
+            continue
+    missing = SandboxResult(
+        duration_seconds=time.monotonic() - started,
+        timed_out=timed_out,
+        error=error or "Sandbox batch session ended before this request completed.",
+    )
+    return tuple(completed.get(index, missing) for index in range(count))
+
+
+# Runs inside a pooled container between requests. Anything left behind by the
+# previous request (stray processes, /tmp files) is removed; a non-zero exit
+# means the container can no longer be trusted and is recycled.
+_POOL_RESET = """\
+import os
+import shutil
+import signal
+
+current = os.getpid()
+for entry in os.listdir("/proc"):
+    if entry.isdigit() and int(entry) not in {1, current}:
+        try:
+            os.kill(int(entry), signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+for name in os.listdir("/tmp"):
+    path = os.path.join("/tmp", name)
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        os.remove(path)
+if os.listdir("/tmp"):
+    raise SystemExit(1)
+"""
+
+_OOM_EXIT_CODE = 137
+
+
+@dataclass
+class PooledContainer:
+    name: str
+    root: Path
+    uses: int = 0
+
+
+class DockerContainerPool:
+    """Pre-started, locked-down containers that execute requests via docker exec.
+
+    Container-level limits (memory, CPU, processes) are fixed when a container
+    starts, so the pool only serves requests whose limits match; wall time is
+    enforced per exec. Each request gets a freshly populated host directory that
+    is bind-mounted read-only at the sandbox root, exactly like a cold start.
+    """
+
+    def __init__(
+        self,
+        image: str = DEFAULT_DOCKER_IMAGE,
+        limits: SandboxLimits | None = None,
+        *,
+        size: int = 2,
+        max_uses: int = 25,
+        health_check: bool = True,
+        command_runner: CommandRunner = _run_command,
+    ):
+        self.image = image
+        self.limits = limits or SandboxLimits()
+        self.size = size
+        self.max_uses = max_uses
+        self.health_check = health_check
+        self._command_runner = command_runner
+        self._idle: deque[PooledContainer] = deque()
+        self._live = 0
+        self._closed = False
+        self._lock = Lock()
+
+    def accepts(self, limits: SandboxLimits) -> bool:
+        return _same_container_limits(limits, self.limits)
+
+    def warm(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed or self._live >= self.size:
+                    return
+                self._live += 1
+            container = self._start()
+            with self._lock:
+                if container is None:
+                    self._live -= 1
+                    return
+                self._idle.append(container)
+
+    def acquire(self) -> PooledContainer | None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return None
+                if self._idle:
+                    container: PooledContainer | None = self._idle.popleft()
+                elif self._live < self.size:
+                    self._live += 1
+                    container = None
+                else:
+                    return None
+            if container is None:
+                container = self._start()
+                if container is None:
+                    with self._lock:
+                        self._live -= 1
+                return container
+            if not self.health_check or self._is_healthy(container):
+                return container
+            self._discard(container)
+
+    def run(
+        self, container: PooledContainer, request: SandboxRequest
+    ) -> SandboxResult | None:
+        """Execute one request; ``None`` asks the caller to fall back to a cold start."""
+        started = time.monotonic()
+        container.uses += 1
+        try:
+            _clear_directory(container.root)
+            DockerSandboxRunner._write_files(container.root, request.files)
+            completed = self._command_runner(
+                [
+                    "docker",
+                    "exec",
+                    "--interactive",
+                    container.name,
+                    *_timeout_command(request),
+                ],
+                input=request.stdin,
+                capture_output=True,
+                text=True,
+                timeout=request.limits.wall_time_seconds + 15,
+                check=False,
+            )
+        except subprocess.TimeoutExpired as exc:
+            cleanup_error = self._discard(container)
+            timeout_error = "Docker sandbox exceeded its host timeout."
+            if cleanup_error:
+                timeout_error = f"{timeout_error} {cleanup_error}"
+            return SandboxResult(
+                stdout=_stream_text(exc.stdout),
+                stderr=_stream_text(exc.stderr),
+                duration_seconds=time.monotonic() - started,
+                timed_out=True,
+                error=timeout_error,
+            )
+        except OSError:
+            self._discard(container)
+            return None
+
+        if completed.returncode != 0 and completed.stderr.startswith(
+            "Error response from daemon"
+        ):
+            self._discard(container)
+            return None
+        result = SandboxResult(
+            stdout=completed.stdout,
+            stderr=completed.stderr,
+            exit_code=completed.returncode,
+            duration_seconds=time.monotonic() - started,
+            timed_out=completed.returncode == 124,
+        )
+        self.release(
+            container,
+            recycle=completed.returncode in {124, _OOM_EXIT_CODE},
+        )
+        return result
+
+    def release(self, container: PooledContainer, *, recycle: bool = False) -> None:
+        if recycle or container.uses >= self.max_uses or not self._reset(container):
+            self._discard(container)
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append(container)
+                return
+        self._discard(container)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            containers = list(self._idle)
+            self._idle.clear()
+        for container in containers:
+            self._discard(container)
+
+    def _start(self) -> PooledContainer | None:
+        root = Path(tempfile.mkdtemp(prefix="digital-forge-pool-"))
+        root.chmod(0o755)
+        name = f"digital-forge-pool-{uuid4().hex}"
+        try:
+            completed = self._command_runner(
+                [
+                    "docker",
+                    "run",
+                    "--detach",
+                    "--rm",
+                    f"--name={name}",
+                    *_docker_isolation_options(root, self.limits),
+                    self.image,
+                    "sleep",
+                    "infinity",
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            _force_remove_container(self._command_runner, name)
+            shutil.rmtree(root, ignore_errors=True)
+            return None
+        if completed.returncode != 0:
+            shutil.rmtree(root, ignore_errors=True)
+            return None
+        return PooledContainer(name=name, root=root)
+
+    def _is_healthy(self, container: PooledContainer) -> bool:
+        try:
+            completed = self._command_runner(
+                [
+                    "docker",
+                    "inspect",
+                    "--format={{.State.Running}}",
+                    container.name,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return completed.returncode == 0 and completed.stdout.strip() == "true"
+
+    def _reset(self, container: PooledContainer) -> bool:
+        try:
+            completed = self._command_runner(
+                [
+                    "docker",
+                    "exec",
+                    container.name,
+                    "python",
+                    "-I",
+                    "-B",
+                    "-c",
+                    _POOL_RESET,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        return completed.returncode == 0
+
+    def _discard(self, container: PooledContainer) -> str | None:
+        with self._lock:
+            self._live = max(0, self._live - 1)
+        cleanup_error = _force_remove_container(self._command_runner, container.name)
+        shutil.rmtree(container.root, ignore_errors=True)
+        return cleanup_error
+
+
+def _clear_directory(root: Path) -> None:
+    for child in root.iterdir():
+        if child.is_dir() and not child.is_symlink():
+            shutil.rmtree(child)
+        else:
+            child.unlink()
+
+
+@lru_cache(maxsize=4)
+def get_docker_container_pool(
+    image: str,
+    limits: SandboxLimits,
+    size: int,
+    max_uses: int,
+    health_check: bool,
+) -> DockerContainerPool:
+    pool = DockerContainerPool(
+        image, limits, size=size, max_uses=max_uses, health_check=health_check
+    )
+    atexit.register(pool.close)
+    pool.warm()
+    return pool
+
+
 _MODAL_LAUNCHER = """\
 import json
 import os
@@ -252,6 +1018,67 @@ os.execvp(command[0], command)
 """
 
 
+_MODAL_LAUNCHER_PATH = "/tmp/digital_forge_launcher.py"
+
+# Runs as root inside a pooled Modal sandbox after each request. It removes
+# everything the unprivileged request user left behind; a non-zero exit means
+# the sandbox is terminated instead of being reused.
+_MODAL_RESET = """\
+import os
+import shutil
+import signal
+
+current = os.getpid()
+for entry in os.listdir("/proc"):
+    if entry.isdigit() and int(entry) != current:
+        try:
+            if os.stat(f"/proc/{entry}").st_uid == 65534:
+                os.kill(int(entry), signal.SIGKILL)
+        except (FileNotFoundError, ProcessLookupError):
+            pass
+shutil.rmtree("/workspace", ignore_errors=True)
+for name in os.listdir("/tmp"):
+    path = os.path.join("/tmp", name)
+    if os.lstat(path).st_uid != 65534:
+        continue
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        os.remove(path)
+leftovers = [
+    name for name in os.listdir("/tmp") if os.lstat(f"/tmp/{name}").st_uid == 65534
+]
+if os.path.exists("/workspace") or leftovers:
+    raise SystemExit(1)
+"""
+
+MODAL_POOL_LIFETIME_SECONDS = 3600
+
+
+@lru_cache(maxsize=4)
+def _modal_handles(
+    modal: Any, app_name: str, packages: tuple[str, ...]
+) -> tuple[Any, Any]:
+    app = modal.App.lookup(app_name, create_if_missing=True)
+    image = modal.Image.debian_slim(python_version=MODAL_PYTHON_VERSION).uv_pip_install(
+        *packages
+    )
+    return app, image
+
+
+def modal_image_digest(packages: tuple[str, ...] = SANDBOX_PACKAGES) -> str:
+    """Fingerprint the definition Modal builds the sandbox image from."""
+    definition = json.dumps(
+        {"python": MODAL_PYTHON_VERSION, "packages": packages}, sort_keys=True
+    )
+    return hashlib.sha256(definition.encode("utf-8")).hexdigest()
+
+
+def invalidate_modal_handles() -> None:
+    """Forget cached Modal app and image handles so the next run resolves them."""
+    _modal_handles.cache_clear()
+
+
 class ModalSandboxRunner:
     name = "modal"
 
@@ -259,41 +1086,51 @@ class ModalSandboxRunner:
         self,
         app_name: str = DEFAULT_MODAL_APP,
         modal_module: Any | None = None,
+        pool: "ModalSandboxPool | None" = None,
     ):
         self.app_name = app_name
         self._modal = modal_module
+        self.pool = pool
+
+    @property
+    def identity(self) -> str:
+        return f"modal:{self.app_name}@sha256:{modal_image_digest()}"
+
+    def warm(self, limits: SandboxLimits | None = None) -> None:
+        """Resolve the app and image, then pre-create pooled sandboxes."""
+        modal = self._modal or importlib.import_module("modal")
+        _modal_handles(modal, self.app_name, SANDBOX_PACKAGES)
+        if self.pool is None:
+            return
+        sandbox_limits = limits or SandboxLimits()
+        while self.pool.needs_sandbox():
+            sandbox = self._create(modal, sandbox_limits)
+            if not self.pool.add(sandbox, sandbox_limits):
+                _cleanup_modal_sandbox(sandbox)
+                return
 
     def run(self, request: SandboxRequest) -> SandboxResult:
         started = time.monotonic()
         sandbox: Any | None = None
+        reusable = False
         try:
             modal = self._modal or importlib.import_module("modal")
-            app = modal.App.lookup(self.app_name, create_if_missing=True)
-            image = modal.Image.debian_slim(python_version="3.11").uv_pip_install(
-                *SANDBOX_PACKAGES
-            )
             limits = request.limits
-            sandbox = modal.Sandbox.create(
-                app=app,
-                image=image,
-                timeout=max(60, math.ceil(limits.wall_time_seconds) + 30),
-                cpu=(limits.cpu_cores, limits.cpu_cores),
-                memory=(limits.memory_mib, limits.memory_mib),
-                block_network=True,
-                workdir="/tmp",
-            )
+            if self.pool is not None:
+                sandbox = self.pool.acquire(limits)
+            if sandbox is None:
+                sandbox = self._create(modal, limits)
             sandbox.filesystem.make_directory(str(SANDBOX_ROOT))
             for file in request.files:
                 sandbox.filesystem.write_text(
                     file.content, str(SANDBOX_ROOT / file.path)
                 )
-            launcher_path = "/tmp/digital_forge_launcher.py"
-            sandbox.filesystem.write_text(_MODAL_LAUNCHER, launcher_path)
+            sandbox.filesystem.write_text(_MODAL_LAUNCHER, _MODAL_LAUNCHER_PATH)
             process = sandbox.exec(
                 "python",
                 "-I",
                 "-B",
-                launcher_path,
+                _MODAL_LAUNCHER_PATH,
                 str(limits.process_limit),
                 json.dumps(request.command),
                 timeout=max(1, math.ceil(limits.wall_time_seconds)),
@@ -313,12 +1150,15 @@ class ModalSandboxRunner:
                 exit_code=exit_code,
                 duration_seconds=time.monotonic() - started,
             )
+            reusable = exit_code != _OOM_EXIT_CODE
         except ModuleNotFoundError:
             result = SandboxResult(
                 duration_seconds=time.monotonic() - started,
                 error="Modal SDK is not installed.",
             )
         except Exception as exc:
+            if sandbox is None:
+                invalidate_modal_handles()
             timed_out = type(exc).__name__ in {
                 "ExecTimeoutError",
                 "SandboxTimeoutError",
@@ -333,12 +1173,146 @@ class ModalSandboxRunner:
                     else f"Modal sandbox failed: {type(exc).__name__}."
                 ),
             )
+        if (
+            self.pool is not None
+            and sandbox is not None
+            and self.pool.release(sandbox, request.limits, reusable=reusable)
+        ):
+            return result
         cleanup_error = _cleanup_modal_sandbox(sandbox)
         if cleanup_error:
             error = f"{result.error} {cleanup_error}" if result.error else cleanup_error
             return result.model_copy(update={"error": error})
         return result
 
+    def run_many(
+        self,
+        requests: Sequence[SandboxRequest],
+        *,
+        max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+    ) -> tuple[SandboxResult, ...]:
+        return _run_grouped(
+            requests,
+            self.run,
+            lambda group: self._run_batch(group, max_parallel),
+        )
+
+    def _run_batch(
+        self, requests: Sequence[SandboxRequest], max_parallel: int
+    ) -> tuple[SandboxResult, ...]:
+        started = time.monotonic()
+        parallel = max(1, min(max_parallel, len(requests)))
+        limits = requests[0].limits
+        host_timeout = math.ceil(_batch_host_timeout(requests, parallel))
+        sandbox: Any | None = None
+        try:
+            modal = self._modal or importlib.import_module("modal")
+            sandbox = self._create(
+                modal, limits, parallel=parallel, timeout=host_timeout + 30
+            )
+            sandbox.filesystem.make_directory(str(SANDBOX_ROOT))
+            sandbox.filesystem.write_text(
+                _BATCH_DRIVER, str(SANDBOX_ROOT / _BATCH_DRIVER_NAME)
+            )
+            for index, request in enumerate(requests):
+                request_root = SANDBOX_ROOT / _BATCH_REQUESTS_DIRECTORY / str(index)
+                for file in request.files:
+                    sandbox.filesystem.write_text(
+                        file.content, str(request_root / file.path)
+                    )
+            sandbox.filesystem.write_text(_MODAL_LAUNCHER, _MODAL_LAUNCHER_PATH)
+            process = sandbox.exec(
+                "python",
+                "-I",
+                "-B",
+                _MODAL_LAUNCHER_PATH,
+                str(_session_resources(limits, parallel)[2]),
+                json.dumps(_batch_driver_command(limits, parallel)),
+                timeout=host_timeout,
+                workdir=str(SANDBOX_ROOT),
+                env={"HOME": "/tmp", "PYTHONDONTWRITEBYTECODE": "1"},
+            )
+            process.stdin.write(json.dumps(_batch_jobs(requests)))
+            process.stdin.write_eof()
+            process.stdin.drain()
+            stdout = process.stdout.read()
+            process.stderr.read()
+            exit_code = process.wait()
+            results = _batch_results(
+                stdout,
+                len(requests),
+                started,
+                error=(
+                    f"Modal batch sandbox exited with {exit_code}."
+                    if exit_code
+                    else None
+                ),
+            )
+        except ModuleNotFoundError:
+            results = _batch_results(
+                "", len(requests), started, error="Modal SDK is not installed."
+            )
+        except Exception as exc:
+            if sandbox is None:
+                invalidate_modal_handles()
+            timed_out = type(exc).__name__ in {
+                "ExecTimeoutError",
+                "SandboxTimeoutError",
+                "TimeoutError",
+            }
+            results = _batch_results(
+                "",
+                len(requests),
+                started,
+                error=(
+                    "Modal sandbox timed out."
+                    if timed_out
+                    else f"Modal sandbox failed: {type(exc).__name__}."
+                ),
+                timed_out=timed_out,
+            )
+        cleanup_error = _cleanup_modal_sandbox(sandbox)
+        if cleanup_error:
+            return tuple(
+                result.model_copy(
+                    update={
+                        "error": f"{result.error} {cleanup_error}"
+                        if result.error
+                        else cleanup_error
+                    }
+                )
+                for result in results
+            )
+        return results
+
+    def _create(
+        self,
+        modal: Any,
+        limits: SandboxLimits,
+        *,
+        parallel: int = 1,
+        timeout: int | None = None,
+    ) -> Any:
+        app, image = _modal_handles(modal, self.app_name, SANDBOX_PACKAGES)
+        lifetime: dict[str, int] = {
+            "timeout": timeout or max(60, math.ceil(limits.wall_time_seconds) + 30)
+        }
+        if self.pool is not None and parallel == 1:
+            lifetime = {
+                "timeout": MODAL_POOL_LIFETIME_SECONDS,
+                "idle_timeout": math.ceil(self.pool.idle_ttl_seconds),
+            }
+        memory_mib, cpu_cores, _ = _session_resources(limits, parallel)
+        return modal.Sandbox.create(
+            app=app,
+            image=image,
+            cpu=(cpu_cores, cpu_cores),
+            memory=(memory_mib, memory_mib),
+            block_network=True,
+            workdir="/tmp",
+            **lifetime,
+        )
+
 
 def _stream_text(value: str | bytes | None) -> str:
     if value is None:
@@ -363,13 +1337,339 @@ def _cleanup_modal_sandbox(sandbox: Any | None) -> str | None:
     return None
 
 
+@dataclass
+class _PooledSandbox:
+    sandbox: Any
+    limits: SandboxLimits
+    created_at: float
+    last_used: float
+    uses: int = 0
+
+
+class ModalSandboxPool:
+    """Idle Modal sandboxes reused across requests and terminated after a TTL.
+
+    CPU and memory are fixed when a sandbox is created, so sandboxes are only
+    handed to requests with matching limits. Modal's own ``idle_timeout`` backs
+    up the local TTL for sandboxes this process never gets back to.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = 2,
+        idle_ttl_seconds: float = 300.0,
+        max_uses: int = 25,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.size = size
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_uses = max_uses
+        self._clock = clock
+        self._idle: deque[_PooledSandbox] = deque()
+        self._in_use: dict[int, _PooledSandbox] = {}
+        self._closed = False
+        self._lock = Lock()
+
+    def needs_sandbox(self) -> bool:
+        with self._lock:
+            return not self._closed and len(self._idle) < self.size
+
+    def acquire(self, limits: SandboxLimits) -> Any | None:
+        self.evict_idle()
+        with self._lock:
+            for entry in self._idle:
+                if _same_container_limits(entry.limits, limits):
+                    self._idle.remove(entry)
+                    self._in_use[id(entry.sandbox)] = entry
+                    return entry.sandbox
+        return None
+
+    def add(self, sandbox: Any, limits: SandboxLimits) -> bool:
+        now = self._clock()
+        return self._keep(
+            _PooledSandbox(
+                sandbox=sandbox, limits=limits, created_at=now, last_used=now
+            )
+        )
+
+    def release(self, sandbox: Any, limits: SandboxLimits, *, reusable: bool) -> bool:
+        """Return ``True`` when the pool keeps the sandbox for a later request."""
+        now = self._clock()
+        with self._lock:
+            entry = self._in_use.pop(id(sandbox), None) or _PooledSandbox(
+                sandbox=sandbox, limits=limits, created_at=now, last_used=now
+            )
+        entry.uses += 1
+        if (
+            not reusable
+            or entry.uses >= self.max_uses
+            or now - entry.created_at
+            >= MODAL_POOL_LIFETIME_SECONDS - self.idle_ttl_seconds
+        ):
+            return False
+        return _reset_modal_sandbox(sandbox) and self._keep(entry)
+
+    def evict_idle(self) -> None:
+        now = self._clock()
+        with self._lock:
+            expired = [
+                entry
+                for entry in self._idle
+                if now - entry.last_used >= self.idle_ttl_seconds
+            ]
+            for entry in expired:
+                self._idle.remove(entry)
+        for entry in expired:
+            _cleanup_modal_sandbox(entry.sandbox)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            entries = list(self._idle)
+            self._idle.clear()
+        for entry in entries:
+            _cleanup_modal_sandbox(entry.sandbox)
+
+    def _keep(self, entry: _PooledSandbox) -> bool:
+        with self._lock:
+            if self._closed or len(self._idle) >= self.size:
+                return False
+            entry.last_used = self._clock()
+            self._idle.append(entry)
+            return True
+
+
+def _reset_modal_sandbox(sandbox: Any) -> bool:
+    try:
+        process = sandbox.exec("python", "-I", "-B", "-c", _MODAL_RESET, timeout=10)
+        return bool(process.wait() == 0)
+    except Exception:
+        return False
+
+
+def _same_container_limits(left: SandboxLimits, right: SandboxLimits) -> bool:
+    return (
+        left.memory_mib == right.memory_mib
+        and left.cpu_cores == right.cpu_cores
+        and left.process_limit == right.process_limit
+    )
+
+
+@lru_cache(maxsize=4)
+def get_modal_sandbox_pool(
+    app_name: str, size: int, idle_ttl_seconds: float, max_uses: int
+) -> ModalSandboxPool:
+    pool = ModalSandboxPool(
+        size=size, idle_ttl_seconds=idle_ttl_seconds, max_uses=max_uses
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+class LocalProcessSandboxRunner:
+    """Run requests as resource-limited child processes on a trusted host.
+
+    Meant for offline benchmark sweeps where container start-up dominates. The
+    workspace is a fresh temporary directory that stands in for the sandbox root,
+    limits come from ``setrlimit``, and the network is removed with an
+    unprivileged ``unshare`` when the host allows user namespaces. CPU cores are
+    approximated with CPU affinity. This is weaker isolation than Docker or Modal.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        *,
+        isolate_network: bool = True,
+        python_executable: str = sys.executable,
+    ):
+        self.isolate_network = isolate_network
+        self.python_executable = python_executable
+
+    @property
+    def identity(self) -> str:
+        return f"local:{self.python_executable}"
+
+    @staticmethod
+    def network_isolation_available() -> bool:
+        return _unshare_command() is not None
+
+    def run_many(
+        self,
+        requests: Sequence[SandboxRequest],
+        *,
+        max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+    ) -> tuple[SandboxResult, ...]:
+        return _run_each(self.run, requests, max_parallel)
+
+    def run(self, request: SandboxRequest) -> SandboxResult:
+        started = time.monotonic()
+        limits = request.limits
+        with tempfile.TemporaryDirectory(prefix="digital-forge-sandbox-") as root:
+            workspace = Path(root) / "workspace"
+            home = Path(root) / "tmp"
+            workspace.mkdir()
+            home.mkdir()
+            DockerSandboxRunner._write_files(workspace, request.files)
+            # Docker mounts the workspace read-only; match it so both backends
+            # produce, and cache, the same results for the same request.
+            _set_directory_modes(workspace, 0o555)
+            command = [_rebase_argument(part, workspace) for part in request.command]
+            if command[0] == "python":
+                command[0] = self.python_executable
+            command = [*_local_limits_command(self.python_executable, limits), *command]
+            unshare = _unshare_command() if self.isolate_network else None
+            if unshare is not None:
+                command = [*unshare, *command]
+            try:
+                return self._run_process(command, request, workspace, home, started)
+            finally:
+                _set_directory_modes(workspace, 0o755)
+
+    @staticmethod
+    def _run_process(
+        command: list[str],
+        request: SandboxRequest,
+        workspace: Path,
+        home: Path,
+        started: float,
+    ) -> SandboxResult:
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=workspace,
+                env={
+                    "HOME": str(home),
+                    "TMPDIR": str(home),
+                    "PATH": os.environ.get("PATH", os.defpath),
+                    "PYTHONDONTWRITEBYTECODE": "1",
+                },
+                start_new_session=True,
+            )
+        except OSError as exc:
+            return SandboxResult(
+                duration_seconds=time.monotonic() - started,
+                error=f"Local sandbox could not start: {type(exc).__name__}.",
+            )
+        try:
+            stdout, stderr = process.communicate(
+                request.stdin, timeout=request.limits.wall_time_seconds
+            )
+        except subprocess.TimeoutExpired:
+            stdout, stderr = _stop_process_group(process)
+            return SandboxResult(
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=124,
+                duration_seconds=time.monotonic() - started,
+                timed_out=True,
+            )
+        exit_code = process.returncode
+        if exit_code < 0:
+            exit_code = 128 - exit_code
+        return SandboxResult(
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            duration_seconds=time.monotonic() - started,
+            timed_out=process.returncode == -signal.SIGXCPU,
+        )
+
+
+def _local_limits_command(python: str, limits: SandboxLimits) -> list[str]:
+    return [
+        python,
+        "-I",
+        "-S",
+        str(LOCAL_LIMITS_PATH),
+        str(math.ceil(limits.wall_time_seconds) + 1),
+        str(limits.memory_mib * 1024 * 1024),
+        str(limits.process_limit),
+        str(math.ceil(limits.cpu_cores)),
+    ]
+
+
+def _set_directory_modes(root: Path, mode: int) -> None:
+    """Change the mode of ``root`` and every directory below it, leaves first."""
+    for directory, _, _ in sorted(os.walk(root), reverse=True):
+        os.chmod(directory, mode)
+
+
+def _stop_process_group(process: subprocess.Popen[str]) -> tuple[str, str]:
+    _signal_process_group(process, signal.SIGTERM)
+    try:
+        return process.communicate(timeout=1)
+    except subprocess.TimeoutExpired:
+        _signal_process_group(process, signal.SIGKILL)
+        return process.communicate()
+
+
+def _signal_process_group(process: subprocess.Popen[str], sig: int) -> None:
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+@lru_cache(maxsize=1)
+def _unshare_command() -> tuple[str, ...] | None:
+    unshare = shutil.which("unshare")
+    if unshare is None:
+        return None
+    command = (unshare, "--user", "--net")
+    try:
+        completed = subprocess.run(
+            [*command, "true"], capture_output=True, timeout=5, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return command if completed.returncode == 0 else None
+
+
 def build_sandbox_runner(
     backend: str,
     docker_image: str = DEFAULT_DOCKER_IMAGE,
     modal_app: str = DEFAULT_MODAL_APP,
+    *,
+    limits: SandboxLimits | None = None,
+    docker_pool_size: int = 0,
+    docker_pool_max_uses: int = 25,
+    docker_pool_health_check: bool = True,
+    modal_pool_size: int = 0,
+    modal_pool_idle_ttl_seconds: float = 300.0,
+    modal_pool_max_uses: int = 25,
 ) -> SandboxRunner:
     if backend == "docker":
-        return DockerSandboxRunner(docker_image)
+        pool = (
+            get_docker_container_pool(
+                docker_image,
+                limits or SandboxLimits(),
+                docker_pool_size,
+                docker_pool_max_uses,
+                docker_pool_health_check,
+            )
+            if docker_pool_size > 0
+            else None
+        )
+        return DockerSandboxRunner(docker_image, pool=pool)
     if backend == "modal":
-        return ModalSandboxRunner(modal_app)
+        modal_pool = (
+            get_modal_sandbox_pool(
+                modal_app,
+                modal_pool_size,
+                modal_pool_idle_ttl_seconds,
+                modal_pool_max_uses,
+            )
+            if modal_pool_size > 0
+            else None
+        )
+        return ModalSandboxRunner(modal_app, pool=modal_pool)
+    if backend == "local":
+        return LocalProcessSandboxRunner()
     raise ValueError(f"Unsupported sandbox backend: {backend}")
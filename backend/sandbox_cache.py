@@ -0,0 +1,111 @@
+"""Content-addressed cache of deterministic sandbox results."""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+
+from .sandbox import SandboxRequest, SandboxResult, SandboxRunner
+from .sandbox_dependencies import SANDBOX_PACKAGES
+
+
+def runner_identity(runner: SandboxRunner) -> str:
+    """Describe the execution environment a cached result is only valid for."""
+    identity = getattr(runner, "identity", None)
+    return str(identity) if identity is not None else runner.name
+
+
+def cacheable(result: SandboxResult) -> bool:
+    """Only outcomes decided by the request content are safe to replay."""
+    return (
+        result.error is None
+        and not result.timed_out
+        and result.exit_code is not None
+        and result.exit_code not in {124, 137, -9}
+    )
+
+
+class SandboxResultCache:
+    """Bounded LRU of sandbox results with an optional on-disk tier."""
+
+    def __init__(self, max_entries: int = 256, directory: Path | None = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: OrderedDict[str, SandboxResult] = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(request: SandboxRequest, identity: str) -> str:
+        payload = {
+            "identity": identity,
+            "packages": SANDBOX_PACKAGES,
+            "files": sorted((file.path, file.content) for file in request.files),
+            "command": request.command,
+            "stdin": request.stdin,
+            "limits": request.limits.model_dump(mode="json"),
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> SandboxResult | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                return result
+        result = self._read(key)
+        if result is not None:
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: SandboxResult) -> None:
+        if not cacheable(result):
+            return
+        self._remember(key, result)
+        self._write(key, result)
+
+    def _remember(self, key: str, result: SandboxResult) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> SandboxResult | None:
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            return SandboxResult.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, result: SandboxResult) -> None:
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.directory,
+                suffix=".tmp",
+                delete=False,
+            ) as handle:
+                handle.write(result.model_dump_json())
+            os.replace(handle.name, self.directory / f"{key}.json")
+        except OSError:
+            return
+
+
+@lru_cache(maxsize=4)
+def get_sandbox_result_cache(
+    max_entries: int, directory: Path | None = None
+) -> SandboxResultCache:
+    return SandboxResultCache(max_entries, directory)
@@ -151,8 +151,9 @@ def build_tasks(
             "Candidate, timeout, and resource failures normally route to {file_name}; test "
             "failures normally route to {test_file_name}. Do not override that routing "
             "without evidence in the log. Return one valid JSON object with "
-            "'analysis', 'file_to_fix', and 'next_task'. file_to_fix must be {file_name} or "
-            "{test_file_name}.\n\nOriginal Developer Task:\n'''\n{developer_task}\n'''\n\n"
+            "'analysis', 'file_to_fix', and 'next_task'. file_to_fix must be {file_name}, "
+            "{test_file_name}, or 'both' when each file separately contradicts the original "
+            "request.\n\nOriginal Developer Task:\n'''\n{developer_task}\n'''\n\n"
             "Current Application Code:\n'''\n{current_code}\n'''\n\nCurrent Test Code:\n'''\n"
             "{current_tests}\n'''\n\n"
             "Sanitized Test Failure Evidence:\n'''\n{test_failure_log}\n'''\n\nUse "
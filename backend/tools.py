@@ -1,22 +1,50 @@
 """Workspace and CrewAI tools scoped to one pipeline run."""
 
 import ast
-from collections.abc import Sequence
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
 from pathlib import Path
 
 from crewai.tools import BaseTool, tool
+from pydantic import Field
 
+from .models import SandboxCacheStats
 from .sandbox import (
     DockerSandboxRunner,
     SandboxFile,
     SandboxLimits,
     SandboxRequest,
+    SandboxResult,
     SandboxRunner,
+    run_sandbox_async,
 )
+from .sandbox_cache import SandboxResultCache, runner_identity
 from .self_healing import build_repair_evidence
 from .workspace import RunWorkspace
 
 
+class RunTestsTool(BaseTool):
+    """Run a generated pytest suite against code from this run's workspace.
+
+    CrewAI agents call ``run`` synchronously even inside ``akickoff``, so that
+    entry point never touches the event loop; the pipeline awaits ``arun``,
+    which keeps the sandbox cancellable.
+    """
+
+    name: str = "run_tests"
+    description: str = (
+        "Run a generated pytest suite against code from this run's workspace."
+    )
+    sync_run: Callable[[str], str] = Field(exclude=True)
+    async_run: Callable[[str], Awaitable[str]] = Field(exclude=True)
+
+    def _run(self, test_file_path: str) -> str:
+        return self.sync_run(test_file_path)
+
+    async def _arun(self, test_file_path: str) -> str:
+        return await self.async_run(test_file_path)
+
+
 def build_file_system_tools(
     workspace: RunWorkspace,
     sandbox_runner: SandboxRunner | None = None,
@@ -25,6 +53,9 @@ def build_file_system_tools(
     memory_mib: int = 256,
     cpu_cores: float = 1.0,
     process_limit: int = 64,
+    result_cache: SandboxResultCache | None = None,
+    cache_stats: SandboxCacheStats | None = None,
+    bypass_result_cache: bool = False,
 ) -> Sequence[BaseTool]:
     """Bind file operations to a single run workspace."""
 
@@ -36,6 +67,40 @@ def build_file_system_tools(
         process_limit=process_limit,
     )
 
+    def _lookup(request: SandboxRequest) -> tuple[str | None, SandboxResult | None]:
+        if result_cache is None or bypass_result_cache:
+            return None, None
+        key = result_cache.key(request, runner_identity(runner))
+        cached = result_cache.get(key)
+        if cache_stats is not None:
+            if cached is None:
+                cache_stats.misses += 1
+            else:
+                cache_stats.hits += 1
+                cache_stats.seconds_saved += cached.duration_seconds
+        return key, cached
+
+    def _store(key: str | None, result: SandboxResult) -> None:
+        if result_cache is not None and key is not None:
+            result_cache.put(key, result)
+
+    def _run_cached(request: SandboxRequest) -> SandboxResult:
+        key, cached = _lookup(request)
+        if cached is not None:
+            return cached
+        result = runner.run(request)
+        _store(key, result)
+        return result
+
+    async def _arun_cached(request: SandboxRequest) -> SandboxResult:
+        # Resolving the runner identity and the on-disk cache tier both block.
+        key, cached = await asyncio.to_thread(_lookup, request)
+        if cached is not None:
+            return cached
+        result = await run_sandbox_async(runner, request)
+        await asyncio.to_thread(_store, key, result)
+        return result
+
     @tool("save_file")
     def save_file(file_path: str, content: str) -> str:
         """Save text to a relative file path in this run's isolated workspace."""
@@ -50,9 +115,7 @@ def build_file_system_tools(
         normalized = workspace.write(file_path, content)
         return f"File '{normalized}' saved in memory."
 
-    @tool("run_tests")
-    def run_tests(test_file_path: str) -> str:
-        """Run a generated pytest suite against code from this run's workspace."""
+    def _test_request(test_file_path: str) -> tuple[SandboxRequest, str, str] | str:
         try:
             normalized_test_path = workspace.normalize(test_file_path)
         except ValueError as exc:
@@ -71,33 +134,46 @@ def build_file_system_tools(
         if test_content is None:
             return f"Error: Test file '{normalized_test_path}' not found in memory."
 
-        result = runner.run(
-            SandboxRequest(
-                files=(
-                    SandboxFile(path=code_file_path, content=code_content),
-                    SandboxFile(path=normalized_test_path, content=test_content),
-                ),
-                command=(
-                    "python",
-                    "-B",
-                    "-m",
-                    "pytest",
-                    f"/workspace/{normalized_test_path}",
-                    "--maxfail=1",
-                    "--disable-warnings",
-                    "-p",
-                    "no:cacheprovider",
-                    "-q",
-                ),
-                limits=limits,
-            )
+        request = SandboxRequest(
+            files=(
+                SandboxFile(path=code_file_path, content=code_content),
+                SandboxFile(path=normalized_test_path, content=test_content),
+            ),
+            command=(
+                "python",
+                "-B",
+                "-m",
+                "pytest",
+                f"/workspace/{normalized_test_path}",
+                "--maxfail=1",
+                "--disable-warnings",
+                "-p",
+                "no:cacheprovider",
+                "-q",
+            ),
+            limits=limits,
         )
+        return request, code_file_path, normalized_test_path
+
+    def _test_report(result: SandboxResult, code_path: str, test_path: str) -> str:
         if result.exit_code == 0 and not result.timed_out and result.error is None:
             return "ALL TESTS PASSED"
         return build_repair_evidence(
-            result,
-            code_file_path=code_file_path,
-            test_file_path=normalized_test_path,
+            result, code_file_path=code_path, test_file_path=test_path
         ).as_prompt()
 
-    return [save_file, run_tests]
+    def run_tests(test_file_path: str) -> str:
+        prepared = _test_request(test_file_path)
+        if isinstance(prepared, str):
+            return prepared
+        request, code_path, test_path = prepared
+        return _test_report(_run_cached(request), code_path, test_path)
+
+    async def arun_tests(test_file_path: str) -> str:
+        prepared = _test_request(test_file_path)
+        if isinstance(prepared, str):
+            return prepared
+        request, code_path, test_path = prepared
+        return _test_report(await _arun_cached(request), code_path, test_path)
+
+    return [save_file, RunTestsTool(sync_run=run_tests, async_run=arun_tests)]
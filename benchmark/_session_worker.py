@@ -0,0 +1,133 @@
+"""Evaluate a stream of candidates in forked children of one warm process.
+
+Jobs arrive on stdin as ``<byte length>\\n<json>`` frames holding the candidate
+source, function name, inputs, time limit, and output limit. Each result is
+printed as one JSON line tagged with its job index. Output over the limit is
+dropped, as a one-shot sandbox would truncate it, so one verbose candidate cannot
+crowd the others out of the session's stdout. Expected outputs never enter the
+sandbox.
+"""
+
+import json
+import os
+import select
+import signal
+import sys
+import time
+import types
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+_MODULE_NAME = "benchmark_candidate"
+
+
+def _read_frames(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    while True:
+        header = stream.readline()
+        if not header.strip():
+            return
+        payload = stream.read(int(header))
+        yield json.loads(payload)
+
+
+def _evaluate(source: str, function_name: str, inputs: list[Any]) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    try:
+        module = types.ModuleType(_MODULE_NAME)
+        module.__file__ = "candidate.py"
+        sys.modules[_MODULE_NAME] = module
+        exec(compile(source, "candidate.py", "exec"), module.__dict__)
+        function = getattr(module, function_name)
+        if not callable(function):
+            raise TypeError(f"{function_name} is not callable")
+    except Exception as exc:
+        return {"results": results, "import_error": type(exc).__name__}
+    for args in inputs:
+        try:
+            value = function(*args)
+        except Exception as exc:
+            results.append({"value": None, "error_type": type(exc).__name__})
+            break
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            results.append({"value": None, "error_type": "SerializationError"})
+            break
+        results.append({"value": value, "error_type": None})
+    return {"results": results, "import_error": None}
+
+
+def _run_child(job: dict[str, Any], write_fd: int) -> None:
+    os.setpgid(0, 0)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for descriptor in (0, 1, 2):
+        os.dup2(devnull, descriptor)
+    try:
+        output = _evaluate(job["candidate"], job["function"], job["inputs"])
+        encoded = json.dumps(output).encode("utf-8")
+    except BaseException as exc:
+        encoded = json.dumps(
+            {"results": [], "import_error": type(exc).__name__}
+        ).encode("utf-8")
+    with os.fdopen(write_fd, "wb") as pipe:
+        pipe.write(encoded)
+    os._exit(0)
+
+
+def _run_job(job: dict[str, Any]) -> dict[str, Any]:
+    started = time.perf_counter()
+    deadline = started + float(job["time_limit_seconds"])
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        _run_child(job, write_fd)
+    os.close(write_fd)
+    chunks: list[bytes] = []
+    size = 0
+    # Four bytes per character bounds the UTF-8 size of any in-limit output.
+    max_bytes = 4 * int(job["max_output_characters"])
+    timed_out = False
+    with os.fdopen(read_fd, "rb", buffering=0) as pipe:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                timed_out = True
+                break
+            ready, _, _ = select.select([pipe], [], [], remaining)
+            if not ready:
+                continue
+            chunk = pipe.read(65536)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size <= max_bytes:
+                chunks.append(chunk)
+    if timed_out:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    _, status = os.waitpid(pid, 0)
+    duration = time.perf_counter() - started
+    if timed_out:
+        return {"timed_out": True, "exit_code": 124, "duration_seconds": duration}
+    exit_code = os.waitstatus_to_exitcode(status)
+    output = b"".join(chunks).decode("utf-8", errors="replace")
+    if size > max_bytes or len(output) > int(job["max_output_characters"]):
+        output = ""
+    return {
+        "timed_out": False,
+        "exit_code": exit_code if exit_code >= 0 else 128 - exit_code,
+        "duration_seconds": duration,
+        "output": output,
+    }
+
+
+def main() -> None:
+    for index, job in enumerate(_read_frames(sys.stdin.buffer)):
+        print(json.dumps({"index": index, **_run_job(job)}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
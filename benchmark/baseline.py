@@ -2,7 +2,8 @@
 
 import argparse
 import re
-from collections.abc import Sequence
+from collections.abc import Generator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Protocol
 from uuid import uuid4
@@ -12,22 +13,29 @@ from openai import OpenAI
 from backend.config import Settings
 from backend.sandbox import (
     DockerSandboxRunner,
-    ModalSandboxRunner,
     SandboxRunner,
+    build_sandbox_runner,
 )
 
 from .catalog import BENCHMARK_VERSION, get_task, load_tasks
-from .evaluator import evaluate_candidate
+from .evaluator import (
+    evaluate_candidate,
+    evaluate_candidates,
+    evaluate_candidates_in_session,
+)
 from .hidden_cases import evaluator_sha256
 from .models import (
     BenchmarkInterruptedReport,
     BenchmarkReport,
+    BenchmarkRunManifest,
     BenchmarkTask,
+    EvaluationResult,
     GeneratedSolution,
     TaskResult,
     utc_now,
 )
 
+GENERATION_FAILED = "generation failed"
 BASELINE_INSTRUCTIONS = (
     "Solve the algorithm task in Python 3. Return only executable Python code that "
     "defines the requested function. Do not include markdown fences, tests, or prose."
@@ -76,33 +84,80 @@ class ZeroShotBaselineRunner:
         sandbox_runner: SandboxRunner | None = None,
         max_consecutive_failures: int | None = None,
         finish_remaining_threshold: int = 3,
+        concurrency: int = 1,
+        evaluation_batch_size: int = 1,
+        evaluation_session: bool = False,
     ):
+        if concurrency < 1:
+            raise ValueError("Benchmark concurrency must be at least 1.")
+        if evaluation_batch_size < 1:
+            raise ValueError("Benchmark evaluation batch size must be at least 1.")
         self.generator = generator
         self.model = model
         self.output_root = output_root
         self.sandbox_runner = sandbox_runner or DockerSandboxRunner()
         self.max_consecutive_failures = max_consecutive_failures
         self.finish_remaining_threshold = finish_remaining_threshold
+        self.concurrency = concurrency
+        self.evaluation_batch_size = evaluation_batch_size
+        self.evaluation_session = evaluation_session
 
     def run(
-        self, tasks: Sequence[BenchmarkTask] | None = None
+        self,
+        tasks: Sequence[BenchmarkTask] | None = None,
+        *,
+        resume_run_id: str | None = None,
     ) -> BenchmarkReport | BenchmarkInterruptedReport:
-        selected = tuple(tasks or load_tasks())
-        run_id = uuid4().hex
-        run_directory = self.output_root / run_id
-        candidates_directory = run_directory / "candidates"
-        checkpoints_directory = run_directory / "checkpoints"
-        candidates_directory.mkdir(parents=True, exist_ok=False)
-        checkpoints_directory.mkdir(parents=True, exist_ok=False)
-        started_at = utc_now()
+        if resume_run_id is None:
+            selected = tuple(tasks or load_tasks())
+            run_id = uuid4().hex
+            run_directory = self.output_root / run_id
+            candidates_directory = run_directory / "candidates"
+            checkpoints_directory = run_directory / "checkpoints"
+            candidates_directory.mkdir(parents=True, exist_ok=False)
+            checkpoints_directory.mkdir(parents=True, exist_ok=False)
+            started_at = utc_now()
+            BenchmarkRunManifest(
+                run_id=run_id,
+                benchmark_version=BENCHMARK_VERSION,
+                evaluator_sha256=evaluator_sha256(),
+                model=self.model,
+                sandbox_backend=self.sandbox_runner.name,
+                started_at=started_at,
+                task_ids=tuple(task.id for task in selected),
+            ).write(run_directory / "run.json")
+            resumed: dict[str, TaskResult] = {}
+        else:
+            run_id = resume_run_id
+            run_directory = self.output_root / run_id
+            manifest = self._resume_manifest(run_directory, run_id)
+            selected = tuple(
+                tasks or [get_task(task_id) for task_id in manifest.task_ids]
+            )
+            if not selected:
+                raise ValueError(
+                    f"Run {run_id} does not record its task selection; "
+                    "pass the tasks to resume explicitly."
+                )
+            candidates_directory = run_directory / "candidates"
+            checkpoints_directory = run_directory / "checkpoints"
+            candidates_directory.mkdir(parents=True, exist_ok=True)
+            checkpoints_directory.mkdir(parents=True, exist_ok=True)
+            started_at = manifest.started_at
+            resumed = _load_checkpoints(checkpoints_directory, selected)
         results: list[TaskResult] = []
         consecutive_failures = 0
         stop_reason: str | None = None
 
-        for index, task in enumerate(selected):
-            result = self._run_task(task, candidates_directory)
+        task_results = self._task_results(
+            selected, candidates_directory, checkpoints_directory, resumed
+        )
+        for index, result in enumerate(task_results):
             results.append(result)
-            result.write(checkpoints_directory / f"{task.id}.json")
+            if resumed.get(result.task_id) is result:
+                # A streak only counts failures from one uninterrupted session.
+                consecutive_failures = 0
+                continue
 
             consecutive_failures = 0 if result.passed else consecutive_failures + 1
             remaining = len(selected) - index - 1
@@ -116,6 +171,7 @@ class ZeroShotBaselineRunner:
                     f"with {remaining} tasks remaining"
                 )
                 break
+        task_results.close()
 
         if stop_reason is not None:
             interrupted = BenchmarkInterruptedReport(
@@ -155,39 +211,259 @@ class ZeroShotBaselineRunner:
         report.write(run_directory / "report.json")
         return report
 
+    def _task_results(
+        self,
+        tasks: Sequence[BenchmarkTask],
+        candidates_directory: Path,
+        checkpoints_directory: Path,
+        resumed: dict[str, TaskResult],
+    ) -> Generator[TaskResult, None, None]:
+        """Yield results in catalog order while up to ``concurrency`` tasks run."""
+        if self.evaluation_batch_size > 1 or self.evaluation_session:
+            yield from self._batched_task_results(
+                tasks, candidates_directory, checkpoints_directory, resumed
+            )
+            return
+        if self.concurrency == 1:
+            for task in tasks:
+                yield resumed.get(task.id) or self._checkpointed_task(
+                    task, candidates_directory, checkpoints_directory
+                )
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="benchmark-task"
+        )
+        try:
+            futures = {
+                task.id: executor.submit(
+                    self._checkpointed_task,
+                    task,
+                    candidates_directory,
+                    checkpoints_directory,
+                )
+                for task in tasks
+                if task.id not in resumed
+            }
+            for task in tasks:
+                yield resumed.get(task.id) or futures[task.id].result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _batched_task_results(
+        self,
+        tasks: Sequence[BenchmarkTask],
+        candidates_directory: Path,
+        checkpoints_directory: Path,
+        resumed: dict[str, TaskResult],
+    ) -> Generator[TaskResult, None, None]:
+        """Generate a batch of candidates, then evaluate them in shared sandboxes."""
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="benchmark-task"
+        )
+        try:
+            for start in range(0, len(tasks), self.evaluation_batch_size):
+                batch = tasks[start : start + self.evaluation_batch_size]
+                pending = [task for task in batch if task.id not in resumed]
+                generated = list(
+                    executor.map(
+                        lambda task: self._generated_task(task, candidates_directory),
+                        pending,
+                    )
+                )
+                evaluated = self._evaluate_batch(generated)
+                for result in evaluated.values():
+                    result.write(checkpoints_directory / f"{result.task_id}.json")
+                for task in batch:
+                    yield resumed.get(task.id) or evaluated[task.id]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _generated_task(
+        self, task: BenchmarkTask, directory: Path
+    ) -> tuple[BenchmarkTask, Path, GeneratedSolution | TaskResult]:
+        candidate_path = directory / f"{task.id}.py"
+        try:
+            return task, candidate_path, self._generate(task, candidate_path)
+        except Exception as exc:
+            return (
+                task,
+                candidate_path,
+                _failed_result(
+                    task,
+                    candidate_path,
+                    f"{GENERATION_FAILED}: {type(exc).__name__}: {exc}",
+                ),
+            )
+
+    def _evaluate_batch(
+        self,
+        generated: Sequence[tuple[BenchmarkTask, Path, GeneratedSolution | TaskResult]],
+    ) -> dict[str, TaskResult]:
+        results = {
+            task.id: outcome
+            for task, _, outcome in generated
+            if isinstance(outcome, TaskResult)
+        }
+        ready = [
+            (task, path, outcome)
+            for task, path, outcome in generated
+            if isinstance(outcome, GeneratedSolution)
+        ]
+        evaluate = (
+            evaluate_candidates_in_session
+            if self.evaluation_session
+            else evaluate_candidates
+        )
+        try:
+            evaluations = evaluate(
+                [(task, path) for task, path, _ in ready],
+                self.sandbox_runner,
+                max_parallel=self.concurrency,
+            )
+        except Exception as exc:
+            error = f"evaluation failed: {type(exc).__name__}: {exc}"
+            for task, path, _ in ready:
+                results[task.id] = _failed_result(task, path, error)
+            return results
+        for (task, path, solution), evaluation in zip(ready, evaluations, strict=True):
+            results[task.id] = _task_result(task, path, solution, evaluation)
+        return results
+
+    def _resume_manifest(
+        self, run_directory: Path, run_id: str
+    ) -> BenchmarkRunManifest:
+        if not re.fullmatch(r"[0-9a-f]{32}", run_id):
+            raise ValueError(f"Invalid benchmark run ID {run_id!r}.")
+        manifest_path = run_directory / "run.json"
+        interrupted_path = run_directory / "interrupted.json"
+        if manifest_path.is_file():
+            manifest = BenchmarkRunManifest.model_validate_json(
+                manifest_path.read_text(encoding="utf-8")
+            )
+        elif interrupted_path.is_file():
+            interrupted = BenchmarkInterruptedReport.model_validate_json(
+                interrupted_path.read_text(encoding="utf-8")
+            )
+            # Older interrupted runs only recorded how many tasks they intended
+            # to run, which identifies the selection only for full-catalog runs.
+            catalog = load_tasks()
+            manifest = BenchmarkRunManifest(
+                run_id=interrupted.run_id,
+                benchmark_version=interrupted.benchmark_version,
+                evaluator_sha256=interrupted.evaluator_sha256,
+                model=interrupted.model,
+                sandbox_backend=interrupted.sandbox_backend,
+                started_at=interrupted.started_at,
+                task_ids=(
+                    tuple(task.id for task in catalog)
+                    if interrupted.intended_tasks == len(catalog)
+                    else ()
+                ),
+            )
+        else:
+            raise ValueError(f"No resumable benchmark run found at {run_directory}.")
+
+        if manifest.benchmark_version != BENCHMARK_VERSION:
+            raise ValueError(
+                f"Run {run_id} used benchmark {manifest.benchmark_version}, "
+                f"not {BENCHMARK_VERSION}."
+            )
+        if manifest.evaluator_sha256 != evaluator_sha256():
+            raise ValueError(f"Run {run_id} was scored by a different evaluator.")
+        if manifest.model != self.model:
+            raise ValueError(
+                f"Run {run_id} recorded model {manifest.model!r}, not {self.model!r}."
+            )
+        return manifest
+
+    def _checkpointed_task(
+        self,
+        task: BenchmarkTask,
+        candidates_directory: Path,
+        checkpoints_directory: Path,
+    ) -> TaskResult:
+        result = self._run_task(task, candidates_directory)
+        result.write(checkpoints_directory / f"{task.id}.json")
+        return result
+
     def _run_task(self, task: BenchmarkTask, directory: Path) -> TaskResult:
         candidate_path = directory / f"{task.id}.py"
         try:
-            generated = self.generator.generate(task, self.model)
-            candidate_path.write_text(generated.code, encoding="utf-8")
+            generated = self._generate(task, candidate_path)
             evaluation = evaluate_candidate(task, candidate_path, self.sandbox_runner)
-            return TaskResult(
-                task_id=task.id,
-                task_version=task.version,
-                difficulty=task.difficulty,
-                passed=evaluation.passed,
-                tests_passed=evaluation.tests_passed,
-                tests_total=evaluation.tests_total,
-                duration_seconds=evaluation.duration_seconds,
-                candidate_path=str(candidate_path),
-                response_id=generated.response_id,
-                input_tokens=generated.input_tokens,
-                output_tokens=generated.output_tokens,
-                error=evaluation.error,
-            )
+            return _task_result(task, candidate_path, generated, evaluation)
         except Exception as exc:
-            return TaskResult(
-                task_id=task.id,
-                task_version=task.version,
-                difficulty=task.difficulty,
-                passed=False,
-                tests_passed=0,
-                tests_total=0,
-                duration_seconds=0,
-                candidate_path=str(candidate_path),
-                error=f"generation failed: {type(exc).__name__}: {exc}",
+            return _failed_result(
+                task,
+                candidate_path,
+                f"{GENERATION_FAILED}: {type(exc).__name__}: {exc}",
             )
 
+    def _generate(self, task: BenchmarkTask, candidate_path: Path) -> GeneratedSolution:
+        generated = self.generator.generate(task, self.model)
+        candidate_path.write_text(generated.code, encoding="utf-8")
+        return generated
+
+
+def _task_result(
+    task: BenchmarkTask,
+    candidate_path: Path,
+    generated: GeneratedSolution,
+    evaluation: EvaluationResult,
+) -> TaskResult:
+    return TaskResult(
+        task_id=task.id,
+        task_version=task.version,
+        difficulty=task.difficulty,
+        passed=evaluation.passed,
+        tests_passed=evaluation.tests_passed,
+        tests_total=evaluation.tests_total,
+        duration_seconds=evaluation.duration_seconds,
+        candidate_path=str(candidate_path),
+        response_id=generated.response_id,
+        input_tokens=generated.input_tokens,
+        output_tokens=generated.output_tokens,
+        error=evaluation.error,
+    )
+
+
+def _failed_result(task: BenchmarkTask, candidate_path: Path, error: str) -> TaskResult:
+    return TaskResult(
+        task_id=task.id,
+        task_version=task.version,
+        difficulty=task.difficulty,
+        passed=False,
+        tests_passed=0,
+        tests_total=0,
+        duration_seconds=0,
+        candidate_path=str(candidate_path),
+        error=error,
+    )
+
+
+def _load_checkpoints(
+    directory: Path, tasks: Sequence[BenchmarkTask]
+) -> dict[str, TaskResult]:
+    """Return evaluated checkpoints that still match the current task version.
+
+    Generation failures are usually transient API errors, so resuming retries
+    them instead of carrying the failure into the report.
+    """
+    checkpoints: dict[str, TaskResult] = {}
+    for task in tasks:
+        path = directory / f"{task.id}.json"
+        if not path.is_file():
+            continue
+        result = TaskResult.model_validate_json(path.read_text(encoding="utf-8"))
+        if (
+            result.task_id == task.id
+            and result.task_version == task.version
+            and not (result.error or "").startswith(GENERATION_FAILED)
+        ):
+            checkpoints[task.id] = result
+    return checkpoints
+
 
 def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Run the zero-shot benchmark baseline")
@@ -208,9 +484,9 @@ def main(argv: Sequence[str] | None = None) -> None:
     )
     parser.add_argument(
         "--sandbox",
-        choices=("docker", "modal"),
+        choices=("docker", "modal", "local"),
         default="docker",
-        help="Isolated execution backend (default: docker)",
+        help="Isolated execution backend; local is for trusted hosts (default: docker)",
     )
     parser.add_argument(
         "--modal-app",
@@ -229,13 +505,31 @@ def main(argv: Sequence[str] | None = None) -> None:
         default=3,
         help="Ignore the failure guard when this many or fewer tasks remain",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of tasks to generate and evaluate at once (default: 1)",
+    )
+    parser.add_argument(
+        "--evaluation-batch-size",
+        type=int,
+        default=1,
+        help="Generate this many candidates, then evaluate them together (default: 1)",
+    )
+    parser.add_argument(
+        "--evaluation-session",
+        action="store_true",
+        help="Evaluate each batch in forked children of long-lived sandbox workers",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue a run in --output, skipping tasks with checkpoints",
+    )
     args = parser.parse_args(argv)
     tasks = [get_task(task_id) for task_id in args.task_ids] if args.task_ids else None
-    sandbox_runner: SandboxRunner = (
-        ModalSandboxRunner(args.modal_app)
-        if args.sandbox == "modal"
-        else DockerSandboxRunner()
-    )
+    sandbox_runner = build_sandbox_runner(args.sandbox, modal_app=args.modal_app)
     report = ZeroShotBaselineRunner(
         OpenAISolutionGenerator(),
         args.model,
@@ -243,7 +537,10 @@ def main(argv: Sequence[str] | None = None) -> None:
         sandbox_runner,
         max_consecutive_failures=args.max_consecutive_failures,
         finish_remaining_threshold=args.finish_remaining_threshold,
-    ).run(tasks)
+        concurrency=args.concurrency,
+        evaluation_batch_size=args.evaluation_batch_size,
+        evaluation_session=args.evaluation_session,
+    ).run(tasks, resume_run_id=args.resume)
     print(report.model_dump_json(indent=2))
 
 
@@ -7,7 +7,7 @@ from pathlib import Path
 
 from backend.config import Settings
 from backend.pipeline import DevelopmentCrew
-from backend.sandbox import DockerSandboxRunner, ModalSandboxRunner, SandboxRunner
+from backend.sandbox import build_sandbox_runner
 
 from .baseline import ZeroShotBaselineRunner, _extract_code
 from .catalog import get_task
@@ -57,9 +57,9 @@ def main(argv: Sequence[str] | None = None) -> None:
     )
     parser.add_argument(
         "--sandbox",
-        choices=("docker", "modal"),
+        choices=("docker", "modal", "local"),
         default="docker",
-        help="Isolated execution backend (default: docker)",
+        help="Isolated execution backend; local is for trusted hosts (default: docker)",
     )
     parser.add_argument(
         "--modal-app",
@@ -78,6 +78,28 @@ def main(argv: Sequence[str] | None = None) -> None:
         default=3,
         help="Ignore the failure guard when this many or fewer tasks remain",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of tasks to generate and evaluate at once (default: 1)",
+    )
+    parser.add_argument(
+        "--evaluation-batch-size",
+        type=int,
+        default=1,
+        help="Generate this many candidates, then evaluate them together (default: 1)",
+    )
+    parser.add_argument(
+        "--evaluation-session",
+        action="store_true",
+        help="Evaluate each batch in forked children of long-lived sandbox workers",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue a run in --output, skipping tasks with checkpoints",
+    )
     args = parser.parse_args(argv)
 
     runtime_directory = (args.output / ".runtime").resolve()
@@ -97,10 +119,8 @@ def main(argv: Sequence[str] | None = None) -> None:
         }
     )
     tasks = [get_task(task_id) for task_id in args.task_ids] if args.task_ids else None
-    sandbox_runner: SandboxRunner = (
-        ModalSandboxRunner(args.modal_app)
-        if args.sandbox == "modal"
-        else DockerSandboxRunner(settings.docker_sandbox_image)
+    sandbox_runner = build_sandbox_runner(
+        args.sandbox, settings.docker_sandbox_image, args.modal_app
     )
     label = f"digital-forge:{model_name}"
     report = ZeroShotBaselineRunner(
@@ -110,7 +130,10 @@ def main(argv: Sequence[str] | None = None) -> None:
         sandbox_runner,
         max_consecutive_failures=args.max_consecutive_failures,
         finish_remaining_threshold=args.finish_remaining_threshold,
-    ).run(tasks)
+        concurrency=args.concurrency,
+        evaluation_batch_size=args.evaluation_batch_size,
+        evaluation_session=args.evaluation_session,
+    ).run(tasks, resume_run_id=args.resume)
     print(report.model_dump_json(indent=2))
 
 
@@ -1,23 +1,31 @@
 """Host-side hidden-test evaluation backed by an isolated sandbox."""
 
 import json
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from backend.sandbox import (
+    DEFAULT_BATCH_PARALLELISM,
+    MAX_SANDBOX_OUTPUT_CHARACTERS,
     DockerSandboxRunner,
     SandboxFile,
     SandboxLimits,
     SandboxRequest,
+    SandboxResult,
     SandboxRunner,
+    run_sandbox_batch,
 )
 
 from .hidden_cases import HIDDEN_CASES, to_jsonable
 from .models import BenchmarkTask, EvaluationResult
 
 WORKER_PATH = Path(__file__).with_name("_worker.py")
+SESSION_WORKER_PATH = Path(__file__).with_name("_session_worker.py")
+SESSION_OVERHEAD_SECONDS = 2.0
+MAX_SESSION_SECONDS = 60.0
 
 
 class _CaseOutput(BaseModel):
@@ -34,37 +42,211 @@ class _WorkerOutput(BaseModel):
     import_error: str | None = None
 
 
+class _SessionJobOutput(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    index: int = Field(ge=0)
+    timed_out: bool
+    exit_code: int
+    duration_seconds: float
+    output: str = ""
+
+
 def evaluate_candidate(
     task: BenchmarkTask,
     candidate_path: Path,
     sandbox_runner: SandboxRunner | None = None,
 ) -> EvaluationResult:
-    cases = HIDDEN_CASES[task.id]
     runner = sandbox_runner or DockerSandboxRunner()
-    execution = runner.run(
-        SandboxRequest(
-            files=(
-                SandboxFile(
-                    path="candidate.py",
-                    content=candidate_path.read_text(encoding="utf-8"),
-                ),
-                SandboxFile(
-                    path="worker.py",
-                    content=WORKER_PATH.read_text(encoding="utf-8"),
-                ),
+    execution = runner.run(_evaluation_request(task, candidate_path))
+    return _evaluation_result(task, execution)
+
+
+def evaluate_candidates(
+    candidates: Sequence[tuple[BenchmarkTask, Path]],
+    sandbox_runner: SandboxRunner | None = None,
+    *,
+    max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+) -> tuple[EvaluationResult, ...]:
+    """Evaluate many candidates, sharing sandbox sessions where the runner can."""
+    runner = sandbox_runner or DockerSandboxRunner()
+    executions = run_sandbox_batch(
+        runner,
+        [_evaluation_request(task, path) for task, path in candidates],
+        max_parallel=max_parallel,
+    )
+    return tuple(
+        _evaluation_result(task, execution)
+        for (task, _), execution in zip(candidates, executions, strict=True)
+    )
+
+
+def evaluate_candidates_in_session(
+    candidates: Sequence[tuple[BenchmarkTask, Path]],
+    sandbox_runner: SandboxRunner | None = None,
+    *,
+    max_parallel: int = DEFAULT_BATCH_PARALLELISM,
+) -> tuple[EvaluationResult, ...]:
+    """Evaluate candidates in forked children of a few long-lived workers.
+
+    Candidates are packed into sessions whose summed time limits fit one sandbox
+    wall-time budget, so most candidates cost a fork instead of a sandbox start.
+    Each job's output is capped like a one-shot run's; when several large outputs
+    still overflow the session's stdout, the candidates that lost their result
+    line are evaluated again one sandbox each.
+    """
+    runner = sandbox_runner or DockerSandboxRunner()
+    sessions = _session_groups(candidates)
+    executions = run_sandbox_batch(
+        runner,
+        [_session_request(session) for session in sessions],
+        max_parallel=max_parallel,
+    )
+    job_executions: list[SandboxResult | None] = []
+    for session, execution in zip(sessions, executions, strict=True):
+        outputs = _session_outputs(execution.stdout)
+        for index in range(len(session)):
+            output = outputs.get(index)
+            if output is not None:
+                job_executions.append(_session_job_execution(output))
+            elif _session_overflowed(execution):
+                job_executions.append(None)
+            else:
+                job_executions.append(_session_failure(execution))
+    flat = [candidate for session in sessions for candidate in session]
+    retried = [
+        candidate
+        for candidate, job in zip(flat, job_executions, strict=True)
+        if job is None
+    ]
+    retried_executions = iter(
+        run_sandbox_batch(
+            runner,
+            [_evaluation_request(task, path) for task, path in retried],
+            max_parallel=max_parallel,
+        )
+        if retried
+        else ()
+    )
+    return tuple(
+        _evaluation_result(task, job if job is not None else next(retried_executions))
+        for (task, _), job in zip(flat, job_executions, strict=True)
+    )
+
+
+def _session_groups(
+    candidates: Sequence[tuple[BenchmarkTask, Path]],
+) -> list[list[tuple[BenchmarkTask, Path]]]:
+    sessions: list[list[tuple[BenchmarkTask, Path]]] = []
+    budget = MAX_SESSION_SECONDS - SESSION_OVERHEAD_SECONDS
+    used = budget
+    for task, path in candidates:
+        if used + task.time_limit_seconds > budget:
+            sessions.append([])
+            used = 0.0
+        sessions[-1].append((task, path))
+        used += task.time_limit_seconds
+    return sessions
+
+
+def _session_request(session: Sequence[tuple[BenchmarkTask, Path]]) -> SandboxRequest:
+    frames: list[str] = []
+    for task, path in session:
+        payload = json.dumps(
+            {
+                "candidate": path.read_text(encoding="utf-8"),
+                "function": task.function_name,
+                "inputs": [to_jsonable(case.args) for case in HIDDEN_CASES[task.id]],
+                "time_limit_seconds": task.time_limit_seconds,
+                "max_output_characters": MAX_SANDBOX_OUTPUT_CHARACTERS,
+            }
+        )
+        frames.append(f"{len(payload.encode('utf-8'))}\n{payload}")
+    return SandboxRequest(
+        files=(
+            SandboxFile(
+                path="session_worker.py",
+                content=SESSION_WORKER_PATH.read_text(encoding="utf-8"),
             ),
-            command=(
-                "python",
-                "-I",
-                "-B",
-                "/workspace/worker.py",
-                "/workspace/candidate.py",
-                task.function_name,
+        ),
+        command=("python", "-I", "-B", "/workspace/session_worker.py"),
+        stdin="".join(frames),
+        limits=SandboxLimits(
+            wall_time_seconds=SESSION_OVERHEAD_SECONDS
+            + sum(task.time_limit_seconds for task, _ in session)
+        ),
+    )
+
+
+def _session_outputs(stdout: str) -> dict[int, _SessionJobOutput]:
+    outputs: dict[int, _SessionJobOutput] = {}
+    for line in stdout.splitlines():
+        try:
+            output = _SessionJobOutput.model_validate_json(line)
+        except ValueError:
+            continue
+        outputs[output.index] = output
+    return outputs
+
+
+def _session_job_execution(output: _SessionJobOutput) -> SandboxResult:
+    return SandboxResult(
+        stdout=output.output,
+        exit_code=output.exit_code,
+        timed_out=output.timed_out,
+        duration_seconds=output.duration_seconds,
+    )
+
+
+def _session_overflowed(execution: SandboxResult) -> bool:
+    """A clean exit that lost result lines means stdout hit the output bound."""
+    return (
+        execution.error is None and not execution.timed_out and execution.exit_code == 0
+    )
+
+
+def _session_failure(execution: SandboxResult) -> SandboxResult:
+    if execution.error:
+        reason = execution.error
+    elif execution.timed_out:
+        reason = "evaluation session timed out"
+    else:
+        reason = f"evaluation session exited with {execution.exit_code}"
+    return SandboxResult(
+        exit_code=execution.exit_code, duration_seconds=0.0, error=reason
+    )
+
+
+def _evaluation_request(task: BenchmarkTask, candidate_path: Path) -> SandboxRequest:
+    cases = HIDDEN_CASES[task.id]
+    return SandboxRequest(
+        files=(
+            SandboxFile(
+                path="candidate.py",
+                content=candidate_path.read_text(encoding="utf-8"),
             ),
-            stdin=json.dumps([to_jsonable(case.args) for case in cases]),
-            limits=SandboxLimits(wall_time_seconds=task.time_limit_seconds),
-        )
+            SandboxFile(
+                path="worker.py",
+                content=WORKER_PATH.read_text(encoding="utf-8"),
+            ),
+        ),
+        command=(
+            "python",
+            "-I",
+            "-B",
+            "/workspace/worker.py",
+            "/workspace/candidate.py",
+            task.function_name,
+        ),
+        stdin=json.dumps([to_jsonable(case.args) for case in cases]),
+        limits=SandboxLimits(wall_time_seconds=task.time_limit_seconds),
     )
+
+
+def _evaluation_result(
+    task: BenchmarkTask, execution: SandboxResult
+) -> EvaluationResult:
+    cases = HIDDEN_CASES[task.id]
     if execution.timed_out:
         return EvaluationResult(
             passed=False,
@@ -1,5 +1,7 @@
 """Typed benchmark tasks, executions, and result artifacts."""
 
+import os
+import tempfile
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
@@ -61,8 +63,23 @@ class TaskResult(BaseModel):
     error: str | None = None
 
     def write(self, path: Path) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        write_atomic(path, self.model_dump_json(indent=2))
+
+
+class BenchmarkRunManifest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    schema_version: str = "1.1.0"
+    run_id: str
+    benchmark_version: str
+    evaluator_sha256: str
+    model: str
+    sandbox_backend: str
+    started_at: datetime
+    task_ids: tuple[str, ...] = ()
+
+    def write(self, path: Path) -> None:
+        write_atomic(path, self.model_dump_json(indent=2))
 
 
 class BenchmarkReport(BaseModel):
@@ -81,8 +98,7 @@ class BenchmarkReport(BaseModel):
     results: tuple[TaskResult, ...]
 
     def write(self, path: Path) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        write_atomic(path, self.model_dump_json(indent=2))
 
 
 class BenchmarkInterruptedReport(BaseModel):
@@ -109,9 +125,23 @@ class BenchmarkInterruptedReport(BaseModel):
     results: tuple[TaskResult, ...]
 
     def write(self, path: Path) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        write_atomic(path, self.model_dump_json(indent=2))
 
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Replace a JSON artifact so readers never observe a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as handle:
+        handle.write(content)
+    try:
+        os.chmod(handle.name, 0o644)
+        os.replace(handle.name, path)
+    except OSError:
+        os.unlink(handle.name)
+        raise
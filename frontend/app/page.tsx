@@ -7,7 +7,7 @@ import { CodePanel } from "@/components/CodePanel";
 import {
   cancelRun,
   checkHealth,
-  getRun,
+  pollRun,
   RunAgent,
   RunSnapshot,
   RunStage,
@@ -201,10 +201,12 @@ export default function ForgePage() {
     const activeRunId = runId;
     const controller = new AbortController();
     let timer: number | undefined;
+    let latest: RunSnapshot | null = null;
 
     async function poll() {
       try {
-        const snapshot = await getRun(activeRunId, controller.signal);
+        const snapshot = await pollRun(activeRunId, latest, controller.signal);
+        latest = snapshot;
         setRun(snapshot);
         setConnectionIssue(false);
         if (!["completed", "failed", "cancelled"].includes(snapshot.status)) {
@@ -471,6 +473,7 @@ function RunWorkspace({
     run.cancel_requested && !terminal ? "Cancellation requested" : run.status;
   const candidateAttempts = candidateAttemptsUsed(run);
   const activeIndex = activePipelineIndex(run);
+  const concurrentAgents = run.active_agents ?? [];
   const pipelineTitle =
     run.status === "failed" && !run.error
       ? "Needs manual review"
@@ -558,7 +561,11 @@ function RunWorkspace({
         </div>
         <div className="pipeline-grid">
           {PIPELINE.map((item, index) => {
-            const isRunning = !terminal && activeIndex === index;
+            const isRunning =
+              !terminal &&
+              (activeIndex === index ||
+                (concurrentAgents.length > 1 &&
+                  concurrentAgents.includes(item.activeAgent)));
             const isFailed =
               (run.status === "failed" || unresolvedTestFailure) &&
               (pipelineFailed
@@ -641,7 +648,11 @@ function Overview({ run }: { run: RunSnapshot }) {
     <div className="overview-grid">
       <article className="detail-card overview-panel">
         <span className="section-kicker">Current activity</span>
-        <h3>{run.events.at(-1)?.message ?? "The run is queued."}</h3>
+        <h3>
+          {run.queue_position
+            ? `The run is queued at position ${run.queue_position}.`
+            : (run.events.at(-1)?.message ?? "The run is queued.")}
+        </h3>
         <div className="event-list custom-scroll">
           {[...run.events].reverse().map((event, index) => (
             <div className="event-row" key={`${event.created_at}-${index}`}>
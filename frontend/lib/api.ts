@@ -68,15 +68,24 @@ export interface RetrievalEvent {
   results: RetrievedSource[];
 }
 
+export interface SandboxCacheStats {
+  hits: number;
+  misses: number;
+  seconds_saved: number;
+}
+
 export interface RunSnapshot {
   run_id: string;
+  version: number;
   request: string;
   status: RunStatus;
   stage: RunStage;
   active_agent?: RunAgent | null;
+  active_agents?: RunAgent[];
   attempts_used: number;
   max_attempts: number;
   cancel_requested: boolean;
+  queue_position?: number | null;
   created_at: string;
   updated_at: string;
   technical_brief: string | null;
@@ -87,9 +96,20 @@ export interface RunSnapshot {
   events: RunEvent[];
   artifacts: RunArtifact[];
   retrieval_events: RetrievalEvent[];
+  sandbox_cache: SandboxCacheStats;
   error: string | null;
 }
 
+type AppendOnlyRunField = "events" | "attempts" | "retrieval_events";
+
+export interface RunSnapshotDelta {
+  run_id: string;
+  version: number;
+  since: number;
+  changes: Partial<RunSnapshot>;
+  appended: Partial<Pick<RunSnapshot, AppendOnlyRunField>>;
+}
+
 export interface BenchmarkTaskResult {
   task_id: string;
   task_version: string;
@@ -116,17 +136,19 @@ export interface BenchmarkReport {
   results: BenchmarkTaskResult[];
 }
 
+async function requestFailure(response: Response): Promise<Error> {
+  const payload = (await response.json().catch(() => null)) as {
+    detail?: string;
+  } | null;
+  return new Error(payload?.detail ?? `Request failed with ${response.status}.`);
+}
+
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
   const response = await fetch(`${BACKEND_URL}${path}`, {
     ...init,
     headers: { "Content-Type": "application/json", ...init?.headers },
   });
-  if (!response.ok) {
-    const payload = (await response.json().catch(() => null)) as {
-      detail?: string;
-    } | null;
-    throw new Error(payload?.detail ?? `Request failed with ${response.status}.`);
-  }
+  if (!response.ok) throw await requestFailure(response);
   return (await response.json()) as T;
 }
 
@@ -145,6 +167,46 @@ export function getRun(runId: string, signal?: AbortSignal) {
   return request<RunSnapshot>(`/runs/${runId}`, { signal });
 }
 
+export function applyRunDelta(
+  snapshot: RunSnapshot,
+  delta: RunSnapshotDelta,
+): RunSnapshot {
+  const next: RunSnapshot = {
+    ...snapshot,
+    ...delta.changes,
+    version: delta.version,
+  };
+  if (delta.appended.events) {
+    next.events = [...next.events, ...delta.appended.events];
+  }
+  if (delta.appended.attempts) {
+    next.attempts = [...next.attempts, ...delta.appended.attempts];
+  }
+  if (delta.appended.retrieval_events) {
+    next.retrieval_events = [
+      ...next.retrieval_events,
+      ...delta.appended.retrieval_events,
+    ];
+  }
+  return next;
+}
+
+/** Fetch only what changed since `current`, falling back to a full snapshot. */
+export async function pollRun(
+  runId: string,
+  current: RunSnapshot | null,
+  signal?: AbortSignal,
+): Promise<RunSnapshot> {
+  if (!current || current.run_id !== runId) return getRun(runId, signal);
+  const response = await fetch(
+    `${BACKEND_URL}/runs/${runId}?since=${current.version}`,
+    { signal },
+  );
+  if (response.status === 304) return current;
+  if (!response.ok) throw await requestFailure(response);
+  return applyRunDelta(current, (await response.json()) as RunSnapshotDelta);
+}
+
 export function cancelRun(runId: string) {
   return request<RunSnapshot>(`/runs/${runId}/cancel`, { method: "POST" });
 }
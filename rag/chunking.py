@@ -0,0 +1,44 @@
+"""Source reading and section splitting, importable by pool workers cheaply."""
+
+import hashlib
+from pathlib import Path
+
+from .models import DocumentationChunk, DocumentationSource
+
+
+def read_source(
+    source: DocumentationSource, manifest_path: Path, *, split: bool = False
+) -> tuple[DocumentationChunk, ...]:
+    """Verify a source against its manifest digest and optionally split it."""
+    raw = (manifest_path.parent / source.content_path).read_bytes()
+    if hashlib.sha256(raw).hexdigest() != source.sha256:
+        raise ValueError(f"Documentation source digest mismatch: {source.id}")
+    if not split:
+        return ()
+    return tuple(
+        DocumentationChunk(
+            id=f"{source.id}:{index:02d}",
+            source=source,
+            heading=heading,
+            content=section,
+            chunk_index=index,
+        )
+        for index, (heading, section) in enumerate(split_sections(raw.decode("utf-8")))
+    )
+
+
+def split_sections(content: str) -> tuple[tuple[str, str], ...]:
+    heading = "Overview"
+    body: list[str] = []
+    sections: list[tuple[str, str]] = []
+    for line in content.splitlines():
+        if line.startswith("## "):
+            if body:
+                sections.append((heading, "\n".join(body).strip()))
+            heading = line.removeprefix("## ").strip()
+            body = []
+        elif not line.startswith("# "):
+            body.append(line)
+    if body:
+        sections.append((heading, "\n".join(body).strip()))
+    return tuple((title, section) for title, section in sections if section)
@@ -11,7 +11,7 @@ from uuid import uuid4
 from openai import OpenAI
 from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
-from rag.index import DEFAULT_INDEX_PATH, ChromaRetriever
+from rag.index import DEFAULT_INDEX_PATH, DocumentationRetriever, get_retriever
 from rag.models import RetrievedSource
 
 DEFAULT_CASES_PATH = Path(__file__).with_name("cases") / "v1.json"
@@ -57,11 +57,13 @@ class ApiEvaluationResult(BaseModel):
 class ApiEvaluationReport(BaseModel):
     model_config = ConfigDict(frozen=True)
 
-    schema_version: str = "1.0.0"
+    schema_version: str = "1.1.0"
     evaluation_version: str = EVALUATION_VERSION
     corpus_version: str
     prompt_version: str = PROMPT_VERSION
     configuration: str
+    retrieval_ranking: str | None = None
+    result_limit: int | None = Field(default=None, ge=1, le=5)
     run_id: str
     model: str
     started_at: datetime
@@ -110,18 +112,20 @@ class OpenAIAnswerGenerator:
 class RagEvaluationRunner:
     def __init__(
         self,
-        retriever: ChromaRetriever,
+        retriever: DocumentationRetriever,
         generator: AnswerGenerator,
         model: str,
         output_root: Path,
         *,
         use_retrieval: bool,
+        result_limit: int = 3,
     ):
         self.retriever = retriever
         self.generator = generator
         self.model = model
         self.output_root = output_root
         self.use_retrieval = use_retrieval
+        self.result_limit = result_limit
 
     def run(
         self, cases: Sequence[ApiEvaluationCase] | None = None
@@ -133,6 +137,8 @@ class RagEvaluationRunner:
         report = ApiEvaluationReport(
             corpus_version=self.retriever.metadata.corpus_version,
             configuration="rag" if self.use_retrieval else "no_rag",
+            retrieval_ranking=self.retriever.ranking if self.use_retrieval else None,
+            result_limit=self.result_limit if self.use_retrieval else None,
             run_id=run_id,
             model=self.model,
             started_at=started_at,
@@ -152,7 +158,7 @@ class RagEvaluationRunner:
         sources: tuple[RetrievedSource, ...] = ()
         try:
             if self.use_retrieval:
-                sources = self.retriever.retrieve(case.prompt, limit=3)
+                sources = self.retriever.retrieve(case.prompt, limit=self.result_limit)
             context = format_context(sources)
             generated = self.generator.generate(case, context, self.model)
             normalized = generated.text.lower()
@@ -220,14 +226,34 @@ def main(argv: Sequence[str] | None = None) -> None:
     )
     parser.add_argument("--configuration", choices=("rag", "no-rag"), required=True)
     parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH)
+    parser.add_argument(
+        "--backend",
+        choices=("chroma", "matrix"),
+        default="chroma",
+        help="Retrieval engine used for the rag configuration (default: chroma)",
+    )
+    parser.add_argument(
+        "--ranking",
+        choices=("lexical", "rrf", "weighted"),
+        default="lexical",
+        help="Re-ranking; rrf and weighted fuse BM25 and need --backend matrix",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        choices=range(1, 6),
+        default=3,
+        help="Documentation results retrieved per case (default: 3)",
+    )
     parser.add_argument("--output", type=Path, default=Path("rag-evaluation-results"))
     args = parser.parse_args(argv)
     report = RagEvaluationRunner(
-        ChromaRetriever(args.index),
+        get_retriever(args.index, backend=args.backend, ranking=args.ranking),
         OpenAIAnswerGenerator(),
         args.model,
         args.output,
         use_retrieval=args.configuration == "rag",
+        result_limit=args.limit,
     ).run()
     print(report.model_dump_json(indent=2))
 
@@ -2,20 +2,36 @@
 
 import argparse
 import hashlib
+import json
 import math
+import multiprocessing
+import os
 import re
-from collections.abc import Sequence
+import tempfile
+from collections import OrderedDict, deque
+from collections.abc import Collection, Generator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, cast
+from threading import Lock
+from typing import Any, Literal, Protocol, cast
 
 import chromadb
+import numpy as np
+import numpy.typing as npt
 from chromadb.api import ClientAPI
+from chromadb.api.types import Where
 from chromadb.config import Settings as ChromaSettings
 
+from .chunking import read_source
 from .models import (
+    Bm25Statistics,
     DocumentationChunk,
+    DocumentationSource,
     IndexMetadata,
+    LexicalIndex,
+    QueryCacheStats,
     RetrievedSource,
     SourceManifest,
 )
@@ -27,44 +43,81 @@ COLLECTION_NAME = "digital_forge_docs_v1"
 EMBEDDING_DIMENSIONS = 256
 EMBEDDING_VERSION = f"token-hash-v1-{EMBEDDING_DIMENSIONS}"
 INDEX_METADATA_FILE = "index.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+CHUNKS_FILE = "chunks.json"
+LEXICAL_INDEX_FILE = "lexical.json"
 _TOKEN = re.compile(r"[a-z0-9_\.]+")
+RRF_K = 60
+HYBRID_DENSE_WEIGHT = 0.5
+RankingMode = Literal["lexical", "rrf", "weighted"]
+PARALLEL_LOAD_MIN_SOURCES = 32
+UPSERT_BATCH_SIZE = 256
 
 
-def load_manifest(path: Path = DEFAULT_MANIFEST_PATH) -> SourceManifest:
+def load_manifest(
+    path: Path = DEFAULT_MANIFEST_PATH, *, verify: bool = True
+) -> SourceManifest:
+    """Parse the manifest; ``verify=False`` leaves digests to ``iter_chunks``."""
     manifest = SourceManifest.model_validate_json(path.read_text(encoding="utf-8"))
     ids = [source.id for source in manifest.sources]
     if len(ids) != len(set(ids)):
         raise ValueError("Documentation source IDs must be unique.")
-    for source in manifest.sources:
-        content_path = path.parent / source.content_path
-        digest = hashlib.sha256(content_path.read_bytes()).hexdigest()
-        if digest != source.sha256:
-            raise ValueError(f"Documentation source digest mismatch: {source.id}")
+    if verify:
+        for source in manifest.sources:
+            read_source(source, path)
     return manifest
 
 
 def load_chunks(
     manifest: SourceManifest, manifest_path: Path = DEFAULT_MANIFEST_PATH
 ) -> tuple[DocumentationChunk, ...]:
-    chunks: list[DocumentationChunk] = []
-    for source in manifest.sources:
-        content = (manifest_path.parent / source.content_path).read_text(
-            encoding="utf-8"
-        )
-        sections = _split_sections(content)
-        for index, (heading, section) in enumerate(sections):
-            chunks.append(
-                DocumentationChunk(
-                    id=f"{source.id}:{index:02d}",
-                    source=source,
-                    heading=heading,
-                    content=section,
-                    chunk_index=index,
-                )
-            )
+    chunks = tuple(iter_chunks(manifest, manifest_path))
     if not chunks:
         raise ValueError("Documentation corpus produced no chunks.")
-    return tuple(chunks)
+    return chunks
+
+
+def iter_chunks(
+    manifest: SourceManifest,
+    manifest_path: Path = DEFAULT_MANIFEST_PATH,
+    *,
+    skip: Collection[str] = frozenset(),
+    workers: int | None = None,
+) -> Generator[DocumentationChunk, None, None]:
+    """Read, verify, and split each source once, in manifest order.
+
+    Sources listed in ``skip`` are still digest-checked but yield no chunks.
+    Large manifests fan out to a process pool with a bounded number of files
+    in flight so memory does not grow with the corpus.
+    """
+    jobs = [(source, source.id not in skip) for source in manifest.sources]
+    if workers is None:
+        workers = (
+            min(os.cpu_count() or 1, len(jobs))
+            if len(jobs) >= PARALLEL_LOAD_MIN_SOURCES
+            else 1
+        )
+    if workers <= 1:
+        for source, split in jobs:
+            yield from read_source(source, manifest_path, split=split)
+        return
+    # Chroma's client runs background threads, so workers must not be forked
+    # from this process directly; they only import the light chunking module.
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("forkserver")
+    )
+    pending: deque[Future[tuple[DocumentationChunk, ...]]] = deque()
+    try:
+        for source, split in jobs:
+            pending.append(
+                executor.submit(read_source, source, manifest_path, split=split)
+            )
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 
 def embed_text(value: str) -> list[float]:
@@ -72,9 +125,7 @@ def embed_text(value: str) -> list[float]:
     features = tokens + [f"{left}::{right}" for left, right in zip(tokens, tokens[1:])]
     vector = [0.0] * EMBEDDING_DIMENSIONS
     for feature in features:
-        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
-        bucket = int.from_bytes(digest[:4], "big") % EMBEDDING_DIMENSIONS
-        sign = 1.0 if digest[4] & 1 else -1.0
+        bucket, sign = _feature_hash(feature)
         vector[bucket] += sign
     norm = math.sqrt(sum(component * component for component in vector))
     if norm == 0:
@@ -82,82 +133,291 @@ def embed_text(value: str) -> list[float]:
     return [component / norm for component in vector]
 
 
+def embed_texts(values: Sequence[str]) -> npt.NDArray[np.float32]:
+    """Embed many values at once; each row equals ``embed_text`` as float32."""
+    rows: list[int] = []
+    buckets: list[int] = []
+    signs: list[float] = []
+    for row, value in enumerate(values):
+        tokens = _TOKEN.findall(value.lower())
+        for feature in (
+            *tokens,
+            *(f"{left}::{right}" for left, right in zip(tokens, tokens[1:])),
+        ):
+            bucket, sign = _feature_hash(feature)
+            rows.append(row)
+            buckets.append(bucket)
+            signs.append(sign)
+    cells = np.asarray(rows, dtype=np.intp) * EMBEDDING_DIMENSIONS + np.asarray(
+        buckets, dtype=np.intp
+    )
+    counts = (
+        np.bincount(cells, weights=signs, minlength=len(values) * EMBEDDING_DIMENSIONS)
+        .astype(np.float64, copy=False)
+        .reshape(len(values), EMBEDDING_DIMENSIONS)
+    )
+    norms = np.sqrt(np.einsum("ij,ij->i", counts, counts))
+    np.divide(counts, norms[:, np.newaxis], out=counts, where=norms[:, np.newaxis] > 0)
+    return counts.astype(np.float32)
+
+
+@lru_cache(maxsize=65_536)
+def _feature_hash(feature: str) -> tuple[int, float]:
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    bucket = int.from_bytes(digest[:4], "big") % EMBEDDING_DIMENSIONS
+    return bucket, 1.0 if digest[4] & 1 else -1.0
+
+
 def build_index(
     manifest_path: Path = DEFAULT_MANIFEST_PATH,
     index_path: Path = DEFAULT_INDEX_PATH,
+    *,
+    full: bool = False,
 ) -> IndexMetadata:
-    manifest = load_manifest(manifest_path)
-    chunks = load_chunks(manifest, manifest_path)
+    """Re-embed only sources whose recorded digest changed unless ``full``."""
+    manifest = load_manifest(manifest_path, verify=False)
+    digests = {source.id: source_digest(source) for source in manifest.sources}
     index_path.mkdir(parents=True, exist_ok=True)
     client = _client(index_path)
-    if COLLECTION_NAME in {collection.name for collection in client.list_collections()}:
-        client.delete_collection(COLLECTION_NAME)
-    collection = client.create_collection(
-        name=COLLECTION_NAME,
-        embedding_function=None,
-        metadata={
-            "corpus_version": manifest.corpus_version,
-            "embedding_version": EMBEDDING_VERSION,
-        },
-    )
-    embeddings: list[Sequence[float]] = [
-        embed_text(
-            f"{chunk.source.library} {chunk.source.title} {chunk.heading} "
-            f"{chunk.content}"
+    previous = None if full else _previous_build(index_path, client)
+    # Sources are verified while streaming, so a failure can leave the collection
+    # partially written; dropping the metadata forces the next build to be full.
+    (index_path / INDEX_METADATA_FILE).unlink(missing_ok=True)
+    if previous is None:
+        if COLLECTION_NAME in {
+            collection.name for collection in client.list_collections()
+        }:
+            client.delete_collection(COLLECTION_NAME)
+        collection = client.create_collection(
+            name=COLLECTION_NAME,
+            embedding_function=None,
+            metadata={
+                "corpus_version": manifest.corpus_version,
+                "embedding_version": EMBEDDING_VERSION,
+            },
+        )
+        reused: dict[str, tuple[DocumentationChunk, npt.NDArray[np.float32]]] = {}
+    else:
+        metadata, reused = previous
+        collection = client.get_collection(COLLECTION_NAME, embedding_function=None)
+        stale = sorted(
+            source_id
+            for source_id, digest in metadata.source_digests.items()
+            if digests.get(source_id) != digest
         )
-        for chunk in chunks
-    ]
-    collection.upsert(
-        ids=[chunk.id for chunk in chunks],
-        embeddings=embeddings,
-        documents=[chunk.content for chunk in chunks],
-        metadatas=[
-            {
-                "source_id": chunk.source.id,
-                "library": chunk.source.library,
-                "library_version": chunk.source.library_version,
-                "document_version": chunk.source.document_version,
-                "title": chunk.source.title,
-                "heading": chunk.heading,
-                "source_url": chunk.source.source_url,
-                "chunk_index": chunk.chunk_index,
+        if stale:
+            collection.delete(where=cast(Where, {"source_id": {"$in": stale}}))
+        sources = {source.id: source for source in manifest.sources}
+        reused = {
+            chunk_id: (chunk.model_copy(update={"source": sources[source_id]}), row)
+            for chunk_id, (chunk, row) in reused.items()
+            if (source_id := chunk.source.id) not in stale and source_id in sources
+        }
+        collection.modify(
+            metadata={
+                "corpus_version": manifest.corpus_version,
+                "embedding_version": EMBEDDING_VERSION,
             }
-            for chunk in chunks
-        ],
+        )
+
+    # Chunks are written to the matrix files and the lexical index as each batch
+    # arrives; reused chunks are merged in at their source's manifest position.
+    order = {source.id: position for position, source in enumerate(manifest.sources)}
+    pending_reused = deque(
+        sorted(
+            reused.values(),
+            key=lambda item: (order[item[0].source.id], item[0].chunk_index),
+        )
+    )
+    stream = iter_chunks(
+        manifest,
+        manifest_path,
+        skip={chunk.source.id for chunk, _ in reused.values()},
+    )
+    writer = _MatrixWriter(index_path)
+    lexical = _LexicalIndexBuilder()
+    try:
+        while batch := tuple(islice(stream, UPSERT_BATCH_SIZE)):
+            batch_embeddings = embed_texts([_embedding_text(chunk) for chunk in batch])
+            collection.upsert(
+                ids=[chunk.id for chunk in batch],
+                embeddings=batch_embeddings,
+                documents=[chunk.content for chunk in batch],
+                metadatas=[_chunk_metadata(chunk) for chunk in batch],
+            )
+            for chunk, row in zip(batch, batch_embeddings, strict=True):
+                position = order[chunk.source.id]
+                while (
+                    pending_reused and order[pending_reused[0][0].source.id] < position
+                ):
+                    reused_chunk, reused_row = pending_reused.popleft()
+                    writer.add(reused_chunk, reused_row)
+                    lexical.add(reused_chunk)
+                writer.add(chunk, row)
+                lexical.add(chunk)
+        for reused_chunk, reused_row in pending_reused:
+            writer.add(reused_chunk, reused_row)
+            lexical.add(reused_chunk)
+        if not writer.count:
+            raise ValueError("Documentation corpus produced no chunks.")
+        writer.commit()
+    finally:
+        writer.discard()
+    _write_atomic(
+        index_path / LEXICAL_INDEX_FILE,
+        lexical.build().model_dump_json(),
     )
     metadata = IndexMetadata(
         corpus_version=manifest.corpus_version,
         collection_name=COLLECTION_NAME,
         embedding_version=EMBEDDING_VERSION,
         manifest_sha256=hashlib.sha256(manifest_path.read_bytes()).hexdigest(),
-        chunk_count=len(chunks),
-    )
-    (index_path / INDEX_METADATA_FILE).write_text(
-        metadata.model_dump_json(indent=2), encoding="utf-8"
+        chunk_count=writer.count,
+        source_digests=digests,
     )
+    _write_atomic(index_path / INDEX_METADATA_FILE, metadata.model_dump_json(indent=2))
     return metadata
 
 
+def source_digest(source: DocumentationSource) -> str:
+    """Fingerprint the content digest and every field copied into chunk metadata."""
+    return hashlib.sha256(source.model_dump_json().encode("utf-8")).hexdigest()
+
+
+class _MatrixWriter:
+    """Append chunk payloads and embedding rows to temporary files as they arrive.
+
+    The row count is only known at the end, so rows are spooled raw and copied
+    into the ``.npy`` file through a memory map in fixed-size slices.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        self.count = 0
+        self._chunks = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=index_path, suffix=".tmp", delete=False
+        )
+        self._rows = tempfile.NamedTemporaryFile(
+            dir=index_path, suffix=".rows", delete=False
+        )
+        self._matrix_path = Path(self._rows.name).with_suffix(".npy")
+        self._chunks.write("[")
+
+    def add(self, chunk: DocumentationChunk, row: npt.NDArray[np.float32]) -> None:
+        payload = {
+            "id": chunk.id,
+            "document": chunk.content,
+            "metadata": _chunk_metadata(chunk),
+        }
+        separator = ",\n" if self.count else "\n"
+        self._chunks.write(separator + _indent(json.dumps(payload, indent=2)))
+        self._rows.write(np.ascontiguousarray(row, dtype=np.float32).tobytes())
+        self.count += 1
+
+    def commit(self) -> None:
+        """Publish ``chunks.json`` and ``embeddings.npy`` for ``MatrixRetriever``."""
+        self._chunks.write("\n]")
+        self._chunks.close()
+        self._rows.close()
+        shape = (self.count, EMBEDDING_DIMENSIONS)
+        matrix = np.lib.format.open_memmap(
+            self._matrix_path, mode="w+", dtype=np.float32, shape=shape
+        )
+        rows = np.memmap(self._rows.name, dtype=np.float32, mode="r", shape=shape)
+        for start in range(0, self.count, UPSERT_BATCH_SIZE):
+            matrix[start : start + UPSERT_BATCH_SIZE] = rows[
+                start : start + UPSERT_BATCH_SIZE
+            ]
+        matrix.flush()
+        del matrix, rows
+        for temporary, target in (
+            (self._matrix_path, EMBEDDINGS_FILE),
+            (Path(self._chunks.name), CHUNKS_FILE),
+        ):
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, self.index_path / target)
+
+    def discard(self) -> None:
+        """Remove whatever temporary files ``commit`` did not publish."""
+        self._chunks.close()
+        self._rows.close()
+        for path in (self._chunks.name, self._rows.name, self._matrix_path):
+            Path(path).unlink(missing_ok=True)
+
+
+def _indent(text: str) -> str:
+    return "\n".join(f"  {line}" for line in text.splitlines())
+
+
+def build_lexical_index(chunks: Sequence[DocumentationChunk]) -> LexicalIndex:
+    """Tokenize each chunk once so re-ranking only intersects cached sets."""
+    builder = _LexicalIndexBuilder()
+    for chunk in chunks:
+        builder.add(chunk)
+    return builder.build()
+
+
+class _LexicalIndexBuilder:
+    """Accumulate the lexical index one chunk at a time, keeping only tokens."""
+
+    def __init__(self) -> None:
+        self._chunk_tokens: dict[str, tuple[str, ...]] = {}
+        self._chunk_libraries: dict[str, str] = {}
+        self._postings: dict[str, list[str]] = {}
+        self._term_frequencies: dict[str, dict[str, int]] = {}
+        self._chunk_lengths: dict[str, int] = {}
+
+    def add(self, chunk: DocumentationChunk) -> None:
+        tokens = tuple(
+            sorted(
+                set(_TOKEN.findall(f"{_chunk_metadata(chunk)} {chunk.content}".lower()))
+            )
+        )
+        self._chunk_tokens[chunk.id] = tokens
+        self._chunk_libraries[chunk.id] = chunk.source.library
+        for token in tokens:
+            self._postings.setdefault(token, []).append(chunk.id)
+        terms = _TOKEN.findall(_embedding_text(chunk).lower())
+        self._chunk_lengths[chunk.id] = len(terms)
+        for term in terms:
+            frequencies = self._term_frequencies.setdefault(term, {})
+            frequencies[chunk.id] = frequencies.get(chunk.id, 0) + 1
+
+    def build(self) -> LexicalIndex:
+        return LexicalIndex(
+            chunk_tokens=self._chunk_tokens,
+            chunk_libraries=self._chunk_libraries,
+            postings={
+                token: tuple(ids) for token, ids in sorted(self._postings.items())
+            },
+            bm25=Bm25Statistics(
+                average_length=max(
+                    1.0,
+                    sum(self._chunk_lengths.values()) / len(self._chunk_lengths),
+                ),
+                chunk_lengths=self._chunk_lengths,
+                term_frequencies=dict(sorted(self._term_frequencies.items())),
+            ),
+        )
+
+
+class DocumentationRetriever(Protocol):
+    metadata: IndexMetadata
+    ranking: RankingMode
+
+    def retrieve(self, query: str, limit: int = 3) -> tuple[RetrievedSource, ...]: ...
+
+
 class ChromaRetriever:
+    ranking: RankingMode = "lexical"
+
     def __init__(
         self,
         index_path: Path = DEFAULT_INDEX_PATH,
         manifest_path: Path = DEFAULT_MANIFEST_PATH,
     ):
-        metadata_path = index_path / INDEX_METADATA_FILE
-        if not metadata_path.is_file():
-            raise FileNotFoundError(f"RAG index metadata not found: {metadata_path}")
-        self.metadata = IndexMetadata.model_validate_json(
-            metadata_path.read_text(encoding="utf-8")
-        )
-        manifest_digest = hashlib.sha256(manifest_path.read_bytes()).hexdigest()
-        if manifest_digest != self.metadata.manifest_sha256:
-            raise ValueError("RAG index manifest does not match its metadata.")
-        manifest = load_manifest(manifest_path)
-        if manifest.corpus_version != self.metadata.corpus_version:
-            raise ValueError("RAG index corpus version does not match its manifest.")
-        if self.metadata.embedding_version != EMBEDDING_VERSION:
-            raise ValueError("RAG index embedding version is incompatible.")
+        self.metadata = _load_index_metadata(index_path, manifest_path)
+        self._lexical = _LexicalRanker.load(index_path, self.metadata)
         self._collection = _client(index_path).get_collection(
             self.metadata.collection_name, embedding_function=None
         )
@@ -165,55 +425,187 @@ class ChromaRetriever:
             raise ValueError("RAG index chunk count does not match its metadata.")
 
     def retrieve(self, query: str, limit: int = 3) -> tuple[RetrievedSource, ...]:
-        normalized = query.strip()
-        if not normalized:
-            raise ValueError("Documentation query cannot be empty.")
-        if not 1 <= limit <= 5:
-            raise ValueError("Documentation result limit must be between 1 and 5.")
-        candidate_count = min(self.metadata.chunk_count, max(limit * 4, limit))
-        query_embedding: Sequence[float] = embed_text(normalized)
+        normalized = _validate_query(query, limit)
+        query_tokens = frozenset(_TOKEN.findall(normalized.lower()))
+        libraries = self._lexical.mentioned_libraries(query_tokens)
+        pool_size = (
+            self._lexical.chunk_count(libraries)
+            if libraries
+            else self.metadata.chunk_count
+        )
+        where = (
+            cast(Where, {"library": {"$in": list(libraries)}}) if libraries else None
+        )
         raw = self._collection.query(
-            query_embeddings=[query_embedding],
-            n_results=candidate_count,
+            query_embeddings=embed_texts([normalized]),
+            n_results=min(pool_size, max(limit * 4, limit)),
+            where=where,
             include=["documents", "metadatas", "distances"],
         )
         ids = raw["ids"][0]
         documents = cast(list[list[str]], raw["documents"])[0]
         metadatas = cast(list[list[dict[str, Any]]], raw["metadatas"])[0]
         distances = cast(list[list[float]], raw["distances"])[0]
-        candidates = tuple(zip(ids, documents, metadatas, distances, strict=True))
-        query_tokens = set(_TOKEN.findall(normalized.lower()))
-        mentioned_libraries = {
-            str(metadata["library"])
-            for _, _, metadata, _ in candidates
-            if _library_is_mentioned(query_tokens, str(metadata["library"]))
-        }
-        relevant = tuple(
-            item
-            for item in candidates
-            if (
-                str(item[2]["library"]) in mentioned_libraries
-                if mentioned_libraries
-                else _lexical_score(normalized, f"{item[2]} {item[1]}") > 0
-            )
+        return self._lexical.rank(
+            query_tokens,
+            limit,
+            tuple(zip(ids, documents, metadatas, distances, strict=True)),
+            filtered_by_library=bool(libraries),
         )
-        ranked = sorted(
-            relevant,
-            key=lambda item: (
-                -_lexical_score(normalized, f"{item[2]} {item[1]}"),
-                item[3],
-                item[0],
+
+
+class MatrixRetriever:
+    """Exact top-k search over the embedding matrix written by ``build_index``."""
+
+    def __init__(
+        self,
+        index_path: Path = DEFAULT_INDEX_PATH,
+        manifest_path: Path = DEFAULT_MANIFEST_PATH,
+        *,
+        memory_map: bool = True,
+        ranking: RankingMode = "lexical",
+    ):
+        self.ranking = ranking
+        self.metadata = _load_index_metadata(index_path, manifest_path)
+        embeddings_path = index_path / EMBEDDINGS_FILE
+        chunks_path = index_path / CHUNKS_FILE
+        if not embeddings_path.is_file() or not chunks_path.is_file():
+            raise FileNotFoundError(f"RAG embedding matrix not found: {index_path}")
+        self._embeddings: npt.NDArray[np.float32] = np.load(
+            embeddings_path, mmap_mode="r" if memory_map else None
+        )
+        chunks = json.loads(chunks_path.read_text(encoding="utf-8"))
+        if len(chunks) != self.metadata.chunk_count or self._embeddings.shape != (
+            len(chunks),
+            EMBEDDING_DIMENSIONS,
+        ):
+            raise ValueError("RAG index chunk count does not match its metadata.")
+        self._ids = tuple(str(chunk["id"]) for chunk in chunks)
+        self._documents = tuple(str(chunk["document"]) for chunk in chunks)
+        self._metadatas = tuple(dict(chunk["metadata"]) for chunk in chunks)
+        self._squared_norms = np.einsum("ij,ij->i", self._embeddings, self._embeddings)
+        self._libraries = np.asarray(
+            [str(metadata["library"]) for metadata in self._metadatas]
+        )
+        self._lexical = _LexicalRanker.load(index_path, self.metadata)
+
+    def retrieve(self, query: str, limit: int = 3) -> tuple[RetrievedSource, ...]:
+        normalized = _validate_query(query, limit)
+        query_tokens = frozenset(_TOKEN.findall(normalized.lower()))
+        libraries = self._lexical.mentioned_libraries(query_tokens)
+        query_embedding = embed_texts([normalized])[0]
+        distances = (
+            float(query_embedding @ query_embedding)
+            + self._squared_norms
+            - 2.0 * (self._embeddings @ query_embedding)
+        )
+        pool = (
+            np.flatnonzero(np.isin(self._libraries, libraries))
+            if libraries
+            else np.arange(len(distances))
+        )
+        if self.ranking != "lexical":
+            return self._lexical.fuse(
+                query_tokens,
+                limit,
+                tuple(
+                    (
+                        self._ids[row],
+                        self._documents[row],
+                        self._metadatas[row],
+                        float(distances[row]),
+                    )
+                    for row in pool[np.argsort(distances[pool], kind="stable")]
+                ),
+                filtered_by_library=bool(libraries),
+                mode=self.ranking,
+            )
+        candidate_count = min(len(pool), max(limit * 4, limit))
+        if candidate_count < len(pool):
+            pool = pool[
+                np.argpartition(distances[pool], candidate_count - 1)[:candidate_count]
+            ]
+        nearest = pool[np.argsort(distances[pool], kind="stable")]
+        return self._lexical.rank(
+            query_tokens,
+            limit,
+            tuple(
+                (
+                    self._ids[row],
+                    self._documents[row],
+                    self._metadatas[row],
+                    float(distances[row]),
+                )
+                for row in nearest
             ),
+            filtered_by_library=bool(libraries),
         )
-        return tuple(_retrieved_source(*item) for item in ranked[:limit])
+
+
+class CachedRetriever:
+    """Thread-safe LRU of retrieval results shared by every run in the process."""
+
+    def __init__(self, retriever: DocumentationRetriever, max_entries: int = 256):
+        self.retriever = retriever
+        self.metadata = retriever.metadata
+        self.ranking = retriever.ranking
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            tuple[str, int, str, str, str], tuple[RetrievedSource, ...]
+        ] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def retrieve(self, query: str, limit: int = 3) -> tuple[RetrievedSource, ...]:
+        normalized = _validate_query(query, limit)
+        key = (
+            " ".join(_TOKEN.findall(normalized.lower())),
+            limit,
+            self.metadata.corpus_version,
+            self.metadata.embedding_version,
+            self.ranking,
+        )
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+        results = self.retriever.retrieve(normalized, limit)
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return results
+
+    def stats(self) -> QueryCacheStats:
+        with self._lock:
+            return QueryCacheStats(
+                hits=self._hits, misses=self._misses, entries=len(self._entries)
+            )
 
 
 @lru_cache(maxsize=8)
 def get_retriever(
     index_path: Path = DEFAULT_INDEX_PATH,
     manifest_path: Path = DEFAULT_MANIFEST_PATH,
-) -> ChromaRetriever:
-    return ChromaRetriever(index_path, manifest_path)
+    backend: Literal["chroma", "matrix"] = "chroma",
+    ranking: RankingMode = "lexical",
+    cache_entries: int = 0,
+) -> DocumentationRetriever:
+    retriever: DocumentationRetriever
+    if backend == "matrix":
+        retriever = MatrixRetriever(index_path, manifest_path, ranking=ranking)
+    elif ranking != "lexical":
+        raise ValueError("Hybrid BM25 ranking requires the matrix RAG backend.")
+    else:
+        retriever = ChromaRetriever(index_path, manifest_path)
+    if cache_entries > 0:
+        return CachedRetriever(retriever, cache_entries)
+    return retriever
 
 
 def _client(index_path: Path) -> ClientAPI:
@@ -223,30 +615,255 @@ def _client(index_path: Path) -> ClientAPI:
     )
 
 
-def _split_sections(content: str) -> tuple[tuple[str, str], ...]:
-    heading = "Overview"
-    body: list[str] = []
-    sections: list[tuple[str, str]] = []
-    for line in content.splitlines():
-        if line.startswith("## "):
-            if body:
-                sections.append((heading, "\n".join(body).strip()))
-            heading = line.removeprefix("## ").strip()
-            body = []
-        elif not line.startswith("# "):
-            body.append(line)
-    if body:
-        sections.append((heading, "\n".join(body).strip()))
-    return tuple((title, section) for title, section in sections if section)
+def _previous_build(
+    index_path: Path, client: ClientAPI
+) -> (
+    tuple[IndexMetadata, dict[str, tuple[DocumentationChunk, npt.NDArray[np.float32]]]]
+    | None
+):
+    """Return the prior build's metadata and chunks when it can be updated in place."""
+    metadata_path = index_path / INDEX_METADATA_FILE
+    chunks_path = index_path / CHUNKS_FILE
+    embeddings_path = index_path / EMBEDDINGS_FILE
+    if not (
+        metadata_path.is_file() and chunks_path.is_file() and embeddings_path.is_file()
+    ):
+        return None
+    try:
+        metadata = IndexMetadata.model_validate_json(
+            metadata_path.read_text(encoding="utf-8")
+        )
+        payload = json.loads(chunks_path.read_text(encoding="utf-8"))
+        embeddings = np.load(embeddings_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if (
+        not metadata.source_digests
+        or metadata.embedding_version != EMBEDDING_VERSION
+        or metadata.collection_name != COLLECTION_NAME
+        or COLLECTION_NAME
+        not in {collection.name for collection in client.list_collections()}
+        or embeddings.shape != (len(payload), EMBEDDING_DIMENSIONS)
+    ):
+        return None
+    chunks: dict[str, tuple[DocumentationChunk, npt.NDArray[np.float32]]] = {}
+    for entry, row in zip(payload, embeddings, strict=True):
+        item_metadata = entry["metadata"]
+        source = DocumentationSource(
+            id=item_metadata["source_id"],
+            library=item_metadata["library"],
+            library_version=item_metadata["library_version"],
+            document_version=item_metadata["document_version"],
+            title=item_metadata["title"],
+            source_url=item_metadata["source_url"],
+            content_path=Path("."),
+            sha256="0" * 64,
+        )
+        chunks[entry["id"]] = (
+            DocumentationChunk(
+                id=entry["id"],
+                source=source,
+                heading=item_metadata["heading"],
+                content=entry["document"],
+                chunk_index=item_metadata["chunk_index"],
+            ),
+            row,
+        )
+    return metadata, chunks
+
+
+def _load_index_metadata(index_path: Path, manifest_path: Path) -> IndexMetadata:
+    metadata_path = index_path / INDEX_METADATA_FILE
+    if not metadata_path.is_file():
+        raise FileNotFoundError(f"RAG index metadata not found: {metadata_path}")
+    metadata = IndexMetadata.model_validate_json(
+        metadata_path.read_text(encoding="utf-8")
+    )
+    manifest_digest = hashlib.sha256(manifest_path.read_bytes()).hexdigest()
+    if manifest_digest != metadata.manifest_sha256:
+        raise ValueError("RAG index manifest does not match its metadata.")
+    manifest = load_manifest(manifest_path)
+    if manifest.corpus_version != metadata.corpus_version:
+        raise ValueError("RAG index corpus version does not match its manifest.")
+    if metadata.embedding_version != EMBEDDING_VERSION:
+        raise ValueError("RAG index embedding version is incompatible.")
+    return metadata
+
+
+def _validate_query(query: str, limit: int) -> str:
+    normalized = query.strip()
+    if not normalized:
+        raise ValueError("Documentation query cannot be empty.")
+    if not 1 <= limit <= 5:
+        raise ValueError("Documentation result limit must be between 1 and 5.")
+    return normalized
+
+
+class _LexicalRanker:
+    """Library filtering and token-overlap re-ranking over a ``LexicalIndex``."""
+
+    def __init__(self, index: LexicalIndex):
+        self._tokens = {
+            chunk_id: frozenset(tokens)
+            for chunk_id, tokens in index.chunk_tokens.items()
+        }
+        self._postings = {
+            token: frozenset(chunk_ids) for token, chunk_ids in index.postings.items()
+        }
+        self._library_sizes: dict[str, int] = {}
+        for library in index.chunk_libraries.values():
+            self._library_sizes[library] = self._library_sizes.get(library, 0) + 1
+        statistics = index.bm25
+        chunk_count = len(statistics.chunk_lengths)
+        self._bm25: dict[str, dict[str, float]] = {}
+        for term, frequencies in statistics.term_frequencies.items():
+            idf = math.log(
+                1 + (chunk_count - len(frequencies) + 0.5) / (len(frequencies) + 0.5)
+            )
+            self._bm25[term] = {
+                chunk_id: idf
+                * frequency
+                * (statistics.k1 + 1)
+                / (
+                    frequency
+                    + statistics.k1
+                    * (
+                        1
+                        - statistics.b
+                        + statistics.b
+                        * statistics.chunk_lengths[chunk_id]
+                        / statistics.average_length
+                    )
+                )
+                for chunk_id, frequency in frequencies.items()
+            }
+
+    @classmethod
+    def load(cls, index_path: Path, metadata: IndexMetadata) -> "_LexicalRanker":
+        path = index_path / LEXICAL_INDEX_FILE
+        if not path.is_file():
+            raise FileNotFoundError(f"RAG lexical index not found: {path}")
+        index = LexicalIndex.model_validate_json(path.read_text(encoding="utf-8"))
+        if len(index.chunk_tokens) != metadata.chunk_count:
+            raise ValueError("RAG index chunk count does not match its metadata.")
+        return cls(index)
+
+    def mentioned_libraries(self, query_tokens: frozenset[str]) -> tuple[str, ...]:
+        return tuple(
+            sorted(
+                library
+                for library in self._library_sizes
+                if _library_is_mentioned(query_tokens, library)
+            )
+        )
+
+    def chunk_count(self, libraries: Sequence[str]) -> int:
+        return sum(self._library_sizes[library] for library in libraries)
+
+    def rank(
+        self,
+        query_tokens: frozenset[str],
+        limit: int,
+        candidates: Sequence[tuple[str, str, dict[str, Any], float]],
+        *,
+        filtered_by_library: bool,
+    ) -> tuple[RetrievedSource, ...]:
+        relevant = self._relevant(query_tokens, candidates, filtered_by_library)
+        ranked = sorted(
+            relevant,
+            key=lambda item: (
+                -len(query_tokens & self._tokens.get(item[0], frozenset())),
+                item[3],
+                item[0],
+            ),
+        )
+        return tuple(_retrieved_source(*item) for item in ranked[:limit])
+
+    def fuse(
+        self,
+        query_tokens: frozenset[str],
+        limit: int,
+        candidates: Sequence[tuple[str, str, dict[str, Any], float]],
+        *,
+        filtered_by_library: bool,
+        mode: RankingMode,
+    ) -> tuple[RetrievedSource, ...]:
+        """Combine dense order (``candidates`` sorted by distance) with BM25."""
+        relevant = self._relevant(query_tokens, candidates, filtered_by_library)
+        bm25 = {item[0]: self.bm25_score(query_tokens, item[0]) for item in relevant}
+        if mode == "rrf":
+            bm25_order = sorted(
+                (chunk_id for chunk_id, score in bm25.items() if score > 0),
+                key=lambda chunk_id: (-bm25[chunk_id], chunk_id),
+            )
+            bm25_ranks = {chunk_id: rank for rank, chunk_id in enumerate(bm25_order)}
+            scores = {
+                item[0]: 1 / (RRF_K + dense_rank + 1)
+                + (
+                    1 / (RRF_K + bm25_ranks[item[0]] + 1)
+                    if item[0] in bm25_ranks
+                    else 0.0
+                )
+                for dense_rank, item in enumerate(relevant)
+            }
+        else:
+            best = max(bm25.values(), default=0.0) or 1.0
+            scores = {
+                item[0]: HYBRID_DENSE_WEIGHT * (1 - item[3] / 2)
+                + (1 - HYBRID_DENSE_WEIGHT) * bm25[item[0]] / best
+                for item in relevant
+            }
+        ranked = sorted(relevant, key=lambda item: (-scores[item[0]], item[3], item[0]))
+        return tuple(_retrieved_source(*item) for item in ranked[:limit])
+
+    def bm25_score(self, query_tokens: frozenset[str], chunk_id: str) -> float:
+        return sum(
+            self._bm25.get(token, {}).get(chunk_id, 0.0) for token in query_tokens
+        )
+
+    def _relevant(
+        self,
+        query_tokens: frozenset[str],
+        candidates: Sequence[tuple[str, str, dict[str, Any], float]],
+        filtered_by_library: bool,
+    ) -> tuple[tuple[str, str, dict[str, Any], float], ...]:
+        if filtered_by_library:
+            return tuple(candidates)
+        matching: frozenset[str] = frozenset().union(
+            *(self._postings.get(token, frozenset()) for token in query_tokens)
+        )
+        return tuple(item for item in candidates if item[0] in matching)
+
+
+def _embedding_text(chunk: DocumentationChunk) -> str:
+    return (
+        f"{chunk.source.library} {chunk.source.title} {chunk.heading} {chunk.content}"
+    )
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+    ) as handle:
+        handle.write(content)
+    os.chmod(handle.name, 0o644)
+    os.replace(handle.name, path)
 
 
-def _lexical_score(query: str, value: str) -> int:
-    query_tokens = set(_TOKEN.findall(query.lower()))
-    value_tokens = set(_TOKEN.findall(value.lower()))
-    return len(query_tokens & value_tokens)
+def _chunk_metadata(chunk: DocumentationChunk) -> dict[str, str | int]:
+    return {
+        "source_id": chunk.source.id,
+        "library": chunk.source.library,
+        "library_version": chunk.source.library_version,
+        "document_version": chunk.source.document_version,
+        "title": chunk.source.title,
+        "heading": chunk.heading,
+        "source_url": chunk.source.source_url,
+        "chunk_index": chunk.chunk_index,
+    }
 
 
-def _library_is_mentioned(query_tokens: set[str], library: str) -> bool:
+def _library_is_mentioned(query_tokens: frozenset[str], library: str) -> bool:
     library_tokens = set(_TOKEN.findall(library.lower().replace("-", " ")))
     return bool(library_tokens) and library_tokens <= query_tokens
 
@@ -275,8 +892,17 @@ def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Build the versioned ChromaDB index")
     parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH)
     parser.add_argument("--output", type=Path, default=DEFAULT_INDEX_PATH)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild every source instead of only those whose digest changed",
+    )
     args = parser.parse_args(argv)
-    print(build_index(args.manifest, args.output).model_dump_json(indent=2))
+    print(
+        build_index(args.manifest, args.output, full=args.full).model_dump_json(
+            indent=2
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -58,12 +58,46 @@ class RetrievalEvent(BaseModel):
     results: tuple[RetrievedSource, ...]
 
 
+class QueryCacheStats(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    hits: int = Field(default=0, ge=0)
+    misses: int = Field(default=0, ge=0)
+    entries: int = Field(default=0, ge=0)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 class IndexMetadata(BaseModel):
     model_config = ConfigDict(frozen=True)
 
-    schema_version: str = "1.0.0"
+    schema_version: str = "1.1.0"
     corpus_version: str
     collection_name: str
     embedding_version: str
     manifest_sha256: str = Field(pattern=r"^[a-f0-9]{64}$")
     chunk_count: int = Field(gt=0)
+    source_digests: dict[str, str] = Field(default_factory=dict)
+
+
+class Bm25Statistics(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    k1: float = Field(default=1.2, gt=0)
+    b: float = Field(default=0.75, ge=0, le=1)
+    average_length: float = Field(gt=0)
+    chunk_lengths: dict[str, int]
+    term_frequencies: dict[str, dict[str, int]]
+
+
+class LexicalIndex(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    schema_version: str = "1.1.0"
+    chunk_tokens: dict[str, tuple[str, ...]]
+    chunk_libraries: dict[str, str]
+    postings: dict[str, tuple[str, ...]]
+    bm25: Bm25Statistics
@@ -6,3 +6,4 @@ os.environ["HOME"] = str(TEST_RUNTIME_ROOT / "home")
 os.environ["XDG_CONFIG_HOME"] = str(TEST_RUNTIME_ROOT / "config")
 os.environ["XDG_DATA_HOME"] = str(TEST_RUNTIME_ROOT / "data")
 os.environ["CREWAI_STORAGE_DIR"] = str(TEST_RUNTIME_ROOT / "crewai")
+os.environ["RUN_STORE_PATH"] = str(TEST_RUNTIME_ROOT / "runs" / "runs.sqlite3")
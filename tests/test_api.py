@@ -1,13 +1,37 @@
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+import threading
 import time
 from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 from uuid import UUID
 
+import pytest
 from fastapi.testclient import TestClient
 
 from backend.config import Settings
 from backend.main import create_app
-from backend.models import RunResponse, RunState, RunStatus
+from backend.models import (
+    AttemptStatus,
+    RunAttempt,
+    RunEvent,
+    RunResponse,
+    RunSnapshotDelta,
+    RunStage,
+    RunState,
+    RunStatus,
+)
+from backend.rate_limit import (
+    LocalRateLimitBackend,
+    RateLimiter,
+    SqliteRateLimitBackend,
+)
+from backend.run_manager import RunManager, RunManagerClosed, RunQueueFull
+from backend.run_store import MemoryRunStore
 from rag.models import RetrievalEvent, RetrievedSource
 
 
@@ -80,6 +104,68 @@ class SlowRunner(FakeRunner):
         )
 
 
+class ProgressRunner(FakeRunner):
+    def run(self) -> RunResponse:
+        state = RunState(run_id=self.run_id, request=self.request)
+        state.status = RunStatus.running
+        state.stage = RunStage.developing
+        state.events.append(RunEvent(stage=RunStage.developing, message="Coding."))
+        self.on_update(state)
+        state.attempts = 1
+        state.attempt_history.append(
+            RunAttempt(sequence=1, status=AttemptStatus.passed, test_results="ok")
+        )
+        self.on_update(state)
+        return RunResponse(
+            run_id=self.run_id, status=RunStatus.completed, report="Done"
+        )
+
+
+class HangingAsyncRunner(FakeRunner):
+    def run(self) -> RunResponse:
+        raise AssertionError("Async runners must be awaited, not run on a thread.")
+
+    async def arun(self) -> RunResponse:
+        await asyncio.sleep(60)
+        raise AssertionError("The run should have been cancelled.")
+
+
+class BusyRunner(FakeRunner):
+    updates = 300
+    released = threading.Event()
+
+    def run(self) -> RunResponse:
+        self.released.wait(timeout=30)
+        state = RunState(run_id=self.run_id, request=self.request)
+        state.status = RunStatus.running
+        for index in range(self.updates):
+            state.events.append(
+                RunEvent(stage=RunStage.developing, message=f"Step {index}.")
+            )
+            state.attempts = len(state.events)
+            self.on_update(state)
+        return RunResponse(
+            run_id=self.run_id, status=RunStatus.completed, report="Done"
+        )
+
+
+def _sse_events(body: str) -> list[dict[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "id" in fields:
+            events.append(
+                {
+                    "id": int(fields["id"]),
+                    "event": fields["event"],
+                    "data": json.loads(fields["data"]),
+                }
+            )
+    return events
+
+
 def test_health() -> None:
     client = TestClient(create_app(Settings(), runner_factory=FakeRunner))
 
@@ -129,6 +215,11 @@ def test_run_rejects_oversized_request() -> None:
     assert response.status_code == 413
 
 
+def test_api_refuses_the_unisolated_local_sandbox() -> None:
+    with pytest.raises(ValueError, match="trusted benchmark hosts"):
+        create_app(Settings(sandbox_backend="local"), runner_factory=FakeRunner)
+
+
 def test_run_endpoint_rate_limits_by_client() -> None:
     settings = Settings(rate_limit_requests=1, rate_limit_window_seconds=60)
     client = TestClient(create_app(settings, runner_factory=FakeRunner))
@@ -140,6 +231,45 @@ def test_run_endpoint_rate_limits_by_client() -> None:
     assert response.json()["detail"] == "Rate limit exceeded."
 
 
+def test_rate_limiter_weights_the_previous_window() -> None:
+    now = [100.0]
+    limiter = RateLimiter(2, 10, LocalRateLimitBackend(clock=lambda: now[0]))
+
+    assert limiter.allow("client")
+    assert limiter.allow("client")
+    assert not limiter.allow("client")
+    assert limiter.allow("other")
+
+    now[0] = 115.0
+    assert limiter.allow("client")
+    assert not limiter.allow("client")
+
+
+def test_rate_limiter_evicts_idle_clients() -> None:
+    now = [0.0]
+    backend = LocalRateLimitBackend(shards=4, clock=lambda: now[0])
+    limiter = RateLimiter(1, 10, backend)
+    for client in range(100):
+        limiter.allow(f"client-{client}")
+
+    now[0] = 25.0
+    for shard in range(40):
+        limiter.allow(f"active-{shard}")
+
+    assert len(backend) == 40
+
+
+def test_rate_limit_backend_is_shared_between_workers(tmp_path: Path) -> None:
+    first = RateLimiter(1, 60, SqliteRateLimitBackend(tmp_path / "limits.sqlite3"))
+    second = RateLimiter(1, 60, SqliteRateLimitBackend(tmp_path / "limits.sqlite3"))
+
+    assert first.allow("client")
+    assert not second.allow("client")
+    assert second.allow("other")
+    first.close()
+    second.close()
+
+
 def test_polling_run_api_starts_and_reaches_a_terminal_state() -> None:
     client = TestClient(create_app(Settings(), runner_factory=FakeRunner))
 
@@ -159,15 +289,80 @@ def test_polling_run_api_starts_and_reaches_a_terminal_state() -> None:
     assert snapshot.json()["report"] == "Completed: build a parser"
 
 
-def test_polling_run_api_rejects_concurrent_public_runs() -> None:
+def test_run_metrics_report_the_shared_retrieval_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import backend.pipeline
+    from rag.index import CachedRetriever, ChromaRetriever
+
+    cache = CachedRetriever(ChromaRetriever())
+    monkeypatch.setattr(backend.pipeline, "retriever_for", lambda settings: cache)
+    client = TestClient(create_app(Settings(), runner_factory=FakeRunner))
+    cache.retrieve("pydantic BaseSettings env_file")
+    cache.retrieve("Pydantic basesettings ENV_FILE")
+
+    metrics = client.get("/runs/metrics").json()
+
+    assert metrics["rag_query_cache"] == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_polling_run_api_queues_runs_beyond_worker_capacity() -> None:
     client = TestClient(create_app(Settings(), runner_factory=CancellableRunner))
 
     first = client.post("/runs", json={"request": "build a parser"})
     second = client.post("/runs", json={"request": "build another parser"})
 
     assert first.status_code == 202
-    assert second.status_code == 409
-    assert second.json()["detail"] == "Another run is already active."
+    assert second.status_code == 202
+    assert first.json()["queue_position"] is None
+    assert second.json()["queue_position"] == 1
+    metrics = client.get("/runs/metrics").json()
+    assert (metrics["active_runs"], metrics["queued_runs"]) == (1, 1)
+    assert client.post("/run", json={"request": "sync"}).status_code == 409
+
+    client.post(f"/runs/{first.json()['run_id']}/cancel")
+    second_id = second.json()["run_id"]
+    for _ in range(200):
+        snapshot = client.get(f"/runs/{second_id}").json()
+        if snapshot["queue_position"] is None:
+            break
+        time.sleep(0.005)
+    assert snapshot["queue_position"] is None
+    client.post(f"/runs/{second_id}/cancel")
+
+
+def test_run_queue_rotates_between_clients_and_caps_each_client() -> None:
+    settings = Settings(max_queued_runs_per_client=2)
+    manager = RunManager(settings, CancellableRunner)
+    try:
+        active = manager.start("active", client="a")
+        first_a = manager.start("a1", client="a")
+        second_a = manager.start("a2", client="a")
+        first_b = manager.start("b1", client="b")
+        with pytest.raises(RunQueueFull):
+            manager.start("a3", client="a")
+
+        positions = {
+            name: manager.get(snapshot.run_id).queue_position  # type: ignore[union-attr]
+            for name, snapshot in {
+                "a1": first_a,
+                "a2": second_a,
+                "b1": first_b,
+            }.items()
+        }
+        assert positions == {"a1": 1, "b1": 2, "a2": 3}
+
+        cancelled = manager.cancel(first_a.run_id)
+        assert cancelled is not None
+        assert cancelled.status is RunStatus.cancelled
+        assert [
+            manager.get(snapshot.run_id).queue_position  # type: ignore[union-attr]
+            for snapshot in (second_a, first_b)
+        ] == [1, 2]
+        assert manager.metrics().queued_runs == 2
+        assert manager.get(active.run_id).queue_position is None  # type: ignore[union-attr]
+    finally:
+        manager.close()
 
 
 def test_polling_run_api_enforces_daily_model_run_budget() -> None:
@@ -188,6 +383,22 @@ def test_polling_run_api_enforces_daily_model_run_budget() -> None:
     assert response.json()["detail"] == "Daily model run limit exceeded."
 
 
+def test_cancelled_queued_run_returns_its_daily_budget_slot() -> None:
+    settings = Settings(max_daily_model_runs=2)
+    client = TestClient(create_app(settings, runner_factory=CancellableRunner))
+
+    active = client.post("/runs", json={"request": "build a parser"})
+    queued = client.post("/runs", json={"request": "build another parser"})
+    client.post(f"/runs/{queued.json()['run_id']}/cancel")
+    replacement = client.post("/runs", json={"request": "build a third parser"})
+    exhausted = client.post("/runs", json={"request": "build a fourth parser"})
+
+    assert (active.status_code, queued.status_code) == (202, 202)
+    assert replacement.status_code == 202
+    assert exhausted.status_code == 429
+    client.post(f"/runs/{active.json()['run_id']}/cancel")
+
+
 def test_sync_run_endpoint_uses_public_run_budget() -> None:
     settings = Settings(max_daily_model_runs=1)
     client = TestClient(create_app(settings, runner_factory=FakeRunner))
@@ -248,3 +459,361 @@ def test_benchmark_endpoint_returns_empty_list_without_artifacts(
 
     assert response.status_code == 200
     assert response.json() == []
+
+
+def test_read_endpoints_stay_fast_without_run_dependencies() -> None:
+    script = textwrap.dedent(
+        """
+        import sys
+        import time
+
+        started = time.perf_counter()
+        from fastapi.testclient import TestClient
+
+        from backend.main import create_app
+        import_seconds = time.perf_counter() - started
+
+        heavy = ("crewai", "chromadb", "openai", "rag.index", "backend.pipeline")
+        app = create_app()
+        client = TestClient(app)
+        assert client.get("/health").status_code == 200
+        assert client.get("/benchmarks").status_code == 200
+        missing = "/runs/00000000-0000-0000-0000-000000000000"
+        assert client.get(missing).status_code == 404
+        loaded = sorted(name for name in heavy if name in sys.modules)
+        assert not loaded, loaded
+        assert import_seconds < 5.0, import_seconds
+
+        with TestClient(app):
+            app.state.module_warmup.join(timeout=120)
+        assert "backend.pipeline" in sys.modules
+        """
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        timeout=180,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_ready_reports_each_warmed_component(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def missing_image() -> None:
+        raise RuntimeError("Docker sandbox image is missing: forge:py311")
+
+    monkeypatch.setattr(
+        "backend.pipeline.prewarm_steps",
+        lambda settings: (
+            ("agents", lambda: None),
+            ("retriever", lambda: None),
+            ("sandbox", missing_image),
+        ),
+    )
+    app = create_app(Settings(), runner_factory=FakeRunner)
+
+    assert TestClient(app).get("/ready").status_code == 503
+    with TestClient(app) as client:
+        app.state.module_warmup.join(timeout=30)
+        response = client.get("/ready")
+
+    assert response.status_code == 503
+    components = response.json()["components"]
+    assert components["retriever"] == {"status": "ready", "error": None}
+    assert components["sandbox"]["status"] == "failed"
+    assert "forge:py311" in components["sandbox"]["error"]
+    lazy = create_app(Settings(prewarm_run_modules=False), runner_factory=FakeRunner)
+    assert TestClient(lazy).get("/ready").json() == {"ready": True, "components": {}}
+
+
+def test_run_event_stream_sends_increments_and_resumes_after_last_event_id() -> None:
+    client = TestClient(create_app(Settings(), runner_factory=ProgressRunner))
+    run_id = client.post("/runs", json={"request": "build a parser"}).json()["run_id"]
+
+    response = client.get(f"/runs/{run_id}/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [event["id"] for event in events] == list(range(1, len(events) + 1))
+    kinds = [event["event"] for event in events]
+    assert kinds[-1] == "end"
+    assert kinds.count("attempt") == 1
+    assert [
+        event["data"]["message"] for event in events if event["event"] == "event"
+    ] == ["The run is queued.", "Coding."]
+    assert "result" in kinds
+
+    attempt_id = next(event["id"] for event in events if event["event"] == "attempt")
+    resumed = _sse_events(
+        client.get(
+            f"/runs/{run_id}/events", headers={"Last-Event-ID": str(attempt_id)}
+        ).text
+    )
+    assert resumed == events[attempt_id:]
+    assert (
+        client.get(
+            f"/runs/{run_id}/events", headers={"Last-Event-ID": str(events[-1]["id"])}
+        ).text
+        == ""
+    )
+    assert (
+        client.get("/runs/00000000-0000-0000-0000-000000000001/events").status_code
+        == 404
+    )
+
+
+def test_run_polling_with_since_returns_only_changes_or_not_modified() -> None:
+    client = TestClient(create_app(Settings(), runner_factory=ProgressRunner))
+    started = client.post("/runs", json={"request": "build a parser"}).json()
+    run_id = started["run_id"]
+    for _ in range(200):
+        full = client.get(f"/runs/{run_id}").json()
+        if full["status"] == "completed":
+            break
+        time.sleep(0.005)
+
+    delta = client.get(f"/runs/{run_id}", params={"since": started["version"]})
+
+    assert delta.status_code == 200
+    payload = delta.json()
+    assert payload["version"] == full["version"] > started["version"]
+    assert set(payload["appended"]) == {"attempts"}
+    assert "request" not in payload["changes"]
+    merged = {**started, **payload["changes"], "version": payload["version"]}
+    for name, items in payload["appended"].items():
+        merged[name] = [*started[name], *items]
+    assert merged == full
+    unchanged = client.get(f"/runs/{run_id}", params={"since": full["version"]})
+    assert unchanged.status_code == 304
+    assert (
+        client.get(f"/runs/{run_id}", params={"since": 0}).json()["changes"]["request"]
+        == "build a parser"
+    )
+
+
+def test_finished_runs_are_evicted_and_paged_back_in_from_the_run_store(
+    tmp_path: Path,
+) -> None:
+    settings = Settings(run_store_path=tmp_path / "runs.sqlite3", run_cache_entries=1)
+    client = TestClient(create_app(settings, runner_factory=ProgressRunner))
+    run_ids = []
+    snapshots = []
+    for request in ("build a parser", "build a lexer"):
+        run_id = client.post("/runs", json={"request": request}).json()["run_id"]
+        events = _sse_events(client.get(f"/runs/{run_id}/events").text)
+        assert events[-1]["event"] == "end"
+        run_ids.append(run_id)
+        snapshots.append(client.get(f"/runs/{run_id}").json())
+    manager: RunManager = client.app.state.run_manager  # type: ignore[attr-defined]
+    assert UUID(run_ids[0]) not in manager._runs
+
+    first = client.get(f"/runs/{run_ids[0]}").json()
+
+    assert first == snapshots[0]
+    assert [attempt["sequence"] for attempt in first["attempts"]] == [1]
+    assert UUID(run_ids[1]) not in manager._runs
+    assert _sse_events(client.get(f"/runs/{run_ids[1]}/events").text) == events
+    assert client.get(f"/runs/{run_ids[0]}", params={"since": 0}).status_code == 200
+
+
+def test_run_store_survives_restart_and_fails_orphaned_runs(tmp_path: Path) -> None:
+    settings = Settings(run_store_path=tmp_path / "runs.sqlite3")
+    manager = RunManager(settings, CancellableRunner)
+    finished = manager.start("finished")
+    manager.cancel(finished.run_id)
+    for _ in range(200):
+        if manager.is_finished(finished.run_id):
+            break
+        time.sleep(0.005)
+    orphaned = manager.start("orphaned")
+    manager._flush_writes()
+    manager.store.close()
+
+    restarted = RunManager(settings, FakeRunner)
+    try:
+        reloaded = restarted.get(finished.run_id)
+        assert reloaded is not None
+        assert reloaded == manager.get(finished.run_id)
+        failed = restarted.get(orphaned.run_id)
+        assert failed is not None
+        assert failed.status is RunStatus.failed
+        assert failed.error == "The API restarted before the run finished."
+        events = restarted.wait_for_events(orphaned.run_id)
+        assert events is not None
+        assert [event.id for event in events] == list(range(1, len(events) + 1))
+        assert events[-1].type == "end"
+    finally:
+        restarted.close()
+        manager._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def test_closed_manager_cancels_queued_runs_and_refuses_new_work() -> None:
+    manager = RunManager(Settings(run_store="memory"), HangingAsyncRunner)
+    active = manager.start("hang").run_id
+    queued = manager.start("wait").run_id
+
+    manager.close()
+
+    snapshot = manager.get(queued)
+    assert snapshot is not None
+    assert snapshot.status is RunStatus.cancelled
+    assert manager.get(active) is not None
+    with pytest.raises(RunManagerClosed):
+        manager.start("late")
+    with pytest.raises(RunManagerClosed):
+        manager.reserve_external_run()
+
+
+def test_requests_waiting_on_the_run_manager_do_not_block_the_event_loop() -> None:
+    app = create_app(Settings(prewarm_run_modules=False), runner_factory=FakeRunner)
+    manager: RunManager = app.state.run_manager
+    statuses: list[int] = []
+
+    # One client context shares a single event loop across request threads.
+    with TestClient(app) as client:
+        run_id = client.post("/runs", json={"request": "build a parser"}).json()[
+            "run_id"
+        ]
+        with manager._lock:
+            cancel = threading.Thread(
+                target=lambda: statuses.append(
+                    client.post(f"/runs/{run_id}/cancel").status_code
+                )
+            )
+            health = threading.Thread(
+                target=lambda: statuses.append(client.get("/health").status_code)
+            )
+            cancel.start()
+            time.sleep(0.05)
+            health.start()
+            health.join(timeout=1)
+            answered_while_locked = list(statuses)
+        cancel.join(timeout=5)
+        health.join(timeout=5)
+
+    assert answered_while_locked == [200]
+    assert statuses == [200, 200]
+
+
+class BlockedRunStore(MemoryRunStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+
+    def save(self, *args: Any) -> None:
+        self.released.wait(timeout=30)
+        super().save(*args)
+
+
+def test_run_progress_is_published_while_the_store_is_writing() -> None:
+    store = BlockedRunStore()
+    manager = RunManager(Settings(), FakeRunner, store)
+    try:
+        run_id = manager.start("build a parser").run_id
+        for _ in range(400):
+            if manager.is_finished(run_id):
+                break
+            time.sleep(0.005)
+
+        assert manager.is_finished(run_id)
+        assert store.load(run_id) is None
+        store.released.set()
+        manager._flush_writes()
+        assert store.load(run_id) == manager.get(run_id)
+    finally:
+        store.released.set()
+        manager.close()
+
+
+def test_run_reads_share_published_snapshots_without_the_manager_lock() -> None:
+    manager = RunManager(Settings(run_store="memory"), BusyRunner)
+    run_id = manager.start("concurrent").run_id
+    failures: list[str] = []
+    reads = [0] * 4
+
+    def poll(reader: int) -> None:
+        seen = manager.get(run_id)
+        assert seen is not None
+        while seen.status is not RunStatus.completed:
+            delta = manager.changes_since(run_id, seen.version)
+            current = manager.get(run_id)
+            assert current is not None
+            reads[reader] += 2
+            if current.version < seen.version:
+                failures.append(f"version went back to {current.version}")
+            if current.status is RunStatus.running and current.attempts_used != len(
+                current.events
+            ):
+                failures.append(f"torn snapshot at version {current.version}")
+            if isinstance(delta, RunSnapshotDelta):
+                merged = {**seen.model_dump(mode="json"), **delta.changes}
+                for name, items in delta.appended.items():
+                    merged[name] = [*merged[name], *items]
+                if merged["status"] == "running" and merged["attempts_used"] != len(
+                    merged["events"]
+                ):
+                    failures.append(f"inconsistent delta at version {delta.version}")
+            seen = current
+
+    readers = [threading.Thread(target=poll, args=(index,)) for index in range(4)]
+    for reader in readers:
+        reader.start()
+    BusyRunner.released.set()
+    for reader in readers:
+        reader.join(timeout=30)
+
+    assert not failures
+    assert all(reads)
+    finished = manager.get(run_id)
+    assert finished is not None
+    assert finished.attempts_used == BusyRunner.updates
+    assert manager.get(run_id) is finished
+
+    with manager._lock:
+        reader = threading.Thread(
+            target=lambda: (manager.get(run_id), manager.changes_since(run_id, 1))
+        )
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+    manager.close()
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        Settings(run_store="memory"),
+        Settings(run_store="memory", run_timeout_seconds=0.05),
+    ],
+)
+def test_async_runs_are_cancelled_mid_stage_and_free_their_slot(
+    settings: Settings,
+) -> None:
+    manager = RunManager(settings, HangingAsyncRunner)
+    try:
+        run_id = manager.start("hang").run_id
+        for _ in range(400):
+            if run_id in manager._tasks or manager.is_finished(run_id):
+                break
+            time.sleep(0.005)
+        if settings.run_timeout_seconds > 1:
+            manager.cancel(run_id)
+        for _ in range(400):
+            if manager.is_finished(run_id):
+                break
+            time.sleep(0.005)
+
+        snapshot = manager.get(run_id)
+        assert snapshot is not None
+        assert snapshot.status is RunStatus.cancelled
+        assert snapshot.stage is RunStage.cancelled
+        assert manager.metrics().active_runs == 0
+        assert run_id not in manager._tasks
+    finally:
+        manager.close()
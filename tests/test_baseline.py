@@ -1,8 +1,11 @@
 import json
+import time
 from pathlib import Path
 from typing import Any
 
-from backend.sandbox import SandboxRequest, SandboxResult
+import pytest
+
+from backend.sandbox import LocalProcessSandboxRunner, SandboxRequest, SandboxResult
 from benchmark.baseline import SolutionGenerator, ZeroShotBaselineRunner, _extract_code
 from benchmark.catalog import get_task
 from benchmark.hidden_cases import HIDDEN_CASES, to_jsonable
@@ -159,3 +162,230 @@ def test_extract_code_accepts_plain_or_fenced_python() -> None:
     assert _extract_code("```python\ndef solve():\n    pass\n```") == (
         "def solve():\n    pass\n"
     )
+
+
+class SlowFirstGenerator(RecordingGenerator):
+    def generate(self, task: BenchmarkTask, model: str) -> GeneratedSolution:
+        if task.id == "forge_easy_01":
+            time.sleep(0.2)
+        return super().generate(task, model)
+
+
+def test_concurrent_runner_keeps_catalog_order_and_guardrail(
+    tmp_path: Path,
+) -> None:
+    tasks = [get_task(f"forge_easy_0{number}") for number in range(1, 6)]
+
+    report = ZeroShotBaselineRunner(
+        SlowFirstGenerator(),
+        "test-model",
+        tmp_path,
+        FailingSandboxRunner(),
+        max_consecutive_failures=3,
+        finish_remaining_threshold=1,
+        concurrency=3,
+    ).run(tasks)
+
+    assert isinstance(report, BenchmarkInterruptedReport)
+    assert [result.task_id for result in report.results] == [
+        task.id for task in tasks[:3]
+    ]
+    assert "with 2 tasks remaining" in report.stop_reason
+    checkpoints = tmp_path / report.run_id / "checkpoints"
+    assert not list(checkpoints.glob("*.tmp"))
+    assert (checkpoints / "forge_easy_01.json").is_file()
+
+
+class BatchingSandboxRunner(FailingSandboxRunner):
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+
+    def run_many(
+        self, requests: list[SandboxRequest], max_parallel: int = 1
+    ) -> list[SandboxResult]:
+        self.batches.append(len(requests))
+        return [self.run(request) for request in requests]
+
+
+def test_batched_runner_evaluates_generated_candidates_together(
+    tmp_path: Path,
+) -> None:
+    tasks = [get_task(f"forge_easy_0{number}") for number in range(1, 6)]
+    sandbox = BatchingSandboxRunner()
+
+    report = ZeroShotBaselineRunner(
+        RecordingGenerator(),
+        "test-model",
+        tmp_path,
+        sandbox,
+        concurrency=2,
+        evaluation_batch_size=2,
+    ).run(tasks)
+
+    assert sandbox.batches == [2, 2, 1]
+    assert [result.task_id for result in report.results] == [task.id for task in tasks]
+    assert all(result.response_id == "response-test" for result in report.results)
+    checkpoints = tmp_path / report.run_id / "checkpoints"
+    assert len(list(checkpoints.glob("*.json"))) == 5
+
+
+def test_session_runner_scores_candidates_inside_one_sandbox(
+    tmp_path: Path,
+) -> None:
+    tasks = [get_task(f"forge_easy_0{number}") for number in range(1, 4)]
+    sandbox = BatchingLocalRunner()
+
+    report = ZeroShotBaselineRunner(
+        RecordingGenerator(),
+        "test-model",
+        tmp_path,
+        sandbox,
+        evaluation_batch_size=3,
+        evaluation_session=True,
+    ).run(tasks)
+
+    assert sandbox.requests == 1
+    assert [result.task_id for result in report.results] == [task.id for task in tasks]
+    assert {result.error for result in report.results} == {
+        "candidate import failed: AttributeError"
+    }
+
+
+class BatchingLocalRunner(LocalProcessSandboxRunner):
+    def __init__(self) -> None:
+        super().__init__(isolate_network=False)
+        self.requests = 0
+
+    def run(self, request: SandboxRequest) -> SandboxResult:
+        self.requests += 1
+        return super().run(request)
+
+
+def test_resume_skips_checkpointed_tasks_and_writes_report(tmp_path: Path) -> None:
+    tasks = [get_task(f"forge_easy_0{number}") for number in range(1, 6)]
+    interrupted = ZeroShotBaselineRunner(
+        RecordingGenerator(),
+        "test-model",
+        tmp_path,
+        FailingSandboxRunner(),
+        max_consecutive_failures=2,
+        finish_remaining_threshold=0,
+    ).run(tasks)
+    assert isinstance(interrupted, BenchmarkInterruptedReport)
+
+    generator = RecordingGenerator()
+    report = ZeroShotBaselineRunner(
+        generator,
+        "test-model",
+        tmp_path,
+        FailingSandboxRunner(),
+        max_consecutive_failures=2,
+        finish_remaining_threshold=0,
+    ).run(resume_run_id=interrupted.run_id)
+
+    assert isinstance(report, BenchmarkInterruptedReport)
+    assert report.run_id == interrupted.run_id
+    assert report.started_at == interrupted.started_at
+    assert [result.task_id for result in report.results] == [
+        task.id for task in tasks[:4]
+    ]
+    assert generator.received_prompts == [task.prompt for task in tasks[2:4]]
+
+    finished = ZeroShotBaselineRunner(
+        RecordingGenerator(), "test-model", tmp_path, FailingSandboxRunner()
+    ).run(resume_run_id=interrupted.run_id)
+
+    assert not isinstance(finished, BenchmarkInterruptedReport)
+    assert finished.tasks_total == 5
+    assert (tmp_path / interrupted.run_id / "report.json").is_file()
+
+
+def test_resumed_results_break_the_consecutive_failure_streak(
+    tmp_path: Path,
+) -> None:
+    tasks = [get_task(f"forge_easy_0{number}") for number in range(1, 6)]
+    first = ZeroShotBaselineRunner(
+        RecordingGenerator(), "test-model", tmp_path, FailingSandboxRunner()
+    ).run(tasks)
+    checkpoints = tmp_path / first.run_id / "checkpoints"
+    for task in tasks:
+        if task.id != "forge_easy_02":
+            (checkpoints / f"{task.id}.json").unlink()
+    (tmp_path / first.run_id / "report.json").unlink()
+
+    report = ZeroShotBaselineRunner(
+        RecordingGenerator(),
+        "test-model",
+        tmp_path,
+        FailingSandboxRunner(),
+        max_consecutive_failures=2,
+        finish_remaining_threshold=0,
+    ).run(resume_run_id=first.run_id)
+
+    assert isinstance(report, BenchmarkInterruptedReport)
+    assert [result.task_id for result in report.results] == [
+        task.id for task in tasks[:4]
+    ]
+
+
+class RateLimitedGenerator(RecordingGenerator):
+    def generate(self, task: BenchmarkTask, model: str) -> GeneratedSolution:
+        if task.id == "forge_easy_02":
+            raise RuntimeError("rate limited")
+        return super().generate(task, model)
+
+
+def test_resume_retries_tasks_whose_generation_failed(tmp_path: Path) -> None:
+    tasks = [get_task("forge_easy_01"), get_task("forge_easy_02")]
+    first = ZeroShotBaselineRunner(
+        RateLimitedGenerator(), "test-model", tmp_path, PassingSandboxRunner()
+    ).run(tasks)
+    assert first.results[1].error == "generation failed: RuntimeError: rate limited"
+    (tmp_path / first.run_id / "report.json").unlink()
+
+    generator = RecordingGenerator()
+    report = ZeroShotBaselineRunner(
+        generator, "test-model", tmp_path, PassingSandboxRunner()
+    ).run(resume_run_id=first.run_id)
+
+    assert generator.received_prompts == [tasks[1].prompt]
+    assert report.results[1].passed is True
+
+
+def test_resume_without_a_recorded_selection_requires_explicit_tasks(
+    tmp_path: Path,
+) -> None:
+    tasks = [get_task(f"forge_easy_0{number}") for number in range(1, 6)]
+    interrupted = ZeroShotBaselineRunner(
+        RecordingGenerator(),
+        "test-model",
+        tmp_path,
+        FailingSandboxRunner(),
+        max_consecutive_failures=2,
+        finish_remaining_threshold=0,
+    ).run(tasks)
+    (tmp_path / interrupted.run_id / "run.json").unlink()
+    runner = ZeroShotBaselineRunner(
+        RecordingGenerator(), "test-model", tmp_path, FailingSandboxRunner()
+    )
+
+    with pytest.raises(ValueError, match="does not record its task selection"):
+        runner.run(resume_run_id=interrupted.run_id)
+    report = runner.run(tasks, resume_run_id=interrupted.run_id)
+
+    assert [result.task_id for result in report.results] == [task.id for task in tasks]
+
+
+def test_resume_rejects_a_run_recorded_for_another_model(tmp_path: Path) -> None:
+    task = get_task("forge_easy_02")
+    report = ZeroShotBaselineRunner(
+        RecordingGenerator(), "test-model", tmp_path, PassingSandboxRunner()
+    ).run([task])
+    runner = ZeroShotBaselineRunner(
+        RecordingGenerator(), "other-model", tmp_path, PassingSandboxRunner()
+    )
+
+    with pytest.raises(ValueError, match="recorded model"):
+        runner.run(resume_run_id=report.run_id)
+    with pytest.raises(ValueError, match="Invalid benchmark run ID"):
+        runner.run(resume_run_id="../escape")
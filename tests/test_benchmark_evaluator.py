@@ -2,9 +2,13 @@ import json
 from pathlib import Path
 from typing import Any
 
-from backend.sandbox import SandboxRequest, SandboxResult
+from backend.sandbox import LocalProcessSandboxRunner, SandboxRequest, SandboxResult
 from benchmark.catalog import get_task
-from benchmark.evaluator import evaluate_candidate
+from benchmark.evaluator import (
+    evaluate_candidate,
+    evaluate_candidates,
+    evaluate_candidates_in_session,
+)
 from benchmark.hidden_cases import HIDDEN_CASES, to_jsonable
 
 
@@ -59,6 +63,22 @@ def test_evaluator_accepts_correct_candidate_without_copying_expected_outputs(
     ]
 
 
+def test_batch_evaluation_keeps_candidate_order(tmp_path: Path) -> None:
+    task = get_task("forge_easy_02")
+    runner = StubSandboxRunner(_outputs(_expected(task.id)))
+
+    results = evaluate_candidates(
+        [
+            (task, _candidate(tmp_path)),
+            (get_task("forge_easy_08"), _candidate(tmp_path)),
+        ],
+        runner,
+    )
+
+    assert [result.passed for result in results] == [True, False]
+    assert results[1].error == "hidden case failed during hidden case 0"
+
+
 def test_evaluator_reports_hidden_failure_without_revealing_values(
     tmp_path: Path,
 ) -> None:
@@ -151,3 +171,92 @@ def test_correct_deployment_order_reference_matches_all_hidden_cases(
     )
 
     assert result.passed is True
+
+
+SLUG_REFERENCE = """
+def allocate_slug(title, existing):
+    slug = []
+    in_separator = False
+    for character in title.lower():
+        if character.isascii() and character.isalnum():
+            slug.append(character)
+            in_separator = False
+        elif slug and not in_separator:
+            slug.append("-")
+            in_separator = True
+    base = "".join(slug).strip("-") or "item"
+    candidate = base
+    suffix = 2
+    while candidate in existing:
+        candidate = f"{base}-{suffix}"
+        suffix += 1
+    return candidate
+"""
+
+
+def test_session_evaluation_isolates_each_candidate_in_one_sandbox(
+    tmp_path: Path,
+) -> None:
+    task = get_task("forge_easy_08")
+    sources = {
+        "correct": SLUG_REFERENCE,
+        "raises": "def allocate_slug(title, existing):\n    raise KeyError(title)\n",
+        "loops": "def allocate_slug(title, existing):\n    while True:\n        pass\n",
+        "broken": "import not_a_real_module\n",
+        "exits": "import os\n\ndef allocate_slug(title, existing):\n    os._exit(3)\n",
+    }
+    candidates = []
+    for name, source in sources.items():
+        path = tmp_path / f"{name}.py"
+        path.write_text(source, encoding="utf-8")
+        limit = 0.5 if name == "loops" else task.time_limit_seconds
+        candidates.append((task.model_copy(update={"time_limit_seconds": limit}), path))
+    runner = RecordingLocalRunner()
+
+    results = evaluate_candidates_in_session(candidates, runner)
+
+    assert runner.requests == 1
+    assert [result.passed for result in results] == [True, False, False, False, False]
+    assert results[1].error == "candidate raised KeyError during hidden case 0"
+    assert results[2].error == "candidate exceeded 0.5s time limit"
+    assert results[3].error == "candidate import failed: ModuleNotFoundError"
+    assert results[4].error == "sandbox worker exited with 3"
+
+
+def test_session_evaluation_survives_candidates_with_large_output(
+    tmp_path: Path,
+) -> None:
+    task = get_task("forge_easy_08")
+    # Each verbose candidate fits a one-shot sandbox's output, but two do not.
+    size = 20000 // len(HIDDEN_CASES[task.id])
+    verbose = f"def allocate_slug(title, existing):\n    return 'x' * {size}\n"
+    sources = {
+        "verbose": verbose,
+        "correct": SLUG_REFERENCE,
+        "oversized": "def allocate_slug(title, existing):\n    return 'x' * 40000\n",
+        "also_verbose": verbose,
+        "also_correct": SLUG_REFERENCE,
+    }
+    candidates = []
+    for name, source in sources.items():
+        path = tmp_path / f"{name}.py"
+        path.write_text(source, encoding="utf-8")
+        candidates.append((task, path))
+    runner = RecordingLocalRunner()
+
+    results = evaluate_candidates_in_session(candidates, runner)
+
+    assert [result.passed for result in results] == [False, True, False, False, True]
+    assert results[0].error == "hidden case failed during hidden case 0"
+    assert results[2].error == "candidate produced invalid evaluator output"
+    assert results[3].error == "hidden case failed during hidden case 0"
+
+
+class RecordingLocalRunner(LocalProcessSandboxRunner):
+    def __init__(self) -> None:
+        super().__init__(isolate_network=False)
+        self.requests = 0
+
+    def run(self, request: SandboxRequest) -> SandboxResult:
+        self.requests += 1
+        return super().run(request)
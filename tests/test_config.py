@@ -25,6 +25,16 @@ def test_sandbox_limits_are_typed_and_bounded() -> None:
         Settings(sandbox_process_limit=2)
 
 
+def test_docker_pool_is_disabled_by_default_and_bounded() -> None:
+    settings = Settings(docker_pool_size=2, docker_pool_max_uses=10)
+
+    assert Settings().docker_pool_size == 0
+    assert settings.docker_pool_max_uses == 10
+    assert settings.docker_pool_health_check is True
+    with pytest.raises(ValueError):
+        Settings(docker_pool_max_uses=0)
+
+
 def test_public_demo_controls_are_typed_and_bounded() -> None:
     settings = Settings(
         max_daily_model_runs=5,
@@ -36,6 +46,14 @@ def test_public_demo_controls_are_typed_and_bounded() -> None:
     assert settings.max_active_runs == 1
     assert settings.max_daily_model_runs == 5
     with pytest.raises(ValueError):
-        Settings(max_active_runs=2)
+        Settings(max_active_runs=17)
     with pytest.raises(ValueError):
         Settings(run_timeout_seconds=0)
+
+
+def test_fused_rag_ranking_requires_the_matrix_backend() -> None:
+    settings = Settings(rag_backend="matrix", rag_ranking="rrf")
+
+    assert settings.rag_ranking == "rrf"
+    with pytest.raises(ValueError, match="matrix RAG backend"):
+        Settings(rag_backend="chroma", rag_ranking="weighted")
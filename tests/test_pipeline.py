@@ -1,4 +1,8 @@
+import asyncio
+import threading
+from collections.abc import Callable
 from types import SimpleNamespace
+from typing import Any
 
 import pytest
 from crewai.crews.crew_output import CrewOutput
@@ -9,6 +13,13 @@ from backend.models import DevelopmentPlan, RunAgent, RunStage, RunState, RunSta
 from backend.pipeline import DevelopmentCrew, _parse_json
 
 
+def _awaitable(function: Callable[..., Any]) -> Callable[..., Any]:
+    async def stage(*args: Any, **kwargs: Any) -> Any:
+        return function(*args, **kwargs)
+
+    return stage
+
+
 def test_parse_json_uses_typed_crew_output() -> None:
     plan = DevelopmentPlan(
         file_name="solution.py",
@@ -93,16 +104,16 @@ def test_run_tests_normalizes_explicit_function_import(
     monkeypatch.setattr(
         crew,
         "run_tests_tool",
-        SimpleNamespace(run=lambda **_kwargs: "ALL TESTS PASSED"),
+        SimpleNamespace(arun=_awaitable(lambda **_kwargs: "ALL TESTS PASSED")),
     )
 
-    assert crew._run_tests(plan) == "ALL TESTS PASSED"
+    assert asyncio.run(crew._run_tests(plan)) == "ALL TESTS PASSED"
     assert crew.state.workspace.read("test_solution.py") == (
         "from solution import solve\n\ndef test_solve():\n    assert solve(1) == 1\n"
     )
 
 
-def test_pipeline_tracks_the_agent_currently_owning_the_work(
+def test_pipeline_writes_code_and_tests_concurrently(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     crew = DevelopmentCrew("build a solution", Settings(openai_api_key="test-key"))
@@ -112,23 +123,111 @@ def test_pipeline_tracks_the_agent_currently_owning_the_work(
         developer_task="Implement the solution.",
         tester_task="Test the solution.",
     )
-    observed_agents: list[RunAgent | None] = []
+    observed_agents: list[tuple[RunAgent, ...]] = []
+    started: list[str] = []
+
+    def author(name: str) -> Callable[..., Any]:
+        async def stage(_plan: DevelopmentPlan, _task: str) -> None:
+            observed_agents.append(crew.state.active_agents)
+            started.append(name)
+            while len(started) < 2:
+                await asyncio.sleep(0)
+
+        return stage
+
+    monkeypatch.setattr(crew, "_run_developer", author("developer"))
+    monkeypatch.setattr(crew, "_run_test_author", author("tester"))
+    monkeypatch.setattr(
+        crew, "_run_tests", _awaitable(lambda _plan: "ALL TESTS PASSED")
+    )
+
+    asyncio.run(asyncio.wait_for(crew._develop_and_test(plan), timeout=1))
+
+    assert sorted(started) == ["developer", "tester"]
+    assert observed_agents == [(RunAgent.hephaestus, RunAgent.argus)] * 2
+    assert crew.state.active_agents == (RunAgent.argus,)
+
+
+def test_concurrent_authoring_checks_cancellation_at_the_join(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cancel_requested = False
+
+    def is_cancel_requested() -> bool:
+        return cancel_requested
+
+    crew = DevelopmentCrew(
+        "build a solution",
+        Settings(openai_api_key="test-key"),
+        is_cancel_requested=is_cancel_requested,
+    )
+    plan = DevelopmentPlan(
+        file_name="solution.py",
+        test_file_name="test_solution.py",
+        developer_task="Implement the solution.",
+        tester_task="Test the solution.",
+    )
+
+    def request_cancel(_plan: DevelopmentPlan, _task: str) -> None:
+        nonlocal cancel_requested
+        cancel_requested = True
+
+    monkeypatch.setattr(crew, "_run_developer", _awaitable(request_cancel))
+    monkeypatch.setattr(crew, "_run_test_author", _awaitable(lambda *_args: None))
+    monkeypatch.setattr(
+        crew, "_run_tests", _awaitable(lambda _plan: pytest.fail("tests ran"))
+    )
+
+    with pytest.raises(pipeline_module.RunCancelled):
+        asyncio.run(crew._develop_and_test(plan))
+
+
+def test_self_healing_regenerates_both_files_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    crew = DevelopmentCrew(
+        "build a solution", Settings(openai_api_key="test-key", max_attempts=3)
+    )
+    plan = DevelopmentPlan(
+        file_name="solution.py",
+        test_file_name="test_solution.py",
+        developer_task="Implement the solution.",
+        tester_task="Test the solution.",
+    )
+    developer_tasks: list[str] = []
+    tester_tasks: list[str] = []
+    results = iter(["TESTS FAILED:\nFAILURE CLASS: candidate", "ALL TESTS PASSED"])
 
     monkeypatch.setattr(
         crew,
         "_run_developer",
-        lambda _plan, _task: observed_agents.append(crew.state.active_agent),
+        _awaitable(lambda _plan, task: developer_tasks.append(task)),
     )
     monkeypatch.setattr(
         crew,
         "_run_test_author",
-        lambda _plan, _task: observed_agents.append(crew.state.active_agent),
+        _awaitable(lambda _plan, task: tester_tasks.append(task)),
+    )
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: next(results)))
+    monkeypatch.setattr(
+        crew,
+        "_analyze_failure",
+        _awaitable(
+            lambda _plan, _result: {
+                "file_to_fix": "both",
+                "next_task": "Both files misread the request.",
+            }
+        ),
     )
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: "ALL TESTS PASSED")
-
-    crew._develop_and_test(plan)
 
-    assert observed_agents == [RunAgent.hephaestus, RunAgent.argus]
+    assert asyncio.run(crew._develop_and_test(plan)) == "ALL TESTS PASSED"
+    assert developer_tasks == [
+        "Implement the solution.",
+        "Both files misread the request.",
+    ]
+    assert len(tester_tasks) == 2
+    assert tester_tasks[1].endswith("Both files misread the request.")
+    assert crew.state.attempt_history[0].repair_target == "both"
 
 
 @pytest.mark.parametrize(
@@ -190,24 +289,26 @@ def test_self_healing_repairs_only_the_routed_file(
     monkeypatch.setattr(
         crew,
         "_run_developer",
-        lambda _plan, task: developer_tasks.append(task),
+        _awaitable(lambda _plan, task: developer_tasks.append(task)),
     )
     monkeypatch.setattr(
         crew,
         "_run_test_author",
-        lambda _plan, task: tester_tasks.append(task),
+        _awaitable(lambda _plan, task: tester_tasks.append(task)),
     )
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: next(results))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: next(results)))
     monkeypatch.setattr(
         crew,
         "_analyze_failure",
-        lambda _plan, _result: {
-            "file_to_fix": "solution.py",
-            "next_task": "Repair the candidate.",
-        },
+        _awaitable(
+            lambda _plan, _result: {
+                "file_to_fix": "solution.py",
+                "next_task": "Repair the candidate.",
+            }
+        ),
     )
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert result == "ALL TESTS PASSED"
     assert developer_tasks == ["Implement the solution.", "Repair the candidate."]
@@ -242,23 +343,27 @@ def test_self_healing_routes_test_repairs_without_rewriting_candidate(
     monkeypatch.setattr(
         crew,
         "_run_developer",
-        lambda _plan, task: developer_tasks.append(task),
+        _awaitable(lambda _plan, task: developer_tasks.append(task)),
     )
     monkeypatch.setattr(
         crew,
         "_run_test_author",
-        lambda _plan, task: tester_tasks.append(
-            (task, crew.state.workspace.read(plan.test_file_name))
+        _awaitable(
+            lambda _plan, task: tester_tasks.append(
+                (task, crew.state.workspace.read(plan.test_file_name))
+            )
         ),
     )
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: next(results))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: next(results)))
     monkeypatch.setattr(
         crew,
         "_analyze_failure",
-        lambda _plan, _result: pytest.fail("test failures must route directly"),
+        _awaitable(
+            lambda _plan, _result: pytest.fail("test failures must route directly")
+        ),
     )
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert result == "ALL TESTS PASSED"
     assert developer_tasks == ["Implement the solution."]
@@ -294,21 +399,21 @@ def test_timeout_routing_cannot_rewrite_tests(
     monkeypatch.setattr(
         crew,
         "_run_developer",
-        lambda _plan, task: developer_tasks.append(task),
+        _awaitable(lambda _plan, task: developer_tasks.append(task)),
     )
     monkeypatch.setattr(
         crew,
         "_run_test_author",
-        lambda _plan, task: tester_tasks.append(task),
+        _awaitable(lambda _plan, task: tester_tasks.append(task)),
     )
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: next(results))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: next(results)))
     monkeypatch.setattr(
         crew,
         "_analyze_failure",
-        lambda _plan, _result: pytest.fail("timeouts must route directly"),
+        _awaitable(lambda _plan, _result: pytest.fail("timeouts must route directly")),
     )
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert result == "ALL TESTS PASSED"
     assert developer_tasks[0] == "Implement the solution."
@@ -342,17 +447,19 @@ def test_request_contract_failure_routes_directly_to_developer(
     monkeypatch.setattr(
         crew,
         "_run_developer",
-        lambda _plan, task: developer_tasks.append(task),
+        _awaitable(lambda _plan, task: developer_tasks.append(task)),
     )
-    monkeypatch.setattr(crew, "_run_test_author", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: next(results))
+    monkeypatch.setattr(crew, "_run_test_author", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: next(results)))
     monkeypatch.setattr(
         crew,
         "_analyze_failure",
-        lambda _plan, _result: pytest.fail("contract failures route directly"),
+        _awaitable(
+            lambda _plan, _result: pytest.fail("contract failures route directly")
+        ),
     )
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert result == "ALL TESTS PASSED"
     assert developer_tasks[0] == "Implement the solution."
@@ -380,13 +487,15 @@ def test_run_tests_preflight_rejects_missing_explicit_function(
         crew,
         "run_tests_tool",
         SimpleNamespace(
-            run=lambda **_kwargs: pytest.fail(
-                "invalid artifacts must not reach the sandbox"
+            arun=_awaitable(
+                lambda **_kwargs: pytest.fail(
+                    "invalid artifacts must not reach the sandbox"
+                )
             )
         ),
     )
 
-    result = crew._run_tests(plan)
+    result = asyncio.run(crew._run_tests(plan))
 
     assert "FAILURE CLASS: candidate" in result
     assert "required_name" in result
@@ -416,18 +525,48 @@ def test_run_tests_preflight_rejects_test_without_application_import(
         crew,
         "run_tests_tool",
         SimpleNamespace(
-            run=lambda **_kwargs: pytest.fail(
-                "invalid artifacts must not reach the sandbox"
+            arun=_awaitable(
+                lambda **_kwargs: pytest.fail(
+                    "invalid artifacts must not reach the sandbox"
+                )
             )
         ),
     )
 
-    result = crew._run_tests(plan)
+    result = asyncio.run(crew._run_tests(plan))
 
     assert "FAILURE CLASS: test" in result
     assert "must import the application module" in result
 
 
+def test_crews_with_tools_run_off_the_shared_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    threads: dict[str, bool] = {}
+
+    class RecordingCrew:
+        def __init__(self, **kwargs: Any) -> None:
+            self.task = kwargs["tasks"][0]
+
+        def kickoff(self, *, inputs: dict[str, object]) -> str:
+            threads[self.task.name] = threading.current_thread() is loop_thread
+            return "done"
+
+        async def akickoff(self, *, inputs: dict[str, object]) -> str:
+            return self.kickoff(inputs=inputs)
+
+    monkeypatch.setattr(pipeline_module, "Crew", RecordingCrew)
+    crew = DevelopmentCrew("build a solution", Settings(openai_api_key="test-key"))
+    crew.tasks.brief.name = "brief"
+    crew.tasks.develop.name = "develop"
+    loop_thread = threading.current_thread()
+
+    asyncio.run(crew._kickoff("liaison", crew.tasks.brief, inputs={}))
+    asyncio.run(crew._kickoff("developer", crew.tasks.develop, inputs={}))
+
+    assert threads == {"brief": True, "develop": False}
+
+
 def test_repair_crews_receive_original_artifacts_and_requirements(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -459,9 +598,9 @@ def test_repair_crews_receive_original_artifacts_and_requirements(
         "test_solution.py", "def test_answer(): assert answer() == 2\n"
     )
 
-    crew._run_developer(plan, "Repair the return value.")
-    crew._run_test_author(plan, "Repair the assertion.")
-    crew._analyze_failure(plan, "TESTS FAILED")
+    asyncio.run(crew._run_developer(plan, "Repair the return value."))
+    asyncio.run(crew._run_test_author(plan, "Repair the assertion."))
+    asyncio.run(crew._analyze_failure(plan, "TESTS FAILED"))
 
     assert captured_inputs[0]["original_developer_task"] == plan.developer_task
     assert captured_inputs[0]["user_request"] == "build a solution"
@@ -496,12 +635,12 @@ def test_self_healing_stops_after_three_candidate_attempts(
             "next_task": f"Repair candidate {repairs}.",
         }
 
-    monkeypatch.setattr(crew, "_run_developer", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_test_author", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: failure)
-    monkeypatch.setattr(crew, "_analyze_failure", analyze_failure)
+    monkeypatch.setattr(crew, "_run_developer", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_test_author", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: failure))
+    monkeypatch.setattr(crew, "_analyze_failure", _awaitable(analyze_failure))
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert result == failure
     assert crew.state.attempts == 3
@@ -526,11 +665,11 @@ def test_infrastructure_retries_do_not_consume_candidate_attempt(
         ]
     )
 
-    monkeypatch.setattr(crew, "_run_developer", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_test_author", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: next(executions))
+    monkeypatch.setattr(crew, "_run_developer", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_test_author", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(lambda _plan: next(executions)))
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert result == "ALL TESTS PASSED"
     assert crew.state.attempts == 1
@@ -549,11 +688,13 @@ def test_repeated_infrastructure_failures_stop_without_consuming_attempt(
     )
     infrastructure_failure = "TESTS FAILED:\nFAILURE CLASS: infrastructure"
 
-    monkeypatch.setattr(crew, "_run_developer", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_test_author", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_tests", lambda _plan: infrastructure_failure)
+    monkeypatch.setattr(crew, "_run_developer", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_test_author", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(
+        crew, "_run_tests", _awaitable(lambda _plan: infrastructure_failure)
+    )
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert "INFRASTRUCTURE RETRIES EXHAUSTED" in result
     assert crew.state.attempts == 0
@@ -578,11 +719,11 @@ def test_non_retryable_infrastructure_failure_stops_after_one_test_run(
         executions += 1
         return "TESTS FAILED:\nFAILURE CLASS: infrastructure\nRETRYABLE: no"
 
-    monkeypatch.setattr(crew, "_run_developer", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_test_author", lambda _plan, _task: None)
-    monkeypatch.setattr(crew, "_run_tests", missing_dependency)
+    monkeypatch.setattr(crew, "_run_developer", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_test_author", _awaitable(lambda _plan, _task: None))
+    monkeypatch.setattr(crew, "_run_tests", _awaitable(missing_dependency))
 
-    result = crew._develop_and_test(plan)
+    result = asyncio.run(crew._develop_and_test(plan))
 
     assert "SANDBOX CONFIGURATION FAILURE" in result
     assert executions == 1
@@ -606,6 +747,9 @@ def test_run_reports_infrastructure_exhaustion_separately(
         def __init__(self, **_kwargs: object) -> None:
             pass
 
+        async def akickoff(self, *, inputs: dict[str, object]) -> str:
+            return self.kickoff(inputs=inputs)
+
         def kickoff(self, *, inputs: dict[str, object]) -> str:
             StubCrew.calls += 1
             if StubCrew.calls == 1:
@@ -618,8 +762,12 @@ def test_run_reports_infrastructure_exhaustion_separately(
             )
 
     monkeypatch.setattr(pipeline_module, "Crew", StubCrew)
-    monkeypatch.setattr(crew, "_develop_and_test", lambda _plan: infrastructure_failure)
-    monkeypatch.setattr(crew, "_generate_final_report", lambda *_args: "Report")
+    monkeypatch.setattr(
+        crew, "_develop_and_test", _awaitable(lambda _plan: infrastructure_failure)
+    )
+    monkeypatch.setattr(
+        crew, "_generate_final_report", _awaitable(lambda *_args: "Report")
+    )
 
     result = crew.run()
 
@@ -628,3 +776,33 @@ def test_run_reports_infrastructure_exhaustion_separately(
     assert crew.state.events[-1].message == (
         "The run stopped after repeated sandbox infrastructure failures."
     )
+
+
+def test_cancelling_the_pipeline_task_stops_the_running_stage(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class HangingCrew:
+        def __init__(self, **_kwargs: object) -> None:
+            pass
+
+        async def akickoff(self, *, inputs: dict[str, object]) -> str:
+            started.set()
+            await asyncio.sleep(60)
+            return "Brief"
+
+    monkeypatch.setattr(pipeline_module, "Crew", HangingCrew)
+    crew = DevelopmentCrew("build a solution", Settings(openai_api_key="test-key"))
+
+    async def cancel_during_briefing() -> None:
+        task = asyncio.create_task(crew.arun())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    started = asyncio.Event()
+    asyncio.run(cancel_during_briefing())
+
+    assert crew.state.status is RunStatus.cancelled
+    assert crew.state.stage is RunStage.cancelled
+    assert crew.state.report == "Run cancelled while a stage was in progress."
@@ -6,7 +6,7 @@ from rag.evaluation.runner import (
     RagEvaluationRunner,
     load_cases,
 )
-from rag.index import ChromaRetriever
+from rag.index import ChromaRetriever, MatrixRetriever
 
 
 class RequiredTermGenerator:
@@ -55,3 +55,21 @@ def test_no_rag_evaluation_keeps_retrieval_score_separate(tmp_path: Path) -> Non
     assert report.configuration == "no_rag"
     assert report.results[0].retrieval_passed is None
     assert report.results[0].retrieved_source_ids == ()
+
+
+def test_hybrid_retrieval_is_measured_at_a_smaller_result_limit(
+    tmp_path: Path,
+) -> None:
+    report = RagEvaluationRunner(
+        MatrixRetriever(ranking="rrf"),
+        RequiredTermGenerator(),
+        "test-model",
+        tmp_path,
+        use_retrieval=True,
+        result_limit=1,
+    ).run()
+
+    assert report.retrieval_ranking == "rrf"
+    assert report.result_limit == 1
+    assert all(result.retrieval_passed for result in report.results)
+    assert all(len(result.retrieved_source_ids) == 1 for result in report.results)
@@ -1,14 +1,29 @@
+import hashlib
 import json
+from collections.abc import Sequence
 from pathlib import Path
 
+import numpy as np
+import numpy.typing as npt
 import pytest
 
 from rag.index import (
+    _TOKEN,
     DEFAULT_MANIFEST_PATH,
+    EMBEDDING_DIMENSIONS,
     ChromaRetriever,
+    MatrixRetriever,
+    RankingMode,
+    _embedding_text,
     build_index,
+    embed_text,
+    embed_texts,
+    get_retriever,
+    iter_chunks,
+    load_chunks,
     load_manifest,
 )
+from rag.models import LexicalIndex
 
 
 def test_bundled_index_retrieves_each_expected_api_source() -> None:
@@ -81,3 +96,188 @@ def test_retriever_rejects_manifest_that_does_not_match_index(
 
     with pytest.raises(ValueError, match="manifest does not match"):
         ChromaRetriever(manifest_path=manifest_path)
+
+
+def test_batch_embeddings_match_single_text_embeddings() -> None:
+    chunks = load_chunks(load_manifest())
+    values = ["", "!!!", *(f"{chunk.heading} {chunk.content}" for chunk in chunks)]
+
+    matrix = embed_texts(values)
+
+    assert matrix.shape == (len(values), EMBEDDING_DIMENSIONS)
+    assert matrix.dtype == np.float32
+    for row, value in zip(matrix, values, strict=True):
+        assert row.tobytes() == np.asarray(embed_text(value), np.float32).tobytes()
+
+
+def test_matrix_retriever_matches_chroma_ranking() -> None:
+    chroma = ChromaRetriever()
+    matrix = MatrixRetriever()
+    queries = (
+        "OpenAI Responses store false output_text",
+        "FastAPI POST endpoint input validation Pydantic model example",
+        "pydantic BaseSettings env_file",
+        "zzzxxyy unrelated",
+    )
+
+    for query in queries:
+        for limit in (1, 3, 5):
+            expected = chroma.retrieve(query, limit)
+            actual = matrix.retrieve(query, limit)
+            assert [result.chunk_id for result in actual] == [
+                result.chunk_id for result in expected
+            ]
+            assert [result.distance for result in actual] == pytest.approx(
+                [result.distance for result in expected], abs=1e-5
+            )
+
+
+def test_index_build_writes_matrix_for_memory_mapped_retrieval(
+    tmp_path: Path,
+) -> None:
+    index_path = tmp_path / "index"
+    build_index(DEFAULT_MANIFEST_PATH, index_path)
+
+    retriever = MatrixRetriever(index_path)
+    results = retriever.retrieve("Modal Sandbox create exec wait", limit=3)
+
+    assert np.load(index_path / "embeddings.npy").shape == (12, EMBEDDING_DIMENSIONS)
+    assert "modal-sandbox-1-5-1" in {result.source_id for result in results}
+
+
+def test_lexical_index_caches_chunk_tokens_and_postings(tmp_path: Path) -> None:
+    index_path = tmp_path / "index"
+    build_index(DEFAULT_MANIFEST_PATH, index_path)
+
+    lexical = LexicalIndex.model_validate_json(
+        (index_path / "lexical.json").read_text(encoding="utf-8")
+    )
+    chunks = json.loads((index_path / "chunks.json").read_text(encoding="utf-8"))
+
+    for chunk in chunks:
+        text = f"{chunk['metadata']} {chunk['document']}".lower()
+        tokens = lexical.chunk_tokens[chunk["id"]]
+        assert set(tokens) == set(_TOKEN.findall(text))
+        assert all(chunk["id"] in lexical.postings[token] for token in tokens)
+
+
+@pytest.mark.parametrize("ranking", ["rrf", "weighted"])
+def test_hybrid_ranking_retrieves_expected_sources(ranking: RankingMode) -> None:
+    retriever = MatrixRetriever(ranking=ranking)
+
+    results = retriever.retrieve("Pydantic Settings env nested delimiter", limit=1)
+
+    assert [result.source_id for result in results] == ["pydantic-settings-2-10-1"]
+    assert retriever.retrieve("zzzxxyy unrelated", limit=3) == ()
+    with pytest.raises(ValueError, match="matrix"):
+        get_retriever(backend="chroma", ranking=ranking)
+
+
+def test_incremental_build_reembeds_only_changed_sources(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source_root = DEFAULT_MANIFEST_PATH.parent
+    copied_root = tmp_path / "sources"
+    (copied_root / "content").mkdir(parents=True)
+    manifest_data = json.loads(DEFAULT_MANIFEST_PATH.read_text(encoding="utf-8"))
+    for source in manifest_data["sources"]:
+        target = copied_root / source["content_path"]
+        target.write_bytes((source_root / source["content_path"]).read_bytes())
+    manifest_path = copied_root / "v1.json"
+    manifest_path.write_text(json.dumps(manifest_data), encoding="utf-8")
+    index_path = tmp_path / "index"
+    build_index(manifest_path, index_path)
+
+    changed = manifest_data["sources"][0]
+    content = "# Only section\n\nReplacement guidance for the incremental build.\n"
+    (copied_root / changed["content_path"]).write_text(content, encoding="utf-8")
+    changed["sha256"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    manifest_path.write_text(json.dumps(manifest_data), encoding="utf-8")
+    embedded: list[str] = []
+
+    def recording_embed_texts(values: Sequence[str]) -> npt.NDArray[np.float32]:
+        embedded.extend(values)
+        return embed_texts(values)
+
+    monkeypatch.setattr("rag.index.embed_texts", recording_embed_texts)
+    metadata = build_index(manifest_path, index_path)
+
+    chunks = load_chunks(load_manifest(manifest_path), manifest_path)
+    changed_chunks = [chunk for chunk in chunks if chunk.source.id == changed["id"]]
+    assert embedded == [_embedding_text(chunk) for chunk in changed_chunks]
+    stored = json.loads((index_path / "chunks.json").read_text(encoding="utf-8"))
+    assert metadata.chunk_count == len(chunks)
+    assert [entry["id"] for entry in stored] == [chunk.id for chunk in chunks]
+    rebuilt = embed_texts([_embedding_text(chunk) for chunk in chunks])
+    assert np.load(index_path / "embeddings.npy").tobytes() == rebuilt.tobytes()
+    ChromaRetriever(index_path, manifest_path)
+
+    embedded.clear()
+    build_index(manifest_path, index_path)
+    assert embedded == []
+    build_index(manifest_path, index_path, full=True)
+    assert len(embedded) == len(chunks)
+
+
+def test_streamed_build_merges_reused_chunks_in_order_and_cleans_up(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("rag.index.UPSERT_BATCH_SIZE", 2)
+    source_root = DEFAULT_MANIFEST_PATH.parent
+    copied_root = tmp_path / "sources"
+    (copied_root / "content").mkdir(parents=True)
+    manifest_data = json.loads(DEFAULT_MANIFEST_PATH.read_text(encoding="utf-8"))
+    for source in manifest_data["sources"]:
+        target = copied_root / source["content_path"]
+        target.write_bytes((source_root / source["content_path"]).read_bytes())
+    manifest_path = copied_root / "v1.json"
+    manifest_path.write_text(json.dumps(manifest_data), encoding="utf-8")
+    index_path = tmp_path / "index"
+    full_path = tmp_path / "full"
+    build_index(manifest_path, index_path)
+
+    changed = manifest_data["sources"][len(manifest_data["sources"]) // 2]
+    content = "# Only section\n\nReplacement guidance in the middle of the corpus.\n"
+    (copied_root / changed["content_path"]).write_text(content, encoding="utf-8")
+    changed["sha256"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    manifest_path.write_text(json.dumps(manifest_data), encoding="utf-8")
+    build_index(manifest_path, index_path)
+    build_index(manifest_path, full_path, full=True)
+
+    for name in ("chunks.json", "embeddings.npy", "lexical.json"):
+        assert (index_path / name).read_bytes() == (full_path / name).read_bytes()
+
+    (copied_root / manifest_data["sources"][-1]["content_path"]).write_text("tampered")
+    with pytest.raises(ValueError, match="digest mismatch"):
+        build_index(manifest_path, index_path, full=True)
+    assert not [
+        path.name
+        for path in index_path.iterdir()
+        if path.suffix in {".tmp", ".rows", ".npy"} and path.name != "embeddings.npy"
+    ]
+
+
+def test_parallel_chunk_stream_matches_serial_load_and_verifies_digests(
+    tmp_path: Path,
+) -> None:
+    manifest = load_manifest()
+    serial = load_chunks(manifest)
+
+    assert tuple(iter_chunks(manifest, workers=2)) == serial
+    assert tuple(iter_chunks(manifest, skip={serial[0].source.id}, workers=2)) == (
+        tuple(chunk for chunk in serial if chunk.source.id != serial[0].source.id)
+    )
+
+    copied_root = tmp_path / "sources"
+    (copied_root / "content").mkdir(parents=True)
+    for source in manifest.sources:
+        target = copied_root / source.content_path
+        target.write_bytes(
+            (DEFAULT_MANIFEST_PATH.parent / source.content_path).read_bytes()
+        )
+    (copied_root / manifest.sources[-1].content_path).write_text("tampered")
+    manifest_path = copied_root / "v1.json"
+    manifest_path.write_bytes(DEFAULT_MANIFEST_PATH.read_bytes())
+
+    with pytest.raises(ValueError, match="digest mismatch"):
+        tuple(iter_chunks(manifest, manifest_path, workers=2))
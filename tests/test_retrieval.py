@@ -2,8 +2,8 @@ from backend.agents import build_agents
 from backend.models import RunState
 from backend.retrieval import build_retrieval_tools
 from backend.tasks import build_tasks
-from rag.index import ChromaRetriever
-from rag.models import RetrievalEvent
+from rag.index import CachedRetriever, ChromaRetriever, RankingMode
+from rag.models import RetrievalEvent, RetrievedSource
 
 
 def test_retrieval_tool_logs_cited_sources_per_run() -> None:
@@ -67,3 +67,36 @@ def test_retrieval_events_are_isolated_between_runs() -> None:
 
     assert len(first.retrieval_events) == 1
     assert second.retrieval_events == []
+
+
+class CountingRetriever:
+    ranking: RankingMode = "lexical"
+
+    def __init__(self) -> None:
+        self.inner = ChromaRetriever()
+        self.metadata = self.inner.metadata
+        self.queries: list[str] = []
+
+    def retrieve(self, query: str, limit: int = 3) -> tuple[RetrievedSource, ...]:
+        self.queries.append(query)
+        return self.inner.retrieve(query, limit)
+
+
+def test_query_cache_serves_normalized_repeats_and_still_logs_events() -> None:
+    counting = CountingRetriever()
+    cache = CachedRetriever(counting, max_entries=1)
+    events: list[RetrievalEvent] = []
+    tool = build_retrieval_tools(cache, events, result_limit=2)[0]
+
+    first = tool.run(query="pydantic BaseSettings env_file")
+    second = tool.run(query="  Pydantic   basesettings ENV_FILE? ")
+    tool.run(query="Modal Sandbox create exec wait")
+    tool.run(query="pydantic BaseSettings env_file")
+
+    assert first == second
+    assert len(counting.queries) == 3
+    assert [event.results for event in events[:2]] == [events[0].results] * 2
+    assert len(events) == 4
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 3, 1)
+    assert stats.hit_rate == 0.25
@@ -1,5 +1,8 @@
+import asyncio
 import io
+import os
 import subprocess
+import sys
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
@@ -8,12 +11,19 @@ import pytest
 
 from backend.sandbox import (
     MAX_SANDBOX_OUTPUT_CHARACTERS,
+    DockerContainerPool,
     DockerSandboxRunner,
+    LocalProcessSandboxRunner,
+    ModalSandboxPool,
     ModalSandboxRunner,
     SandboxFile,
     SandboxLimits,
     SandboxRequest,
     SandboxResult,
+    build_sandbox_runner,
+    invalidate_modal_handles,
+    modal_image_digest,
+    run_sandbox_batch,
 )
 from backend.sandbox_dependencies import SANDBOX_PACKAGES, SUPPORTED_SANDBOX_IMPORTS
 from benchmark.catalog import get_task
@@ -92,6 +102,46 @@ def test_docker_runner_enforces_isolation_and_resource_limits() -> None:
     assert "timeout" in command_runner.command
 
 
+def test_runner_identities_follow_image_content() -> None:
+    image_id = ["sha256:aaa"]
+
+    def inspect(
+        command: Sequence[str], **kwargs: Any
+    ) -> subprocess.CompletedProcess[str]:
+        return subprocess.CompletedProcess(command, 0, f"{image_id[0]}\n", "")
+
+    runner = DockerSandboxRunner(command_runner=inspect)
+    assert runner.identity == f"docker:{runner.image}@sha256:aaa"
+    image_id[0] = "sha256:bbb"
+    assert runner.identity == f"docker:{runner.image}@sha256:aaa"
+    runner.warm()
+    assert runner.identity == f"docker:{runner.image}@sha256:bbb"
+
+    modal = ModalSandboxRunner()
+    assert modal.identity == f"modal:{modal.app_name}@sha256:{modal_image_digest()}"
+    assert modal_image_digest() != modal_image_digest(SANDBOX_PACKAGES[1:])
+
+
+def _fake_docker(directory: Path) -> Path:
+    """Install a ``docker`` executable on PATH that logs its arguments."""
+    log = directory / "docker.log"
+    docker = directory / "docker"
+    docker.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, time\n"
+        f"with open({str(log)!r}, 'a') as log:\n"
+        "    print(' '.join(sys.argv[1:]), file=log)\n"
+        "if sys.argv[1] == 'run':\n"
+        "    sys.stdin.read()\n"
+        "    if sys.argv[-1] == 'hang':\n"
+        "        time.sleep(60)\n"
+        "    print('ran', sys.argv[-1])\n",
+        encoding="utf-8",
+    )
+    docker.chmod(0o755)
+    return log
+
+
 class TimingOutCommandRunner:
     def __init__(self) -> None:
         self.commands: list[list[str]] = []
@@ -106,6 +156,40 @@ class TimingOutCommandRunner:
         return subprocess.CompletedProcess(command, 0, "", "")
 
 
+def test_docker_arun_awaits_the_cli_and_removes_cancelled_containers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log = _fake_docker(tmp_path)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    runner = DockerSandboxRunner()
+
+    result = asyncio.run(runner.arun(_request()))
+
+    assert result.exit_code == 0
+    assert result.stdout == "ran /workspace/main.py\n"
+    assert "--network=none" in log.read_text(encoding="utf-8")
+
+    async def cancel_hanging_run() -> None:
+        task = asyncio.create_task(
+            runner.arun(_request().model_copy(update={"command": ("hang",)}))
+        )
+        while "hang" not in log.read_text(encoding="utf-8"):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(cancel_hanging_run(), timeout=30))
+
+    hanging, removal = log.read_text(encoding="utf-8").splitlines()[-2:]
+    container_name = next(
+        part.removeprefix("--name=")
+        for part in hanging.split()
+        if part.startswith("--name=")
+    )
+    assert removal == f"rm --force {container_name}"
+
+
 def test_docker_runner_force_removes_container_after_host_timeout() -> None:
     command_runner = TimingOutCommandRunner()
     runner = DockerSandboxRunner(command_runner=command_runner)
@@ -126,6 +210,197 @@ def test_docker_runner_force_removes_container_after_host_timeout() -> None:
     ]
 
 
+class PoolCommandRunner:
+    def __init__(self, exec_exit_code: int = 0) -> None:
+        self.commands: list[list[str]] = []
+        self.exec_exit_code = exec_exit_code
+        self.files: dict[str, str] = {}
+
+    def __call__(
+        self, command: Sequence[str], **kwargs: Any
+    ) -> subprocess.CompletedProcess[str]:
+        captured = list(command)
+        self.commands.append(captured)
+        if captured[:2] == ["docker", "inspect"]:
+            return subprocess.CompletedProcess(command, 0, "true\n", "")
+        if captured[:3] == ["docker", "exec", "--interactive"]:
+            name = captured[3]
+            start = next(
+                started
+                for started in self.commands
+                if started[:2] == ["docker", "run"] and f"--name={name}" in started
+            )
+            mount = next(part for part in start if part.startswith("--mount="))
+            source = mount.split("src=", 1)[1].split(",dst=", 1)[0]
+            self.files = {
+                path.name: path.read_text(encoding="utf-8")
+                for path in Path(source).iterdir()
+            }
+            return subprocess.CompletedProcess(
+                command, self.exec_exit_code, "pooled\n", ""
+            )
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    def started(self) -> list[list[str]]:
+        return [
+            command for command in self.commands if command[:2] == ["docker", "run"]
+        ]
+
+    def removed(self) -> list[list[str]]:
+        return [command for command in self.commands if command[:2] == ["docker", "rm"]]
+
+
+def _pool(command_runner: PoolCommandRunner, **kwargs: Any) -> DockerContainerPool:
+    return DockerContainerPool(
+        limits=_request().limits, command_runner=command_runner, **kwargs
+    )
+
+
+def test_docker_pool_reuses_locked_down_containers_through_exec() -> None:
+    command_runner = PoolCommandRunner()
+    pool = _pool(command_runner, size=1)
+    pool.warm()
+    runner = DockerSandboxRunner(command_runner=command_runner, pool=pool)
+
+    first = runner.run(_request())
+    second = runner.run(_request())
+
+    started = command_runner.started()
+    assert first.stdout == second.stdout == "pooled\n"
+    assert len(started) == 1
+    assert "--detach" in started[0]
+    assert "--network=none" in started[0]
+    assert "--read-only" in started[0]
+    assert "--cap-drop=ALL" in started[0]
+    assert "--pids-limit=8" in started[0]
+    assert command_runner.files == {"main.py": "print('sandboxed')\n"}
+    executions = [
+        command
+        for command in command_runner.commands
+        if command[:3] == ["docker", "exec", "--interactive"]
+    ]
+    assert len(executions) == 2
+    assert "timeout" in executions[0]
+    assert command_runner.removed() == []
+
+
+def test_docker_pool_recycles_containers_after_max_uses_and_timeouts() -> None:
+    command_runner = PoolCommandRunner()
+    runner = DockerSandboxRunner(
+        command_runner=command_runner, pool=_pool(command_runner, max_uses=2)
+    )
+
+    for _ in range(3):
+        runner.run(_request())
+
+    assert len(command_runner.started()) == 2
+    assert len(command_runner.removed()) == 1
+
+    timing_out = PoolCommandRunner(exec_exit_code=124)
+    runner = DockerSandboxRunner(
+        command_runner=timing_out, pool=_pool(timing_out, max_uses=10)
+    )
+
+    result = runner.run(_request())
+
+    assert result.timed_out is True
+    assert len(timing_out.removed()) == 1
+
+
+def test_docker_pool_falls_back_to_cold_start_for_other_limits() -> None:
+    command_runner = PoolCommandRunner()
+    pool = DockerContainerPool(limits=SandboxLimits(), command_runner=command_runner)
+    runner = DockerSandboxRunner(command_runner=command_runner, pool=pool)
+
+    runner.run(_request())
+
+    assert len(command_runner.started()) == 1
+    assert "--rm" in command_runner.started()[0]
+    assert "--detach" not in command_runner.started()[0]
+
+
+class LocalBatchCommandRunner:
+    """Stand in for ``docker run`` by executing the batch driver on the host."""
+
+    def __init__(self) -> None:
+        self.sessions: list[list[str]] = []
+
+    def __call__(
+        self, command: Sequence[str], **kwargs: Any
+    ) -> subprocess.CompletedProcess[str]:
+        captured = list(command)
+        self.sessions.append(captured)
+        mount = next(part for part in captured if part.startswith("--mount="))
+        source = mount.split("src=", 1)[1].split(",dst=", 1)[0]
+        driver = captured.index("/workspace/batch_driver.py")
+        return subprocess.run(
+            [
+                sys.executable,
+                f"{source}/batch_driver.py",
+                *captured[driver + 1 :],
+            ],
+            input=kwargs["input"].replace("/workspace", source),
+            capture_output=True,
+            text=True,
+            timeout=kwargs["timeout"],
+            check=False,
+        )
+
+
+def _script_request(content: str, wall_time_seconds: float = 5) -> SandboxRequest:
+    return SandboxRequest(
+        files=(SandboxFile(path="main.py", content=content),),
+        command=("python", "-B", "/workspace/main.py"),
+        limits=SandboxLimits(wall_time_seconds=wall_time_seconds),
+    )
+
+
+def test_docker_run_many_shares_one_session_with_isolated_workspaces() -> None:
+    command_runner = LocalBatchCommandRunner()
+    runner = DockerSandboxRunner(command_runner=command_runner)
+    requests = [
+        _script_request("import os\nprint(os.listdir('.'))\n"),
+        _script_request("raise SystemExit(3)\n"),
+        _script_request("while True:\n    pass\n", wall_time_seconds=0.5),
+    ]
+
+    results = runner.run_many(requests, max_parallel=2)
+
+    assert len(command_runner.sessions) == 1
+    assert "--memory=512m" in command_runner.sessions[0]
+    assert results[0].exit_code == 0
+    assert results[0].stdout == "['main.py']\n"
+    assert results[1].exit_code == 3
+    assert results[2].timed_out is True
+    assert results[2].exit_code == 124
+
+
+def test_run_sandbox_batch_runs_plain_runners_per_request_in_order() -> None:
+    class EchoRunner:
+        name = "stub"
+
+        def run(self, request: SandboxRequest) -> SandboxResult:
+            return SandboxResult(stdout=request.stdin, duration_seconds=0.01)
+
+    requests = [
+        _request().model_copy(update={"stdin": str(index)}) for index in range(5)
+    ]
+
+    results = run_sandbox_batch(EchoRunner(), requests, max_parallel=3)
+
+    assert [result.stdout for result in results] == ["0", "1", "2", "3", "4"]
+
+
+def test_run_many_groups_requests_by_container_limits() -> None:
+    command_runner = CapturingCommandRunner()
+    runner = DockerSandboxRunner(command_runner=command_runner)
+
+    results = runner.run_many([_request(), _script_request("print('other')\n")])
+
+    assert [result.stdout for result in results] == ["sandboxed\n", "sandboxed\n"]
+    assert command_runner.command[-3:] == ["python", "-B", "/workspace/main.py"]
+
+
 class FakeStreamWriter:
     def __init__(self) -> None:
         self.value = ""
@@ -168,12 +443,16 @@ class FakeSandbox:
         self.process = FakeProcess()
         self.exec_args: tuple[str, ...] = ()
         self.exec_kwargs: dict[str, Any] = {}
+        self.execs: list[tuple[str, ...]] = []
         self.terminated = False
         self.detached = False
 
     def exec(self, *args: str, **kwargs: Any) -> FakeProcess:
         self.exec_args = args
         self.exec_kwargs = kwargs
+        self.execs.append(args)
+        if len(self.execs) > 1:
+            self.process = FakeProcess()
         return self.process
 
     def terminate(self, *, wait: bool) -> None:
@@ -192,12 +471,15 @@ class FakeImage:
 class FakeModal:
     sandbox = FakeSandbox()
     create_kwargs: dict[str, Any] = {}
+    created = 0
+    lookups = 0
 
     class App:
         @staticmethod
         def lookup(name: str, *, create_if_missing: bool) -> str:
             assert name == "digital-forge-sandbox"
             assert create_if_missing is True
+            FakeModal.lookups += 1
             return "app"
 
     class Image:
@@ -210,6 +492,7 @@ class FakeModal:
         @staticmethod
         def create(**kwargs: Any) -> FakeSandbox:
             FakeModal.create_kwargs = kwargs
+            FakeModal.created += 1
             return FakeModal.sandbox
 
 
@@ -231,6 +514,157 @@ def test_modal_runner_enforces_limits_and_blocks_network() -> None:
     assert "8" in FakeModal.sandbox.exec_args
 
 
+def test_modal_runner_resolves_app_and_image_once_per_process() -> None:
+    invalidate_modal_handles()
+    FakeModal.lookups = 0
+    runner = ModalSandboxRunner(modal_module=FakeModal)
+
+    for _ in range(3):
+        FakeModal.sandbox = FakeSandbox()
+        runner.run(_request())
+    lookups_before_invalidation = FakeModal.lookups
+    invalidate_modal_handles()
+    FakeModal.sandbox = FakeSandbox()
+    runner.run(_request())
+
+    assert lookups_before_invalidation == 1
+    assert FakeModal.lookups == 2
+
+
+def test_modal_pool_reuses_sandboxes_until_idle_ttl_expires() -> None:
+    now = [0.0]
+    pool = ModalSandboxPool(size=1, idle_ttl_seconds=30, clock=lambda: now[0])
+    runner = ModalSandboxRunner(modal_module=FakeModal, pool=pool)
+    FakeModal.sandbox = FakeSandbox()
+    FakeModal.created = 0
+
+    first = runner.run(_request())
+    second = runner.run(_request())
+
+    assert first.stdout == second.stdout == "modal output\n"
+    assert FakeModal.created == 1
+    assert FakeModal.create_kwargs["idle_timeout"] == 30
+    assert FakeModal.sandbox.terminated is False
+    assert sum("-c" in args for args in FakeModal.sandbox.execs) == 2
+
+    reused = FakeModal.sandbox
+    now[0] = 31.0
+    FakeModal.sandbox = FakeSandbox()
+    runner.run(_request())
+
+    assert reused.terminated is True
+    assert FakeModal.created == 2
+
+
+def test_local_runner_maps_workspace_paths_and_captures_output() -> None:
+    request = SandboxRequest(
+        files=(
+            SandboxFile(path="pkg/values.py", content="VALUE = 42\n"),
+            SandboxFile(
+                path="main.py",
+                content=(
+                    "import sys\n"
+                    "from pkg.values import VALUE\n"
+                    "print(sys.stdin.read().strip(), VALUE)\n"
+                ),
+            ),
+        ),
+        command=("python", "-B", "/workspace/main.py"),
+        stdin="answer",
+        limits=SandboxLimits(wall_time_seconds=10),
+    )
+
+    result = LocalProcessSandboxRunner().run(request)
+
+    assert result.exit_code == 0, result.stderr or result.error
+    assert result.stdout == "answer 42\n"
+    assert result.timed_out is False
+    assert build_sandbox_runner("local").name == "local"
+
+
+def test_local_runner_kills_requests_after_wall_time() -> None:
+    request = SandboxRequest(
+        files=(SandboxFile(path="main.py", content="while True:\n    pass\n"),),
+        command=("python", "-B", "/workspace/main.py"),
+        limits=SandboxLimits(wall_time_seconds=0.5),
+    )
+
+    result = LocalProcessSandboxRunner().run(request)
+
+    assert result.timed_out is True
+    assert result.exit_code == 124
+    assert result.duration_seconds < 5
+
+
+def test_local_runner_enforces_address_space_limit() -> None:
+    request = SandboxRequest(
+        files=(
+            SandboxFile(
+                path="main.py", content="data = bytearray(512 * 1024 * 1024)\n"
+            ),
+        ),
+        command=("python", "-B", "/workspace/main.py"),
+        limits=SandboxLimits(wall_time_seconds=10, memory_mib=128),
+    )
+
+    result = LocalProcessSandboxRunner().run(request)
+
+    assert result.exit_code != 0
+    assert "MemoryError" in result.stderr
+
+
+@pytest.mark.skipif(
+    os.geteuid() == 0 and not LocalProcessSandboxRunner.network_isolation_available(),
+    reason="root ignores directory permissions outside a user namespace",
+)
+def test_local_runner_workspace_is_read_only_like_docker() -> None:
+    request = SandboxRequest(
+        files=(
+            SandboxFile(
+                path="main.py",
+                content=(
+                    "try:\n"
+                    "    open('out.txt', 'w')\n"
+                    "except PermissionError:\n"
+                    "    print('read-only')\n"
+                ),
+            ),
+        ),
+        command=("python", "-B", "/workspace/main.py"),
+        limits=SandboxLimits(wall_time_seconds=10),
+    )
+
+    result = LocalProcessSandboxRunner().run(request)
+
+    assert result.exit_code == 0, result.stderr or result.error
+    assert result.stdout == "read-only\n"
+
+
+def test_local_runner_applies_limits_to_concurrent_requests() -> None:
+    requests = tuple(
+        SandboxRequest(
+            files=(
+                SandboxFile(
+                    path="main.py",
+                    content=(
+                        "import resource\n"
+                        "print(resource.getrlimit(resource.RLIMIT_AS)[0])\n"
+                    ),
+                ),
+            ),
+            command=("python", "-B", "/workspace/main.py"),
+            limits=SandboxLimits(wall_time_seconds=10, memory_mib=memory_mib),
+        )
+        for memory_mib in (256, 384, 512, 640)
+    )
+
+    results = LocalProcessSandboxRunner().run_many(requests, max_parallel=4)
+
+    assert [result.stdout for result in results] == [
+        f"{memory_mib * 1024 * 1024}\n" for memory_mib in (256, 384, 512, 640)
+    ]
+
+
 def test_docker_and_modal_use_the_same_pinned_capability_set() -> None:
     requirements = tuple(
         line.strip()
@@ -364,3 +798,19 @@ def test_benchmark_evaluator_docker_smoke(tmp_path: Path) -> None:
     result = evaluate_candidate(get_task("forge_easy_02"), candidate)
 
     assert result.passed is True, result.error
+
+
+def test_docker_runner_warm_reports_a_missing_image() -> None:
+    commands: list[list[str]] = []
+
+    def command_runner(
+        command: Sequence[str], **kwargs: Any
+    ) -> subprocess.CompletedProcess[str]:
+        commands.append(list(command))
+        return subprocess.CompletedProcess(command, 1, "", "No such image")
+
+    runner = DockerSandboxRunner("missing:latest", command_runner=command_runner)
+
+    with pytest.raises(RuntimeError, match="missing:latest"):
+        runner.warm()
+    assert commands == [["docker", "image", "inspect", "missing:latest"]]
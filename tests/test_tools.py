@@ -1,4 +1,12 @@
+import asyncio
+from pathlib import Path
+
+from crewai.tools import BaseTool
+from crewai.utilities.agent_utils import convert_tools_to_openai_schema
+
+from backend.models import SandboxCacheStats
 from backend.sandbox import SandboxRequest, SandboxResult
+from backend.sandbox_cache import SandboxResultCache
 from backend.tools import build_file_system_tools
 from backend.workspace import RunWorkspace
 
@@ -47,6 +55,25 @@ def test_generated_tests_run_through_sandbox() -> None:
     assert runner.request.command[:4] == ("python", "-B", "-m", "pytest")
 
 
+def test_agents_can_run_tests_from_inside_a_running_event_loop() -> None:
+    workspace = RunWorkspace()
+    workspace.write("solution.py", "def answer(): return 42\n")
+    workspace.write("test_solution.py", "def test_answer(): assert True\n")
+    runner = PassingSandboxRunner()
+    tools = build_file_system_tools(workspace, runner)
+    _, functions, _ = convert_tools_to_openai_schema(tools)
+
+    async def call_like_crewai() -> str:
+        # CrewAI's native tool loop calls the tool synchronously from akickoff.
+        return str(functions["run_tests"](test_file_path="test_solution.py"))
+
+    assert asyncio.run(call_like_crewai()) == "ALL TESTS PASSED"
+    run_tests = next(tool for tool in tools if tool.name == "run_tests")
+    assert asyncio.run(run_tests.arun(test_file_path="test_solution.py")) == (
+        "ALL TESTS PASSED"
+    )
+
+
 def test_sandbox_cleanup_failure_is_not_reported_as_success() -> None:
     workspace = RunWorkspace()
     workspace.write("solution.py", "def answer(): return 42\n")
@@ -73,3 +100,80 @@ def test_save_file_rejects_invalid_python_without_overwriting_workspace() -> Non
 
     assert "syntax validation failed" in result
     assert workspace.read("solution.py") == "def answer():\n    return 1\n"
+
+
+class CountingSandboxRunner:
+    name = "stub"
+
+    def __init__(self, result: SandboxResult) -> None:
+        self.result = result
+        self.calls = 0
+
+    def run(self, request: SandboxRequest) -> SandboxResult:
+        self.calls += 1
+        return self.result
+
+
+def _run_tests_tool(
+    workspace: RunWorkspace,
+    runner: CountingSandboxRunner,
+    cache: SandboxResultCache,
+    stats: SandboxCacheStats,
+    *,
+    bypass: bool = False,
+) -> BaseTool:
+    tools = build_file_system_tools(
+        workspace,
+        runner,
+        result_cache=cache,
+        cache_stats=stats,
+        bypass_result_cache=bypass,
+    )
+    return next(tool for tool in tools if tool.name == "run_tests")
+
+
+def test_identical_test_runs_are_served_from_the_result_cache() -> None:
+    workspace = RunWorkspace()
+    workspace.write("solution.py", "def answer(): return 42\n")
+    workspace.write("test_solution.py", "def test_answer(): assert True\n")
+    runner = CountingSandboxRunner(SandboxResult(exit_code=0, duration_seconds=2.0))
+    stats = SandboxCacheStats()
+    run_tests = _run_tests_tool(workspace, runner, SandboxResultCache(), stats)
+
+    assert run_tests.run(test_file_path="test_solution.py") == "ALL TESTS PASSED"
+    assert run_tests.run(test_file_path="test_solution.py") == "ALL TESTS PASSED"
+    workspace.write("solution.py", "def answer(): return 41\n")
+    run_tests.run(test_file_path="test_solution.py")
+
+    assert runner.calls == 2
+    assert stats == SandboxCacheStats(hits=1, misses=2, seconds_saved=2.0)
+
+
+def test_result_cache_skips_timeouts_and_bypassed_runs(tmp_path: Path) -> None:
+    workspace = RunWorkspace()
+    workspace.write("solution.py", "def answer(): return 42\n")
+    workspace.write("test_solution.py", "def test_answer(): assert True\n")
+    timed_out = CountingSandboxRunner(
+        SandboxResult(exit_code=124, timed_out=True, duration_seconds=10.0)
+    )
+    cache = SandboxResultCache(max_entries=0, directory=tmp_path)
+    run_tests = _run_tests_tool(workspace, timed_out, cache, SandboxCacheStats())
+    run_tests.run(test_file_path="test_solution.py")
+    run_tests.run(test_file_path="test_solution.py")
+    assert timed_out.calls == 2
+
+    passing = CountingSandboxRunner(SandboxResult(exit_code=0, duration_seconds=1.0))
+    bypassed = SandboxCacheStats()
+    run_tests = _run_tests_tool(workspace, passing, cache, bypassed, bypass=True)
+    run_tests.run(test_file_path="test_solution.py")
+    run_tests.run(test_file_path="test_solution.py")
+    assert passing.calls == 2
+    assert bypassed == SandboxCacheStats()
+
+    disk_stats = SandboxCacheStats()
+    fresh = SandboxResultCache(max_entries=0, directory=tmp_path)
+    run_tests = _run_tests_tool(workspace, passing, fresh, disk_stats)
+    assert run_tests.run(test_file_path="test_solution.py") == "ALL TESTS PASSED"
+    run_tests.run(test_file_path="test_solution.py")
+    assert passing.calls == 3
+    assert disk_stats == SandboxCacheStats(hits=1, misses=1, seconds_saved=1.0)